@@ -0,0 +1,118 @@
+"""
+Time to construct a DatabaseManager, i.e. the database work done before the
+first window can appear, on a new file, on an up-to-date file, and on a file
+made before the schema was stamped with PRAGMA user_version.
+
+Besides the time on the local disk, each case reports how many write
+transactions the open committed and how many pages it wrote, read from the
+WAL before the manager is closed. The slow-disk column adds --fsync-ms per
+commit and --page-write-ms per page on top of the measured time: what the
+open would cost if every commit had to reach the platter (synchronous=FULL, or
+the rollback journal used where WAL is unavailable) on a slow disk, SD card or
+network share.
+
+Usage (from the project root):
+    python -m benchmarks.bench_cold_start [--runs 20] [--fsync-ms 10] [--page-write-ms 0.2]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import struct
+import tempfile
+import time
+
+from model.database_manager import DatabaseManager
+
+WAL_HEADER_BYTES = 32
+WAL_FRAME_HEADER_BYTES = 24
+
+
+def wal_writes(db_path):
+    """(commits, pages) in the current WAL generation of db_path; (0, 0) when there is no WAL."""
+    try:
+        with open(db_path + "-wal", 'rb') as wal_file:
+            wal = wal_file.read()
+    except FileNotFoundError:
+        return 0, 0
+    if len(wal) < WAL_HEADER_BYTES:
+        return 0, 0
+    page_size = struct.unpack(">I", wal[8:12])[0]
+    salts = wal[16:24]
+    commits = pages = 0
+    offset = WAL_HEADER_BYTES
+    while offset + WAL_FRAME_HEADER_BYTES + page_size <= len(wal):
+        frame = wal[offset:offset + WAL_FRAME_HEADER_BYTES]
+        if frame[8:16] != salts:
+            # Left over from an earlier generation of the WAL
+            break
+        pages += 1
+        # A commit frame records the database size after the commit; other frames store 0
+        commits += struct.unpack(">I", frame[4:8])[0] != 0
+        offset += WAL_FRAME_HEADER_BYTES + page_size
+    return commits, pages
+
+
+def _open_once(db_path):
+    started = time.perf_counter()
+    db_manager = DatabaseManager(db_path)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    try:
+        commits, pages = wal_writes(db_path)
+    finally:
+        db_manager.close_connection()
+    return elapsed_ms, commits, pages
+
+
+def _make_template(tmp_dir, name, user_version=None):
+    """A database created by DatabaseManager, optionally with its user_version overwritten."""
+    path = os.path.join(tmp_dir, name)
+    DatabaseManager(path).close_connection()
+    if user_version is not None:
+        conn = sqlite3.connect(path)
+        conn.execute(f"PRAGMA user_version = {user_version}")
+        conn.close()
+    return path
+
+
+def run_case(tmp_dir, template, runs):
+    """Opens a fresh copy of template (or a brand new file when it is None) runs times."""
+    samples = []
+    for run in range(runs):
+        db_path = os.path.join(tmp_dir, f"run_{run}.db")
+        if template is not None:
+            shutil.copyfile(template, db_path)
+        samples.append(_open_once(db_path))
+        for path in (db_path, db_path + "-wal", db_path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--fsync-ms", type=float, default=10.0, help="simulated cost of making one commit durable")
+    parser.add_argument("--page-write-ms", type=float, default=0.2, help="simulated cost of writing one page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = {
+            "new file": None,
+            "up-to-date file": _make_template(tmp_dir, "current.db"),
+            "file without user_version": _make_template(tmp_dir, "unstamped.db", user_version=0),
+        }
+        results = {name: run_case(tmp_dir, template, args.runs) for name, template in cases.items()}
+
+    print(f"\n{'case':<28}{'median ms':>12}{'commits':>10}{'pages':>8}{'slow disk ms':>15}")
+    for name, samples in results.items():
+        median_ms = statistics.median(sample[0] for sample in samples)
+        commits = statistics.median(sample[1] for sample in samples)
+        pages = statistics.median(sample[2] for sample in samples)
+        slow_ms = median_ms + commits * args.fsync_ms + pages * args.page_write_ms
+        print(f"{name:<28}{median_ms:>12.2f}{commits:>10.0f}{pages:>8.0f}{slow_ms:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
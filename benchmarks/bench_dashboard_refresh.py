@@ -0,0 +1,125 @@
+"""
+Statement count and wall time of one dashboard refresh, before and after
+get_dashboard_snapshot.
+
+"before" replays the statements DashboardHomePage.refresh_dashboard ran before
+this series (seven, over the raw sales tables: KPIs, chart, top products,
+attention items, recent activity); "after" is the single
+get_dashboard_snapshot call on the daily rollup. Both run against the same
+database, so the "before" statements get the secondary indexes added since.
+
+Usage (from the project root):
+    python -m benchmarks.bench_dashboard_refresh [--sale-lines 200000] [--days 30] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from model.database_manager import DatabaseManager
+
+
+def build_dataset(db_manager, sale_lines, history_days, products=200, seed=7):
+    """Fills a fresh database with one user and `sale_lines` single-line sales spread over the history."""
+    rng = random.Random(seed)
+    db_manager.add_user("Bench User", "bench@example.com", "password123")
+    user_id = db_manager.get_user_by_email("bench@example.com")["id"]
+    cursor = db_manager.cursor
+    cursor.execute("BEGIN TRANSACTION")
+    cursor.executemany(
+        "INSERT INTO user_products (user_id, product_name, sku, selling_price, stock_quantity, low_stock_threshold) VALUES (?, ?, ?, ?, ?, 5)",
+        [(user_id, f"Product {i}", f"SKU-{i:05d}", round(rng.uniform(2, 200), 2), rng.randint(0, 60)) for i in range(products)])
+    product_ids = [row[0] for row in cursor.execute("SELECT id FROM user_products WHERE user_id = ?", (user_id,))]
+    now = datetime.now()
+    sales, items = [], []
+    for sale_id in range(1, sale_lines + 1):
+        sale_date = now - timedelta(seconds=rng.randint(0, history_days * 86400))
+        quantity, price = rng.randint(1, 4), round(rng.uniform(2, 200), 2)
+        sales.append((sale_id, user_id, sale_date.strftime('%Y-%m-%d %H:%M:%S'), quantity * price))
+        items.append((sale_id, rng.choice(product_ids), quantity, price))
+    cursor.executemany("INSERT INTO sales (id, user_id, sale_date, total_amount) VALUES (?, ?, ?, ?)", sales)
+    cursor.executemany("INSERT INTO sale_items (sale_id, product_id, quantity_sold, price_at_sale) VALUES (?, ?, ?, ?)", items)
+    cursor.executemany("INSERT INTO activity_log (user_id, activity_type, description) VALUES (?, 'SALE', ?)",
+                       [(user_id, f"Bench sale {i}") for i in range(500)])
+    db_manager.conn.commit()
+    db_manager.rebuild_sales_rollup(user_id)
+    return user_id
+
+
+# The statements the pre-rollup DashboardHomePage.refresh_dashboard ran, in order: get_kpi_data (three),
+# get_daily_sales_for_chart, get_top_products, get_attention_items and get_recent_activity, all on the raw tables
+BASELINE_REFRESH_SQL = (
+    ("SELECT SUM(si.quantity_sold * si.price_at_sale) FROM sales s JOIN sale_items si ON s.id = si.sale_id "
+     "WHERE s.user_id = ? AND s.sale_date >= ? AND s.sale_date <= ?", "user, start, end"),
+    ("SELECT SUM(si.quantity_sold) FROM sales s JOIN sale_items si ON s.id = si.sale_id "
+     "WHERE s.user_id = ? AND s.sale_date >= ? AND s.sale_date <= ?", "user, start, end"),
+    ("SELECT SUM(stock_quantity) FROM user_products WHERE user_id = ?", "user"),
+    ("SELECT DATE(s.sale_date), SUM(si.quantity_sold * si.price_at_sale) FROM sales s JOIN sale_items si ON s.id = si.sale_id "
+     "WHERE s.user_id = ? AND DATE(s.sale_date) >= ? GROUP BY DATE(s.sale_date)", "user, chart_start"),
+    ("SELECT p.product_name, SUM(si.quantity_sold * si.price_at_sale) as total_revenue FROM sales s "
+     "JOIN sale_items si ON s.id = si.sale_id JOIN user_products p ON si.product_id = p.id "
+     "WHERE s.user_id = ? AND s.sale_date >= ? AND s.sale_date <= ? GROUP BY p.product_name ORDER BY total_revenue DESC LIMIT ?",
+     "user, start, end, limit"),
+    ("SELECT id, product_name, stock_quantity FROM user_products WHERE user_id = ? AND stock_quantity <= low_stock_threshold "
+     "AND stock_quantity > 0 ORDER BY stock_quantity ASC LIMIT 5", "user"),
+    ("SELECT activity_type, description, activity_date FROM activity_log WHERE user_id = ? ORDER BY activity_date DESC LIMIT ?",
+     "user, limit"),
+)
+
+
+def refresh_before(db_manager, user_id, start_date, end_date, days):
+    """Replays BASELINE_REFRESH_SQL with the parameters the old code bound (datetimes as sqlite3's default adapter wrote them)."""
+    values = {'user': user_id, 'start': start_date.isoformat(" "), 'end': end_date.isoformat(" "),
+              'chart_start': (datetime.now().date() - timedelta(days=days - 1)).isoformat(), 'limit': 5}
+    with db_manager.pool.reader() as conn:
+        for query, param_names in BASELINE_REFRESH_SQL:
+            conn.execute(query, [values[name] for name in param_names.split(", ")]).fetchall()
+
+
+def refresh_after(db_manager, user_id, start_date, end_date, days):
+    db_manager.get_dashboard_snapshot(user_id, start_date, end_date, days)
+
+
+def measure(db_manager, refresh, user_id, days, repeat):
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days - 1)
+    statements = []
+    db_manager.pool.set_trace_callback(statements.append)
+    refresh(db_manager, user_id, start_date, end_date, days)
+    db_manager.pool.set_trace_callback(None)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        refresh(db_manager, user_id, start_date, end_date, days)
+        timings.append((time.perf_counter() - started) * 1000)
+    return len(statements), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sale-lines", type=int, default=200_000)
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "bench_dashboard.db"))
+        # Time the queries themselves, not query cache hits
+        db_manager.query_cache.enabled = False
+        try:
+            print(f"Seeding {args.sale_lines:,} sale lines over {args.history_days} days...")
+            user_id = build_dataset(db_manager, args.sale_lines, args.history_days)
+            print(f"\n{'refresh':<10}{'statements':>12}{'median ms':>12}")
+            for label, refresh in (("before", refresh_before), ("after", refresh_after)):
+                statement_count, median_ms = measure(db_manager, refresh, user_id, args.days, args.repeat)
+                print(f"{label:<10}{statement_count:>12}{median_ms:>12.2f}")
+        finally:
+            db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
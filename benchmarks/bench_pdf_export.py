@@ -0,0 +1,51 @@
+"""
+Wall time of the detailed PDF sales export at increasing row counts.
+
+The report is drawn one fixed-size page at a time, so the time per row should
+stay flat as the row count grows; the last column makes that easy to check.
+
+Usage (from the project root):
+    python -m benchmarks.bench_pdf_export [--sizes 2500 5000 10000 20000 40000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from model.database_manager import DatabaseManager
+from processing.product_processing import ProductProcessor
+from benchmarks.bench_dashboard_refresh import build_dataset
+
+
+def measure(sale_lines, tmp_dir):
+    db_manager = DatabaseManager(os.path.join(tmp_dir, f"bench_pdf_{sale_lines}.db"))
+    try:
+        user_id = build_dataset(db_manager, sale_lines, history_days=365)
+        file_path = os.path.join(tmp_dir, f"report_{sale_lines}.pdf")
+        start = time.perf_counter()
+        success, message = ProductProcessor(db_manager).export_products_and_sales_to_pdf(user_id, file_path)
+        elapsed = time.perf_counter() - start
+        if not success:
+            raise RuntimeError(message)
+        return elapsed, os.path.getsize(file_path)
+    finally:
+        db_manager.close_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2500, 5000, 10000, 20000, 40000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = [(rows, *measure(rows, tmp_dir)) for rows in sorted(args.sizes)]
+
+    print(f"\n{'rows':>10}{'seconds':>10}{'MB':>8}{'us/row':>10}")
+    for rows, elapsed, size in results:
+        print(f"{rows:>10,}{elapsed:>10.2f}{size / 1e6:>8.1f}{elapsed / rows * 1e6:>10.1f}")
+    smallest, largest = results[0], results[-1]
+    print(f"\n{largest[0] / smallest[0]:.0f}x the rows took {largest[1] / smallest[1]:.1f}x the time.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Product search latency on a large catalogue: FTS5 index against the LIKE scan
+it replaced.
+
+Usage (from the project root):
+    python -m benchmarks.bench_product_search [--products 100000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from model.database_manager import DatabaseManager
+
+WORDS = ["organic", "cotton", "wireless", "ergonomic", "classic", "denim", "leather", "steel", "bamboo", "ceramic",
+         "vintage", "premium", "compact", "travel", "outdoor", "kitchen", "garden", "studio", "urban", "alpine"]
+NOUNS = ["shirt", "mouse", "jeans", "cap", "mug", "lamp", "backpack", "bottle", "jacket", "speaker",
+         "notebook", "chair", "towel", "wallet", "watch", "kettle", "scarf", "helmet", "candle", "blanket"]
+BRANDS = ["Acme", "Northwind", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Tyrell"]
+SEARCHES = ["wireless", "vint", "cotton shirt", "SKU-0042", "hooli", "kettle steel", "zzz"]
+
+
+def build_catalogue(db_manager, products, seed=11):
+    rng = random.Random(seed)
+    db_manager.add_user("Search Bench", "search@example.com", "password123")
+    user_id = db_manager.get_user_by_email("search@example.com")["id"]
+    rows = []
+    for i in range(products):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {rng.choice(NOUNS).title()} {i}"
+        rows.append((f"SKU-{i:06d}", name, f"A {rng.choice(WORDS)} {rng.choice(NOUNS)} for everyday use.",
+                     rng.choice(NOUNS).title(), rng.choice(BRANDS), round(rng.uniform(2, 200), 2)))
+    success, message = db_manager.upsert_products_bulk(
+        user_id, ['sku', 'product_name', 'description', 'category', 'brand', 'selling_price'], rows)
+    if not success:
+        raise RuntimeError(message)
+    return user_id
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "bench_search.db"))
+        # Time the queries themselves, not query cache hits
+        db_manager.query_cache.enabled = False
+        try:
+            print(f"Seeding {args.products:,} products...")
+            user_id = build_catalogue(db_manager, args.products)
+            print(f"\n{'search':<16}{'matches':>9}{'FTS ms':>10}{'LIKE ms':>10}")
+            for term in SEARCHES:
+                db_manager.has_product_search = True
+                fts_ms, matches = median_ms(lambda: db_manager.get_products_by_user_id(user_id, term, "relevance"), args.repeat)
+                db_manager.has_product_search = False
+                like_ms, _ = median_ms(lambda: db_manager.get_products_by_user_id(user_id, term), args.repeat)
+                print(f"{term:<16}{matches:>9,}{fts_ms:>10.2f}{like_ms:>10.2f}")
+            db_manager.has_product_search = True
+        finally:
+            db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
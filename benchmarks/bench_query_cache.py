@@ -0,0 +1,67 @@
+"""
+Repeated page visits with and without the DatabaseManager query cache.
+
+Replays the reads the sidebar pages issue on every visit (product list and
+sales filter, goals, profile, dashboard snapshot) a number of times, with a
+product edit every few rounds so invalidation is exercised too.
+
+Usage (from the project root):
+    python -m benchmarks.bench_query_cache [--sales 50000] [--rounds 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from model.database_manager import DatabaseManager
+from benchmarks.bench_dashboard_refresh import build_dataset
+
+EDIT_EVERY = 10
+
+
+def visit_pages(db_manager, user_id, rounds):
+    product_id = db_manager.get_products_by_user_id(user_id)[0]['id']
+    start = time.perf_counter()
+    for round_number in range(rounds):
+        end_date = datetime.now()
+        db_manager.get_dashboard_snapshot(user_id, end_date - timedelta(days=29), end_date, 30)
+        db_manager.get_products_by_user_id(user_id)
+        db_manager.get_products_by_user_id(user_id, search_term=None, sort_by="product_name", sort_order="ASC")
+        db_manager.get_user_goals_with_progress(user_id)
+        db_manager.get_user_by_id(user_id)
+        if round_number % EDIT_EVERY == EDIT_EVERY - 1:
+            db_manager.update_product(product_id, user_id, {'stock_quantity': round_number})
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "bench_cache.db"))
+        try:
+            print(f"Seeding {args.sales:,} sale lines...")
+            user_id = build_dataset(db_manager, args.sales, 365)
+            db_manager.add_goal(user_id, {"goal_name": "Quarter", "target_revenue": 10000.0,
+                                          "start_date": "2000-01-01 00:00:00", "deadline": "2100-01-01 23:59:59"})
+            cache = db_manager.query_cache
+
+            cache.enabled = False
+            uncached_ms = visit_pages(db_manager, user_id, args.rounds)
+            cache.enabled = True
+            cached_ms = visit_pages(db_manager, user_id, args.rounds)
+
+            print(f"\n{'cache':<10}{'ms per round':>14}")
+            print(f"{'off':<10}{uncached_ms:>14.2f}")
+            print(f"{'on':<10}{cached_ms:>14.2f}")
+            print(f"\nCache stats: {cache.stats()}")
+        finally:
+            db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
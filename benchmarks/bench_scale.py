@@ -0,0 +1,225 @@
+"""
+Times every DatabaseManager read method and every ProductProcessor export on
+synthetic datasets of increasing size, and writes the results as JSON.
+
+Each size gets a database from benchmarks.dataset (kept in --data-dir and
+reused on later runs with the same size and seed). Reads run with the query
+cache off, --repeat times each, and report the median and fastest run;
+exports run once. Pass --baseline with an earlier results file to flag
+anything that got more than --threshold times slower.
+
+Usage (from the project root):
+    python -m benchmarks.bench_scale [--sizes 10k 1M 10M] [--output bench_scale.json] [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from model.database_manager import DatabaseManager
+from processing.product_processing import ProductProcessor
+from benchmarks.dataset import generate_dataset, parse_size
+
+SEED = 42
+USERS = 3
+PRODUCTS_PER_USER = 500
+# Sales history ends today so the "last 30 days" reads see a realistic amount of data;
+# datasets kept in --data-dir are therefore reused only on the day they were made
+END_DATE = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _read_calls(db_manager, user_id, product_id, goal):
+    """One call per DatabaseManager read method, with the arguments the GUI typically passes."""
+    end = END_DATE.replace(hour=23, minute=59, second=59)
+    start = (END_DATE - timedelta(days=29)).replace(hour=0)
+    start_text, end_text = start.strftime('%Y-%m-%d %H:%M:%S'), end.strftime('%Y-%m-%d %H:%M:%S')
+    return {
+        "get_user_by_email": lambda: db_manager.get_user_by_email("user1@example.com"),
+        "get_user_by_id": lambda: db_manager.get_user_by_id(user_id),
+        "get_products_by_user_id": lambda: db_manager.get_products_by_user_id(user_id),
+        "get_products_by_user_id(search)": lambda: db_manager.get_products_by_user_id(user_id, "cable", "relevance"),
+        "get_product_by_id_and_user_id": lambda: db_manager.get_product_by_id_and_user_id(product_id, user_id),
+        "iter_products": lambda: sum(1 for _ in db_manager.iter_products(user_id)),
+        "get_product_sku_map": lambda: db_manager.get_product_sku_map(user_id),
+        "get_sales_records(30 days)": lambda: db_manager.get_sales_records(user_id, start_text, end_text),
+        "get_sales_records(product)": lambda: db_manager.get_sales_records(user_id, product_id=product_id),
+        "get_sales_records_page": lambda: db_manager.get_sales_records_page(user_id, page_size=500),
+        "iter_sales_records(all)": lambda: sum(1 for _ in db_manager.iter_sales_records(user_id)),
+        "get_sales_totals": lambda: db_manager.get_sales_totals(user_id),
+        "get_sales_totals(30 days)": lambda: db_manager.get_sales_totals(user_id, start_text, end_text),
+        "get_product_sales_summary": lambda: db_manager.get_product_sales_summary(user_id),
+        "get_user_goals": lambda: db_manager.get_user_goals(user_id),
+        "get_user_goals_with_progress": lambda: db_manager.get_user_goals_with_progress(user_id),
+        "get_sales_progress_for_goal": lambda: db_manager.get_sales_progress_for_goal(
+            user_id, goal['start_date'], goal['deadline'], goal['product_id']),
+        "get_recent_activity": lambda: db_manager.get_recent_activity(user_id),
+        "get_kpi_data": lambda: db_manager.get_kpi_data(user_id, start, end),
+        "get_attention_items": lambda: db_manager.get_attention_items(user_id),
+        "get_daily_sales_for_chart": lambda: db_manager.get_daily_sales_for_chart(user_id, 30),
+        "get_top_products": lambda: db_manager.get_top_products(user_id, start, end),
+        "get_dashboard_snapshot": lambda: db_manager.get_dashboard_snapshot(user_id, start, end, 30),
+    }
+
+
+def _export_calls(processor, user_id, out_dir):
+    def export(method, file_name, **kwargs):
+        def run():
+            success, message = method(user_id, os.path.join(out_dir, file_name), **kwargs)
+            if not success:
+                raise RuntimeError(message)
+        return run
+    return {
+        "export_products_and_sales_to_csv": export(processor.export_products_and_sales_to_csv, "sales.csv"),
+        "export_products_and_sales_to_csv(gzip)": export(processor.export_products_and_sales_to_csv, "sales.csv.gz"),
+        "export_catalogue_to_csv": export(processor.export_catalogue_to_csv, "catalogue.csv"),
+        "export_products_and_sales_to_pdf(summary)": export(processor.export_products_and_sales_to_pdf, "summary.pdf", summary_only=True),
+        "export_products_and_sales_to_pdf": export(processor.export_products_and_sales_to_pdf, "sales.pdf"),
+        "export_data_to_excel": export(processor.export_data_to_excel, "sales.xlsx"),
+    }
+
+
+def _uncovered_reads(covered):
+    """Public read-looking DatabaseManager methods the harness has no call for (e.g. newly added ones)."""
+    names = {name.split("(")[0] for name in covered}
+    return sorted(name for name in dir(DatabaseManager)
+                  if name.startswith(("get_", "iter_")) and name not in names)
+
+
+def _time(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(timings), 3), 'min_ms': round(min(timings), 3), 'runs': repeat}
+
+
+def _dataset(data_dir, sale_lines):
+    """Opens (generating first if needed) the dataset for sale_lines; returns (manager, summary, generate seconds)."""
+    db_path = os.path.join(data_dir, f"scale_{sale_lines}_{SEED}_{END_DATE:%Y%m%d}.db")
+    summary_path = db_path + ".json"
+    if os.path.exists(db_path) and os.path.exists(summary_path):
+        with open(summary_path, encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+        return DatabaseManager(db_path), summary, None
+    for stale in (db_path, db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(stale):
+            os.remove(stale)
+    db_manager = DatabaseManager(db_path)
+    started = time.perf_counter()
+    summary = generate_dataset(db_manager, sale_lines, USERS, PRODUCTS_PER_USER, seed=SEED, end_date=END_DATE,
+                               progress_callback=lambda done, total: print(f"  generating {done:,}/{total:,} sale lines", end="\r"))
+    generate_seconds = time.perf_counter() - started
+    print()
+    with open(summary_path, 'w', encoding='utf-8') as summary_file:
+        json.dump(summary, summary_file)
+    return db_manager, summary, generate_seconds
+
+
+def run_size(sale_lines, data_dir, repeat, skip):
+    db_manager, summary, generate_seconds = _dataset(data_dir, sale_lines)
+    try:
+        db_manager.query_cache.enabled = False
+        # Time the user with the most sales
+        user_id = max(summary['user_ids'], key=lambda uid: db_manager.get_sales_totals(uid)['line_count'])
+        product_id = db_manager.get_products_by_user_id(user_id)[0]['id']
+        goal = next(goal for goal in db_manager.get_user_goals(user_id) if goal['product_id'])
+        results = {}
+        for name, call in _read_calls(db_manager, user_id, product_id, goal).items():
+            if name in skip:
+                continue
+            results[name] = dict(kind="read", **_time(call, repeat))
+            print(f"  {name:<45}{results[name]['median_ms']:>12.2f} ms")
+        with tempfile.TemporaryDirectory() as out_dir:
+            for name, call in _export_calls(ProductProcessor(db_manager), user_id, out_dir).items():
+                if name in skip:
+                    continue
+                results[name] = dict(kind="export", **_time(call, 1))
+                print(f"  {name:<45}{results[name]['median_ms'] / 1000:>12.2f} s")
+        return {
+            'sale_lines': sale_lines,
+            'user_sale_lines': db_manager.get_sales_totals(user_id)['line_count'],
+            'dataset': {key: summary[key] for key in ('products', 'sales', 'sale_lines', 'goals', 'activity')},
+            'generate_seconds': round(generate_seconds, 2) if generate_seconds is not None else None,
+            # Includes whatever has not been checkpointed out of the WAL yet
+            'db_bytes': sum(os.path.getsize(path) for path in (db_manager.db_path, db_manager.db_path + "-wal") if os.path.exists(path)),
+            'results': results,
+        }
+    finally:
+        db_manager.close_connection()
+
+
+def _environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+
+
+def compare(report, baseline, threshold):
+    """Lines describing results more than threshold times slower than in baseline; empty when none."""
+    previous = {size['sale_lines']: size['results'] for size in baseline.get('sizes', [])}
+    regressions = []
+    for size in report['sizes']:
+        for name, result in size['results'].items():
+            old = previous.get(size['sale_lines'], {}).get(name)
+            if old and old['median_ms'] > 0 and result['median_ms'] / old['median_ms'] > threshold:
+                regressions.append(f"{size['sale_lines']:>12,}  {name:<45}{old['median_ms']:>12.2f} -> "
+                                   f"{result['median_ms']:.2f} ms ({result['median_ms'] / old['median_ms']:.1f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=parse_size, nargs="+", default=[10_000, 1_000_000, 10_000_000],
+                        help="sale lines per dataset, e.g. 10k 1M 10M")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per read method")
+    parser.add_argument("--data-dir", default=None, help="where datasets are kept between runs (default: a temporary directory)")
+    parser.add_argument("--skip", nargs="*", default=[], help="read or export names to leave out, e.g. export_data_to_excel")
+    parser.add_argument("--output", default="bench_scale.json")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5, help="slowdown factor reported as a regression")
+    args = parser.parse_args()
+
+    missing = _uncovered_reads(_read_calls(None, None, None, None))
+    if missing:
+        print(f"Warning: no benchmark for {', '.join(missing)}")
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="bench_scale_")
+    os.makedirs(data_dir, exist_ok=True)
+    report = {'created_at': datetime.now().isoformat(timespec='seconds'), 'seed': SEED,
+              'environment': _environment(), 'sizes': []}
+    try:
+        for sale_lines in sorted(args.sizes):
+            print(f"\n{sale_lines:,} sale lines")
+            report['sizes'].append(run_size(sale_lines, data_dir, args.repeat, set(args.skip)))
+            # Written after every size so a long run still leaves partial results
+            with open(args.output, 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} result(s) more than {args.threshold}x slower than {args.baseline}:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Time from process start to the first paint of the welcome window, and to the
+first paint of the dashboard after logging in.
+
+Each run starts a fresh Python process that boots the app the way main.py
+does (against a scratch database, so the real one is never touched), logs in
+as soon as the welcome window has painted, and reports when each window
+first painted, measured from just before the process was spawned.
+
+Usage (from the project root):
+    python -m benchmarks.bench_startup [--runs 5] [--sale-lines 20000] [--think-ms 0]
+
+--think-ms waits that long after the welcome window painted before logging
+in, like a user would; with 1000 or so the dashboard has been preloaded by then.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# The first user benchmarks.dataset creates
+EMAIL = "user1@example.com"
+PASSWORD = "password123"
+MARKER = "STARTUP "
+
+
+def _child(db_path, think_ms):
+    """Runs inside the spawned process: boots the app and prints a MARKER line per milestone."""
+    started = float(os.environ["STARTUP_T0"])
+
+    def milestone(name):
+        print(f"{MARKER}{name} {(time.time() - started) * 1000:.1f}", flush=True)
+
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QFont
+    milestone("qt_imported")
+    from main import AppShell
+    from controller.user_controller import UserController
+    milestone("app_imported")
+
+    class FirstPaint(QObject):
+        def __init__(self, name, then):
+            super().__init__()
+            self.name, self.then, self.seen = name, then, False
+
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and not self.seen:
+                self.seen = True
+                milestone(self.name)
+                # Let the paint finish before moving on
+                QTimer.singleShot(0, self.then)
+            return False
+
+    app = QApplication(sys.argv[:1])
+    app.setFont(QFont("Segoe UI", 10))
+    app.setStyle("Fusion")
+    shell = AppShell()
+    controller = UserController(shell, db_path)
+
+    def log_in():
+        controller.handle_login_attempt(EMAIL, PASSWORD)
+        window = controller.dashboard_win
+        window.installEventFilter(dashboard_painted)
+        for child in window.findChildren(QObject):
+            child.installEventFilter(dashboard_painted)
+
+    def think_then_log_in():
+        QTimer.singleShot(think_ms, lambda: (milestone("logging_in"), log_in()))
+
+    welcome_painted = FirstPaint("welcome_painted", think_then_log_in)
+    dashboard_painted = FirstPaint("dashboard_painted", app.quit)
+    shell.installEventFilter(welcome_painted)
+    for child in shell.findChildren(QObject):
+        child.installEventFilter(welcome_painted)
+    controller.start_app()
+    QTimer.singleShot(30_000, app.quit)
+    app.exec()
+    controller.close_db_connection()
+
+
+def _seed(db_path, sale_lines):
+    from model.database_manager import DatabaseManager
+    from benchmarks.dataset import generate_dataset
+    db_manager = DatabaseManager(db_path)
+    try:
+        generate_dataset(db_manager, sale_lines, users=1)
+    finally:
+        db_manager.close_connection()
+
+
+def _run_once(db_path, think_ms):
+    env = dict(os.environ, STARTUP_T0=repr(time.time()), STARTUP_THINK_MS=str(think_ms))
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    result = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", db_path],
+                            capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    milestones = {}
+    for line in result.stdout.splitlines():
+        if line.startswith(MARKER):
+            name, value = line[len(MARKER):].split()
+            milestones[name] = float(value)
+    if "dashboard_painted" not in milestones:
+        raise RuntimeError(f"Startup run did not reach the dashboard:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+    milestones["dashboard_after_login"] = milestones["dashboard_painted"] - milestones["logging_in"]
+    return milestones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sale-lines", type=int, default=20_000)
+    parser.add_argument("--think-ms", type=int, default=0, help="pause between the welcome paint and logging in")
+    parser.add_argument("--child", metavar="DB_PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child, int(os.environ.get("STARTUP_THINK_MS", 0)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "startup.db")
+        _seed(db_path, args.sale_lines)
+        runs = [_run_once(db_path, args.think_ms) for _ in range(args.runs)]
+
+    print(f"\n{'milestone (ms since spawn)':<28}{'median':>10}{'min':>10}")
+    for name in ("qt_imported", "app_imported", "welcome_painted", "dashboard_painted", "dashboard_after_login"):
+        values = [run[name] for run in runs]
+        print(f"{name:<28}{statistics.median(values):>10.0f}{min(values):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Verifies that an exported catalogue imports back unchanged.
+
+Seeds a scratch database with products covering the awkward cases (stock sold
+below zero, empty optional fields, numeric-looking SKUs, commas and quotes in
+text), exports them with export_catalogue_to_csv, imports the file for a
+second user and for the same user again, and compares every exported column.
+Any rejected row or changed value is reported as a failure.
+
+Usage (from the project root):
+    python -m benchmarks.check_catalogue_roundtrip
+"""
+import os
+import sys
+import tempfile
+
+from model.database_manager import DatabaseManager, PRODUCT_IMPORT_COLUMNS
+from processing.product_processing import ProductProcessor
+
+PRODUCTS = [
+    {"product_name": "Widget", "sku": "W-1", "selling_price": 9.5, "stock_quantity": 3, "purchase_price": 4.25},
+    {"product_name": "Oversold gadget", "sku": "G-2", "selling_price": 20.0, "stock_quantity": 1},
+    {"product_name": 'Cable, 2m "braided"', "sku": "00123", "selling_price": 7.0, "stock_quantity": 0,
+     "description": "Line one\nline two", "brand": "Voltix", "category": "Cables", "notes": "Café"},
+    {"product_name": "Bare", "sku": "B-4", "selling_price": 1.0},
+]
+
+
+def _seed(db_manager, email):
+    db_manager.add_user("Round Trip", email, "password123")
+    return db_manager.get_user_by_email(email)["id"]
+
+
+def _catalogue(db_manager, user_id):
+    return {product["sku"]: product for product in db_manager.iter_products(user_id)}
+
+
+def _differences(expected, actual):
+    problems = []
+    for sku, product in expected.items():
+        if sku not in actual:
+            problems.append(f"{sku}: missing after import")
+            continue
+        for column in PRODUCT_IMPORT_COLUMNS:
+            if product[column] != actual[sku][column]:
+                problems.append(f"{sku}: {column} {product[column]!r} became {actual[sku][column]!r}")
+    return problems
+
+
+def check_round_trip(db_manager, tmp_dir):
+    processor = ProductProcessor(db_manager)
+    user_id = _seed(db_manager, "round.trip@example.com")
+    for product in PRODUCTS:
+        db_manager.add_product(user_id, product)
+    # Sell more than is in stock, which the sale paths allow
+    oversold_id = db_manager.get_product_sku_map(user_id)["G-2"][0]
+    db_manager.record_sale_transaction(user_id, [{"id": oversold_id, "quantity": 4, "price": 20.0}], 80.0)
+    expected = _catalogue(db_manager, user_id)
+
+    file_path = os.path.join(tmp_dir, "catalogue.csv")
+    success, message = processor.export_catalogue_to_csv(user_id, file_path)
+    if not success:
+        return [f"export failed: {message}"]
+
+    failures = []
+    other_user_id = _seed(db_manager, "round.trip.copy@example.com")
+    for label, target_user_id in (("new user", other_user_id), ("same user", user_id)):
+        success, message = processor.import_catalogue(target_user_id, file_path)
+        print(f"[{label}] {message}")
+        if not success or "0 rejected" not in message:
+            failures.append(f"{label}: {message}")
+        failures.extend(f"{label}: {problem}" for problem in _differences(expected, _catalogue(db_manager, target_user_id)))
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "round_trip.db"))
+        try:
+            failures = check_round_trip(db_manager, tmp_dir)
+        finally:
+            db_manager.close_connection()
+    if failures:
+        print("\n" + "\n".join(failures))
+        print(f"\n{len(failures)} round-trip problem(s).")
+        return 1
+    print("\nThe exported catalogue imports back unchanged.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
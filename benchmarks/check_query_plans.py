@@ -0,0 +1,107 @@
+"""
+Verifies that every hot DatabaseManager read is served by an index.
+
+Runs the real read methods against a scratch database, captures the SQL they
+execute and checks the EXPLAIN QUERY PLAN of each statement: a full SCAN of
+'sales', 'sale_items', 'daily_sales_rollup', 'goals' or
+'activity_log' is reported as a failure.
+
+Usage (from the project root):
+    python -m benchmarks.check_query_plans
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from model.database_manager import DatabaseManager
+
+LARGE_TABLES = ("sales", "sale_items", "daily_sales_rollup", "goals", "activity_log")
+
+
+def _seed(db_manager):
+    db_manager.add_user("Plan Check", "plan.check@example.com", "password123")
+    user_id = db_manager.get_user_by_email("plan.check@example.com")["id"]
+    product_id, _ = db_manager.add_product(user_id, {"product_name": "Widget", "sku": "W-1",
+                                                     "selling_price": 9.5, "stock_quantity": 100})
+    db_manager.record_sale_transaction(user_id, [{"id": product_id, "quantity": 2, "price": 9.5}], 19.0)
+    db_manager.add_goal(user_id, {"goal_name": "Month", "target_revenue": 100.0,
+                                  "start_date": "2000-01-01 00:00:00", "deadline": "2100-01-01 23:59:59"})
+    return user_id, product_id
+
+
+def _hot_reads(db_manager, user_id, product_id):
+    now = datetime.now()
+    start = now - timedelta(days=29)
+    return {
+        "get_sales_records": lambda: db_manager.get_sales_records(user_id),
+        "get_sales_records(filtered)": lambda: db_manager.get_sales_records(
+            user_id, start.strftime('%Y-%m-%d 00:00:00'), now.strftime('%Y-%m-%d 23:59:59'), product_id),
+        "get_sales_records_page": lambda: db_manager.get_sales_records_page(
+            user_id, after=(now.strftime('%Y-%m-%d %H:%M:%S'), 10**9), page_size=100),
+        "get_kpi_data": lambda: db_manager.get_kpi_data(user_id, start, now),
+        "get_top_products": lambda: db_manager.get_top_products(user_id, start, now),
+        "get_product_sales_summary": lambda: db_manager.get_product_sales_summary(user_id),
+        "get_products_by_user_id(search)": lambda: db_manager.get_products_by_user_id(user_id, "widget", "relevance"),
+        "get_daily_sales_for_chart": lambda: db_manager.get_daily_sales_for_chart(user_id, 30),
+        "get_user_goals": lambda: db_manager.get_user_goals(user_id),
+        "get_user_goals_with_progress": lambda: db_manager.get_user_goals_with_progress(user_id),
+        "get_sales_progress_for_goal": lambda: db_manager.get_sales_progress_for_goal(
+            user_id, "2000-01-01 00:00:00", "2100-01-01 23:59:59", product_id),
+        "get_recent_activity": lambda: db_manager.get_recent_activity(user_id),
+    }
+
+
+def _full_scans(plan_lines):
+    """Plan lines that walk a whole large table instead of searching an index."""
+    aliases = {"s": "sales", "si": "sale_items", "r": "daily_sales_rollup"}
+    scans = []
+    for line in plan_lines:
+        match = re.match(r"SCAN (\w+)", line)
+        if not match or "USING INDEX" in line or "USING COVERING INDEX" in line:
+            continue
+        if aliases.get(match.group(1), match.group(1)) in LARGE_TABLES:
+            scans.append(line)
+    return scans
+
+
+def check_query_plans(db_manager, user_id, product_id):
+    failures = []
+    statements = []
+    db_manager.pool.set_trace_callback(statements.append)
+    try:
+        for method_name, call in _hot_reads(db_manager, user_id, product_id).items():
+            statements.clear()
+            call()
+            for statement in [s for s in statements if s.lstrip().upper().startswith("SELECT")]:
+                plan = db_manager.explain_query_plan(statement)
+                bad = _full_scans(plan)
+                status = "FAIL" if bad else "ok"
+                print(f"[{status}] {method_name}")
+                for line in plan:
+                    print(f"        {line}")
+                if bad:
+                    failures.append((method_name, bad))
+    finally:
+        db_manager.pool.set_trace_callback(None)
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "plan_check.db"))
+        try:
+            user_id, product_id = _seed(db_manager)
+            failures = check_query_plans(db_manager, user_id, product_id)
+        finally:
+            db_manager.close_connection()
+    if failures:
+        print(f"\n{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} fall back to a full table scan.")
+        return 1
+    print("\nAll hot queries are served by an index.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
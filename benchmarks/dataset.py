@@ -0,0 +1,249 @@
+"""
+Deterministic synthetic datasets for benchmarks and manual testing.
+
+generate_dataset() fills a fresh database with users, products (with
+categories, brands, prices and stock levels), multi-item sales spread over a
+history with weekly and yearly seasonality and a growth trend, goals and
+activity log entries, then rebuilds the daily rollup. The same seed, size and
+end date always give the same rows.
+
+Rows go straight in with executemany in large batches on the writer
+connection, so millions of sale lines take minutes rather than hours.
+
+Usage (from the project root):
+    python -m benchmarks.dataset scratch.db [--sale-lines 100000] [--users 3] [--seed 42] [--end-date 2026-01-31]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from model.database_manager import DatabaseManager
+
+CATALOGUE = {
+    "Electronics": (["Voltix", "Nordwave", "Kestrel"], ["Headphones", "Charger", "Speaker", "Cable", "Power Bank", "Mouse"], (8, 250)),
+    "Home & Kitchen": (["Casa Bella", "Hearth", "Ironleaf"], ["Mug", "Kettle", "Knife Set", "Cutting Board", "Pan", "Towel"], (4, 120)),
+    "Beauty": (["Lumi", "Petal & Co", "Aqua Pure"], ["Serum", "Face Cream", "Shampoo", "Lip Balm", "Soap"], (3, 60)),
+    "Sports": (["Stride", "Peakline", "Orca"], ["Yoga Mat", "Water Bottle", "Gloves", "Jump Rope", "Backpack"], (6, 90)),
+    "Stationery": (["Inkwell", "Papyra"], ["Notebook", "Pen Set", "Planner", "Markers", "Sticky Notes"], (2, 35)),
+    "Toys": (["Playnest", "Bricko"], ["Puzzle", "Building Set", "Plush", "Card Game", "Kite"], (5, 80)),
+}
+VARIANTS = ["Mini", "Classic", "Pro", "Max", "Lite", "Plus", "Eco", "XL"]
+COLOURS = ["Black", "White", "Blue", "Red", "Green", "Grey", "Rose", "Sand"]
+
+# Relative sale volume per weekday (Monday first) and per month (January first)
+WEEKDAY_WEIGHTS = (0.85, 0.9, 0.95, 1.0, 1.15, 1.35, 1.1)
+MONTH_WEIGHTS = (0.8, 0.75, 0.9, 0.95, 1.0, 0.95, 0.9, 0.95, 1.0, 1.1, 1.35, 1.7)
+# Items per sale: mostly single lines, sometimes baskets
+ITEMS_PER_SALE = (1, 2, 3, 4, 5)
+ITEMS_PER_SALE_WEIGHTS = (0.55, 0.25, 0.11, 0.06, 0.03)
+# Hour of day a sale happens (shop hours, busier at lunch and early evening)
+HOURS = tuple(range(8, 22))
+HOUR_WEIGHTS = (2, 4, 6, 7, 9, 10, 8, 7, 7, 8, 10, 9, 6, 3)
+
+BATCH_SALES = 50_000
+ACTIVITY_SALES_PER_USER = 2_000
+
+
+def _day_weights(end_date, history_days):
+    """Sale volume per day of the history, oldest first: seasonality times a gentle growth trend."""
+    weights = []
+    for offset in range(history_days):
+        day = end_date - timedelta(days=history_days - 1 - offset)
+        trend = 1.0 + 0.6 * offset / max(history_days - 1, 1)
+        noise = 1.0 + 0.1 * math.sin(offset * 0.7)
+        weights.append(WEEKDAY_WEIGHTS[day.weekday()] * MONTH_WEIGHTS[day.month - 1] * trend * noise)
+    return weights
+
+
+def _products_for_user(rng, user_id, count):
+    rows = []
+    for index in range(count):
+        category = rng.choice(list(CATALOGUE))
+        brands, kinds, (low, high) = CATALOGUE[category]
+        brand, kind = rng.choice(brands), rng.choice(kinds)
+        selling_price = round(rng.uniform(low, high), 2)
+        purchase_price = round(selling_price * rng.uniform(0.35, 0.7), 2)
+        # A tenth of the catalogue sits at or below its restock threshold
+        threshold = rng.choice((3, 5, 5, 10))
+        stock = rng.randint(0, threshold) if rng.random() < 0.1 else rng.randint(threshold + 1, 400)
+        name = f"{brand} {kind} {rng.choice(VARIANTS)} {rng.choice(COLOURS)}"
+        rows.append((user_id, name, f"U{user_id}-{category[:3].upper()}-{index:06d}",
+                     f"{kind} from {brand}'s {category.lower()} range.", category, brand,
+                     purchase_price, selling_price, stock, threshold))
+    return rows
+
+
+def generate_dataset(db_manager, sale_lines, users=1, products_per_user=200, history_days=730,
+                     seed=42, end_date=None, progress_callback=None):
+    """
+    Fills db_manager's (empty) database. sale_lines is the total number of
+    sale_items rows across all users; each user gets a random share. end_date
+    (a date or datetime, default today) is the last day of the sales history.
+    progress_callback(lines_written, sale_lines) is called after every batch.
+
+    Returns a summary dict: user ids and emails (password 'password123'), and
+    the number of products, sales, sale lines, goals and activity rows written.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or datetime.now()
+    end_date = datetime(end_date.year, end_date.month, end_date.day)
+    day_weights = list(itertools.accumulate(_day_weights(end_date, history_days)))
+    hour_weights = list(itertools.accumulate(HOUR_WEIGHTS))
+    history_start = end_date - timedelta(days=history_days - 1)
+
+    summary = {'seed': seed, 'user_ids': [], 'emails': [], 'products': 0, 'sales': 0,
+               'sale_lines': 0, 'goals': 0, 'activity': 0}
+    for index in range(users):
+        email = f"user{index + 1}@example.com"
+        success, message = db_manager.add_user(f"Synthetic User {index + 1}", email, "password123")
+        if not success:
+            raise RuntimeError(message)
+        summary['user_ids'].append(db_manager.get_user_by_email(email)['id'])
+        summary['emails'].append(email)
+
+    shares = [rng.uniform(0.5, 1.5) for _ in range(users)]
+    lines_per_user = [int(sale_lines * share / sum(shares)) for share in shares]
+    lines_per_user[0] += sale_lines - sum(lines_per_user)
+
+    with db_manager.pool.writing() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN TRANSACTION")
+            products_by_user = {}
+            for user_id in summary['user_ids']:
+                cursor.executemany(
+                    "INSERT INTO user_products (user_id, product_name, sku, description, category, brand, purchase_price, "
+                    "selling_price, stock_quantity, low_stock_threshold) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    _products_for_user(rng, user_id, products_per_user))
+                products_by_user[user_id] = cursor.execute(
+                    "SELECT id, selling_price, product_name FROM user_products WHERE user_id = ? ORDER BY id", (user_id,)).fetchall()
+                summary['products'] += products_per_user
+            conn.commit()
+
+            sale_id = (cursor.execute("SELECT MAX(id) FROM sales").fetchone()[0] or 0) + 1
+            lines_written = 0
+            for user_id, user_lines in zip(summary['user_ids'], lines_per_user):
+                products = products_by_user[user_id]
+                # Long-tailed popularity: a few best sellers, many slow movers
+                popularity = [1.0 / (rank + 1) ** 0.9 for rank in range(len(products))]
+                rng.shuffle(popularity)
+                popularity = list(itertools.accumulate(popularity))
+                activity = []
+                remaining = user_lines
+                while remaining > 0:
+                    cursor.execute("BEGIN TRANSACTION")
+                    sales, items = [], []
+                    days = rng.choices(range(history_days), cum_weights=day_weights, k=BATCH_SALES)
+                    hours = rng.choices(HOURS, cum_weights=hour_weights, k=BATCH_SALES)
+                    while remaining > 0 and len(sales) < BATCH_SALES:
+                        sale_date = history_start + timedelta(days=days[len(sales)], hours=hours[len(sales)],
+                                                              seconds=rng.randrange(3600))
+                        basket = min(rng.choices(ITEMS_PER_SALE, ITEMS_PER_SALE_WEIGHTS)[0], remaining)
+                        total = 0.0
+                        for product_id, price, _ in rng.choices(products, cum_weights=popularity, k=basket):
+                            quantity = rng.choices((1, 2, 3, 4), (70, 20, 7, 3))[0]
+                            # Occasional discounts
+                            price_at_sale = round(price * rng.choice((1.0, 1.0, 1.0, 1.0, 0.9, 0.8)), 2)
+                            items.append((sale_id, product_id, quantity, price_at_sale))
+                            total += quantity * price_at_sale
+                        sales.append((sale_id, user_id, sale_date.strftime('%Y-%m-%d %H:%M:%S'), round(total, 2)))
+                        if len(activity) < ACTIVITY_SALES_PER_USER and rng.random() < 0.01:
+                            activity.append((user_id, "SALE", f"New sale recorded for ${total:,.2f} with {basket} item(s).",
+                                             sales[-1][2]))
+                        sale_id += 1
+                        remaining -= basket
+                    cursor.executemany("INSERT INTO sales (id, user_id, sale_date, total_amount) VALUES (?, ?, ?, ?)", sales)
+                    cursor.executemany("INSERT INTO sale_items (sale_id, product_id, quantity_sold, price_at_sale) VALUES (?, ?, ?, ?)", items)
+                    conn.commit()
+                    summary['sales'] += len(sales)
+                    lines_written += len(items)
+                    if progress_callback:
+                        progress_callback(lines_written, sale_lines)
+
+                cursor.execute("BEGIN TRANSACTION")
+                activity += [(user_id, "PRODUCT_ADD", f"Added product: {products[i][2]}", history_start.strftime('%Y-%m-%d 09:00:00'))
+                             for i in range(min(len(products), 50))]
+                cursor.executemany("INSERT INTO activity_log (user_id, activity_type, description, activity_date) VALUES (?, ?, ?, ?)",
+                                   sorted(activity, key=lambda row: row[3]))
+                summary['activity'] += len(activity)
+                goals = _goals_for_user(rng, user_id, products, end_date)
+                cursor.executemany("INSERT INTO goals (user_id, goal_name, product_id, target_revenue, target_quantity, start_date, deadline) "
+                                   "VALUES (?, ?, ?, ?, ?, ?, ?)", goals)
+                summary['goals'] += len(goals)
+                conn.commit()
+            summary['sale_lines'] = lines_written
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    for user_id in summary['user_ids']:
+        success, message = db_manager.rebuild_sales_rollup(user_id)
+        if not success:
+            raise RuntimeError(message)
+    db_manager.query_cache.clear()
+    return summary
+
+
+def _goals_for_user(rng, user_id, products, end_date):
+    """A monthly and a quarterly revenue goal, plus a couple of per-product quantity goals."""
+    def last_day(first_day, months):
+        return (first_day + timedelta(days=31 * months)).replace(day=1) - timedelta(days=1)
+
+    month_start = end_date.replace(day=1)
+    quarter_start = end_date.replace(month=(end_date.month - 1) // 3 * 3 + 1, day=1)
+    fmt = '%Y-%m-%d 00:00:00'
+    goals = [
+        (user_id, "Monthly revenue", None, round(rng.uniform(5_000, 50_000), -2), None,
+         month_start.strftime(fmt), last_day(month_start, 1).strftime('%Y-%m-%d 23:59:59')),
+        (user_id, "Quarterly revenue", None, round(rng.uniform(20_000, 150_000), -3), None,
+         quarter_start.strftime(fmt), last_day(quarter_start, 3).strftime('%Y-%m-%d 23:59:59')),
+    ]
+    for product_id, _, product_name in rng.sample(products, min(2, len(products))):
+        goals.append((user_id, f"Sell more {product_name}", product_id, None, rng.randint(20, 200),
+                      (end_date - timedelta(days=14)).strftime(fmt), (end_date + timedelta(days=16)).strftime('%Y-%m-%d 23:59:59')))
+    return goals
+
+
+def parse_size(text):
+    """'10k', '1M', '2.5M' or plain digits -> int."""
+    text = text.strip().replace("_", "").replace(",", "")
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("db_path", help="database file to create (must not exist yet)")
+    parser.add_argument("--sale-lines", type=parse_size, default=100_000)
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--products-per-user", type=int, default=200)
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=lambda value: datetime.strptime(value, '%Y-%m-%d'), default=None,
+                        help="last day of the sales history, YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    if os.path.exists(args.db_path):
+        sys.exit(f"{args.db_path} already exists; pick a new file name.")
+    db_manager = DatabaseManager(os.path.abspath(args.db_path))
+    try:
+        started = time.perf_counter()
+        summary = generate_dataset(db_manager, args.sale_lines, args.users, args.products_per_user, args.history_days,
+                                   args.seed, args.end_date,
+                                   progress_callback=lambda done, total: print(f"  {done:,}/{total:,} sale lines", end="\r"))
+        print(f"\nGenerated in {time.perf_counter() - started:.1f} s: {summary['sales']:,} sales, {summary['sale_lines']:,} lines, "
+              f"{summary['products']:,} products, {summary['goals']} goals, {summary['activity']:,} activity rows.")
+        print(f"Log in as {summary['emails'][0]} / password123")
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Many threads sharing one DatabaseManager: writers record sales while readers
+hammer the product list, sales totals, the dashboard snapshot and the sales
+history stream.
+
+Afterwards checks that no call raised or reported a failure, that every sale
+and stock decrement landed (no lost updates), that the daily rollup agrees
+with the sale lines, and that no reader ever saw the sale count go backwards.
+Exits non-zero if any check fails.
+
+Usage (from the project root):
+    python -m benchmarks.stress_concurrency [--writers 8] [--readers 8] [--sales-per-writer 200] [--no-cache]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from model.database_manager import DatabaseManager
+
+PRODUCT_COUNT = 20
+INITIAL_STOCK = 1_000_000
+
+
+def _seed(db_manager):
+    db_manager.add_user("Stress", "stress@example.com", "secret")
+    user_id = db_manager.get_user_by_email("stress@example.com")['id']
+    for index in range(PRODUCT_COUNT):
+        success, message = db_manager.add_product(user_id, {
+            'product_name': f"Product {index:02d}", 'sku': f"STRESS-{index:02d}",
+            'selling_price': 5.0 + index, 'stock_quantity': INITIAL_STOCK})
+        if not success:
+            raise RuntimeError(message)
+    return user_id, [product['id'] for product in db_manager.get_products_by_user_id(user_id)]
+
+
+def _writer(db_manager, user_id, product_ids, sales, seed, sold, errors):
+    rng = random.Random(seed)
+    for _ in range(sales):
+        items = [{'id': product_id, 'quantity': rng.randint(1, 3), 'price': 10.0}
+                 for product_id in rng.sample(product_ids, rng.randint(1, 3))]
+        success, message = db_manager.record_sale_transaction(user_id, items, sum(i['quantity'] * i['price'] for i in items))
+        if not success:
+            errors.append(f"record_sale_transaction: {message}")
+            continue
+        with sold['lock']:
+            for item in items:
+                sold[item['id']] = sold.get(item['id'], 0) + item['quantity']
+
+
+def _reader(db_manager, user_id, stop, counts, errors):
+    last_line_count = 0
+    end_date = datetime.now() + timedelta(days=1)
+    while not stop.is_set():
+        if len(db_manager.get_products_by_user_id(user_id)) != PRODUCT_COUNT:
+            errors.append("get_products_by_user_id returned a partial list")
+        line_count = db_manager.get_sales_totals(user_id)['line_count']
+        if line_count < last_line_count:
+            errors.append(f"sale line count went backwards: {last_line_count} -> {line_count}")
+        last_line_count = line_count
+        if not db_manager.get_dashboard_snapshot(user_id, end_date - timedelta(days=6), end_date, 7):
+            errors.append("get_dashboard_snapshot returned nothing")
+        for _, _ in zip(range(50), db_manager.iter_sales_records(user_id, batch_size=20)):
+            pass
+        counts.append(1)
+
+
+def _verify(db_manager, user_id, expected_sales, sold):
+    problems = []
+    cursor = db_manager.conn.cursor()
+    try:
+        sale_count = cursor.execute("SELECT COUNT(*) FROM sales WHERE user_id = ?", (user_id,)).fetchone()[0]
+        if sale_count != expected_sales:
+            problems.append(f"expected {expected_sales} sales, found {sale_count}")
+        for product_id, stock in cursor.execute("SELECT id, stock_quantity FROM user_products WHERE user_id = ?", (user_id,)).fetchall():
+            if stock != INITIAL_STOCK - sold.get(product_id, 0):
+                problems.append(f"product {product_id}: stock {stock}, expected {INITIAL_STOCK - sold.get(product_id, 0)}")
+        lines = dict(cursor.execute("SELECT product_id, SUM(quantity_sold) FROM sale_items GROUP BY product_id").fetchall())
+        rollup = dict(cursor.execute("SELECT product_id, SUM(quantity) FROM daily_sales_rollup WHERE user_id = ? GROUP BY product_id", (user_id,)).fetchall())
+        if lines != rollup:
+            problems.append(f"daily rollup {rollup} does not match sale lines {lines}")
+    finally:
+        cursor.close()
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--sales-per-writer", type=int, default=200)
+    parser.add_argument("--no-cache", action="store_true", help="send every read to SQLite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "stress.db"))
+        try:
+            db_manager.query_cache.enabled = not args.no_cache
+            user_id, product_ids = _seed(db_manager)
+            errors, read_rounds, sold = [], [], {'lock': threading.Lock()}
+            stop = threading.Event()
+
+            def guarded(target, *target_args):
+                try:
+                    target(*target_args)
+                except Exception as e:
+                    errors.append(f"{target.__name__}: {type(e).__name__}: {e}")
+
+            writers = [threading.Thread(target=guarded, args=(_writer, db_manager, user_id, product_ids, args.sales_per_writer, seed, sold, errors))
+                       for seed in range(args.writers)]
+            readers = [threading.Thread(target=guarded, args=(_reader, db_manager, user_id, stop, read_rounds, errors))
+                       for _ in range(args.readers)]
+            started = time.perf_counter()
+            for thread in readers + writers:
+                thread.start()
+            for thread in writers:
+                thread.join()
+            stop.set()
+            for thread in readers:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            expected_sales = args.writers * args.sales_per_writer
+            sold.pop('lock')
+            problems = errors + _verify(db_manager, user_id, expected_sales, sold)
+            print(f"{expected_sales:,} sales from {args.writers} writers and {len(read_rounds):,} read rounds "
+                  f"from {args.readers} readers in {elapsed:.2f} s")
+            for problem in problems[:20]:
+                print(f"  FAIL {problem}")
+            if problems:
+                print(f"{len(problems)} problem(s) found.")
+                sys.exit(1)
+            print("No errors, no lost updates.")
+        finally:
+            db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from controller.tracing import span
+
+
+class _TaskSignals(QObject):
+    # rows processed, total rows (0 when unknown)
+    progress = Signal(int, int)
+    # success, message
+    finished = Signal(bool, str)
+
+
+class BackgroundTask(QRunnable):
+    """
+    Runs one long operation, such as an export or import, on the global thread
+    pool and reports back through signals delivered on the GUI thread.
+
+    task_fn(progress_callback, should_cancel) must return (success, message), the
+    convention of the ProductProcessor exports; progress_callback(rows, total)
+    emits `progress` and should_cancel() turns true once cancel() is called.
+    """
+
+    def __init__(self, name, task_fn):
+        super().__init__()
+        self.name = name
+        self.task_fn = task_fn
+        self.signals = _TaskSignals()
+        self._cancelled = threading.Event()
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def run(self):
+        try:
+            with span(f"BackgroundTask.{self.name}", category="task"):
+                success, message = self.task_fn(self.signals.progress.emit, self.is_cancelled)
+        except Exception as e:
+            success, message = False, f"{self.name} failed: {e}"
+        self.signals.finished.emit(success, message)
@@ -0,0 +1,44 @@
+from PySide6.QtCore import QObject, Signal
+
+# Entities
+PRODUCT = "product"
+SALE = "sale"
+GOAL = "goal"
+USER = "user"
+
+# Operations
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+RESET = "reset"
+
+
+class ChangeEvent:
+    """
+    What changed: an entity type, the ids of the affected rows and the operation.
+    An event without ids (or a RESET) means "any number of rows", e.g. after a
+    bulk import, and receivers should reload rather than patch.
+    """
+    __slots__ = ("entity", "ids", "operation")
+
+    def __init__(self, entity, ids=(), operation=UPDATE):
+        self.entity = entity
+        self.ids = tuple(ids)
+        self.operation = operation
+
+    @property
+    def is_bulk(self):
+        return self.operation == RESET or not self.ids
+
+    def __repr__(self):
+        return f"ChangeEvent({self.entity!r}, ids={self.ids!r}, operation={self.operation!r})"
+
+
+class ChangeBus(QObject):
+    """Broadcasts ChangeEvents from whichever page made a change to every page that shows that data."""
+    changed = Signal(object)
+
+    def publish(self, entity, ids=(), operation=UPDATE):
+        event = ChangeEvent(entity, ids, operation)
+        self.changed.emit(event)
+        return event
@@ -0,0 +1,119 @@
+import itertools
+import sqlite3
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from model.database_manager import DatabaseManager
+from controller.tracing import span
+
+
+class _LoadSignals(QObject):
+    # key, generation, result, error message (empty on success)
+    finished = Signal(str, int, object, str)
+
+
+class _LoadTask(QRunnable):
+    """Runs one query callable on a pool thread against a read-only connection leased for the task."""
+
+    def __init__(self, db_path, key, generation, query_fn):
+        super().__init__()
+        self.db_path = db_path
+        self.key = key
+        self.generation = generation
+        self.query_fn = query_fn
+        self.signals = _LoadSignals()
+        self._cancelled = threading.Event()
+        self._reader_lock = threading.Lock()
+        self._reader = None
+
+    def cancel(self):
+        self._cancelled.set()
+        with self._reader_lock:
+            if self._reader and self._reader.conn:
+                self._reader.conn.interrupt()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        result, error = None, ""
+        if not self.is_cancelled():
+            try:
+                with span(f"DataLoader.{self.key}", category="loader"):
+                    with self._reader_lock:
+                        self._reader = DatabaseManager.open_read_only(self.db_path)
+                    result = self.query_fn(self._reader)
+            except sqlite3.OperationalError as e:
+                if not self.is_cancelled():
+                    error = f"Query failed: {e}"
+            except Exception as e:
+                error = f"Loading failed: {e}"
+            finally:
+                with self._reader_lock:
+                    if self._reader:
+                        self._reader.close_connection()
+                        self._reader = None
+        self.signals.finished.emit(self.key, self.generation, result, error)
+
+
+class DataLoader(QObject):
+    """
+    Runs page queries off the GUI thread and hands the results back on it.
+
+    Each request is identified by a key (e.g. "dashboard"); submitting a new
+    request for a key cancels the one in flight, and results of superseded
+    requests are never delivered.
+    """
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.pool = QThreadPool.globalInstance()
+        self._generations = itertools.count(1)
+        self._pending = {}
+        self._running = set()
+
+    def submit(self, key, query_fn, on_result, on_error=None):
+        """
+        Schedules query_fn(read_only_db_manager) and calls on_result(result) on the
+        GUI thread once it finishes, unless a newer request for the same key came in.
+        """
+        previous = self._pending.pop(key, None)
+        if previous:
+            previous[0].cancel()
+
+        task = _LoadTask(self.db_path, key, next(self._generations), query_fn)
+        task.setAutoDelete(False)
+        task.signals.finished.connect(self._on_task_finished)
+        self._pending[key] = (task, on_result, on_error)
+        self._running.add(task)
+        self.pool.start(task)
+        return task.generation
+
+    def cancel(self, key):
+        pending = self._pending.pop(key, None)
+        if pending:
+            pending[0].cancel()
+
+    def cancel_all(self):
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def is_loading(self, key):
+        return key in self._pending
+
+    def _on_task_finished(self, key, generation, result, error):
+        self._running = {task for task in self._running if task.generation != generation}
+        pending = self._pending.get(key)
+        if not pending or pending[0].generation != generation or pending[0].is_cancelled():
+            return
+        del self._pending[key]
+        _, on_result, on_error = pending
+        if error:
+            print(f"[DataLoader] '{key}' failed: {error}")
+            if on_error:
+                on_error(error)
+            return
+        with span(f"DataLoader.{key}.on_result", category="loader"):
+            on_result(result)
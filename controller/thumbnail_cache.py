@@ -0,0 +1,184 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".thumbnail_cache")
+PLACEHOLDER_PATH = os.path.join(PROJECT_ROOT, "assets", "placeholder.png")
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+
+
+def _scaled_crop(reader, width, height):
+    """Decodes straight to roughly the target size (JPEGs skip the full-size decode), then centre-crops."""
+    reader.setAutoTransform(True)
+    source = reader.size()
+    if source.isValid() and source.width() > 0 and source.height() > 0:
+        scale = max(width / source.width(), height / source.height())
+        reader.setScaledSize(QSize(max(width, round(source.width() * scale)), max(height, round(source.height() * scale))))
+    image = reader.read()
+    if image.isNull():
+        return image
+    if image.width() != width or image.height() < height:
+        image = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+    return image.copy((image.width() - width) // 2, (image.height() - height) // 2, width, height)
+
+
+class _ThumbnailSignals(QObject):
+    # cache key, thumbnail (null if the image could not be read)
+    finished = Signal(str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    """Loads one thumbnail from the disk cache, or builds it from the source image and stores it there."""
+
+    def __init__(self, key, image_path, cache_path, width, height):
+        super().__init__()
+        self.key = key
+        self.image_path = image_path
+        self.cache_path = cache_path
+        self.width = width
+        self.height = height
+        self.signals = _ThumbnailSignals()
+
+    def run(self):
+        image = QImage()
+        if os.path.exists(self.cache_path):
+            image = QImageReader(self.cache_path).read()
+            if not image.isNull():
+                # The modification time doubles as the last use, for prune_disk_cache
+                try:
+                    os.utime(self.cache_path)
+                except OSError:
+                    pass
+        if image.isNull():
+            image = _scaled_crop(QImageReader(self.image_path), self.width, self.height)
+            if not image.isNull() and not image.save(self.cache_path, "PNG"):
+                print(f"[ThumbnailCache] Could not write {self.cache_path}")
+        self.signals.finished.emit(self.key, image)
+
+
+class ThumbnailCache(QObject):
+    """
+    Product image thumbnails for the GUI.
+
+    get() answers from an in-memory LRU of QPixmaps; on a miss it queues a
+    background task that reads the pre-scaled copy from the on-disk cache (or
+    builds it from the original image) and returns None, so the caller shows
+    the placeholder until thumbnail_ready(key) fires. Keys include the file's
+    mtime and size, so edited images are picked up automatically; the copies
+    left behind for old versions are removed by prune_disk_cache, which runs
+    in the background when the cache is created and keeps the directory under
+    max_disk_bytes by deleting the least recently used files.
+    """
+    thumbnail_ready = Signal(str)
+
+    _instance = None
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=512, max_disk_bytes=DEFAULT_MAX_DISK_BYTES, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._pixmaps = OrderedDict()
+        self._pending = {}
+        self._failed = set()
+        self._placeholders = {}
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.pool.start(self.prune_disk_cache)
+
+    @classmethod
+    def instance(cls):
+        """Shared cache used by the product cards."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def key_for(self, image_path, width, height):
+        """Cache key for an image at a given size, or None if the file does not exist."""
+        try:
+            stat = os.stat(image_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        source = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def get(self, image_path, width, height):
+        """
+        Returns (key, pixmap). pixmap is None while the thumbnail is being prepared;
+        key is None when there is no usable image at all.
+        """
+        key = self.key_for(image_path, width, height) if image_path else None
+        if key is None or key in self._failed:
+            return None, None
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return key, pixmap
+        if key not in self._pending:
+            task = _ThumbnailTask(key, image_path, os.path.join(self.cache_dir, f"{key}.png"), width, height)
+            task.setAutoDelete(False)
+            task.signals.finished.connect(self._on_task_finished)
+            self._pending[key] = task
+            self.pool.start(task)
+        return key, None
+
+    def pixmap(self, key):
+        """The in-memory thumbnail for key, if it is ready."""
+        return self._pixmaps.get(key)
+
+    def placeholder(self, width, height):
+        """Shared placeholder pixmap for the given size (the bundled placeholder image, or transparent)."""
+        size = (width, height)
+        if size not in self._placeholders:
+            image = _scaled_crop(QImageReader(PLACEHOLDER_PATH), width, height) if os.path.exists(PLACEHOLDER_PATH) else QImage()
+            if image.isNull():
+                pixmap = QPixmap(width, height)
+                pixmap.fill(Qt.GlobalColor.transparent)
+            else:
+                pixmap = QPixmap.fromImage(image)
+            self._placeholders[size] = pixmap
+        return self._placeholders[size]
+
+    def prune_disk_cache(self):
+        """Deletes the least recently used thumbnails until the directory is under max_disk_bytes. Returns how many went."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".png") and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError as e:
+            print(f"[ThumbnailCache] Could not list {self.cache_dir}: {e}")
+            return 0
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear_memory(self):
+        self._pixmaps.clear()
+        self._failed.clear()
+
+    def _on_task_finished(self, key, image):
+        self._pending.pop(key, None)
+        if image.isNull():
+            self._failed.add(key)
+        else:
+            self._pixmaps[key] = QPixmap.fromImage(image)
+            while len(self._pixmaps) > self.max_entries:
+                self._pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(key)
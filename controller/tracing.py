@@ -0,0 +1,173 @@
+"""
+Hot-path tracing for the GUI.
+
+span() (a context manager) and @traced (a decorator) record how long a block
+or function took as Chrome trace "complete" events in a bounded in-memory
+buffer. StallDetector adds an event whenever the Qt event loop was blocked
+for longer than its threshold. export_chrome_trace() writes the buffer, merged
+with the statements the DatabaseManager profiler recorded, as trace-event JSON
+that chrome://tracing and ui.perfetto.dev open directly, so a stall can be
+lined up with the page load and the queries that caused it.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 50_000
+
+
+class Tracer:
+    """Collects trace events from any thread. Use Tracer.instance(), or the module-level span/traced."""
+
+    _instance = None
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        self.enabled = True
+        self._events = deque(maxlen=max_events)
+        self._thread_names = {}
+        # Trace timestamps count from here; the wall-clock twin converts profiler records
+        self._origin = time.perf_counter()
+        self._origin_wall = time.time()
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def add_complete(self, name, category, start_us, duration_us, args=None):
+        """Records a finished block that ran on the calling thread."""
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': round(start_us, 1), 'dur': round(duration_us, 1),
+                 'pid': os.getpid(), 'tid': thread.ident}
+        if args:
+            event['args'] = args
+        self._events.append(event)
+
+    @contextmanager
+    def span(self, name, category="ui", **args):
+        if not self.enabled:
+            yield
+            return
+        started = self.now_us()
+        try:
+            yield
+        finally:
+            self.add_complete(name, category, started, self.now_us() - started, args)
+
+    def traced(self, name=None, category="ui"):
+        """Decorator recording every call of the function as a span (named after its qualified name by default)."""
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started = self.now_us()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.add_complete(span_name, category, started, self.now_us() - started)
+            return wrapper
+        return decorator
+
+    def events(self):
+        return list(self._events)
+
+    def clear(self):
+        self._events.clear()
+
+    def _query_events(self, profiler):
+        """The profiler's recent statements as 'sql' events, on the threads that ran them."""
+        events = []
+        for record in profiler.recent():
+            start_us = (record.started_at - self._origin_wall) * 1e6
+            if start_us < 0:
+                continue
+            events.append({'name': record.method, 'cat': 'sql', 'ph': 'X', 'ts': round(start_us, 1),
+                           'dur': round(record.elapsed_ms * 1000, 1), 'pid': os.getpid(), 'tid': record.thread,
+                           'args': {'statement': record.statement, 'params': record.params_shape, 'rows': record.rows}})
+        return events
+
+    def export_chrome_trace(self, file_path, profiler=None):
+        """
+        Writes the buffered events (plus the statements in profiler, if given) as
+        Chrome trace-event JSON. Returns the number of events written.
+        """
+        events = self.events() + (self._query_events(profiler) if profiler is not None else [])
+        events.sort(key=lambda event: event['ts'])
+        names = dict(self._thread_names)
+        names.update({thread.ident: thread.name for thread in threading.enumerate()})
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                    for tid, name in names.items() if any(event['tid'] == tid for event in events)]
+        with open(file_path, 'w', encoding='utf-8') as trace_file:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                       'otherData': {'started_at': self._origin_wall}}, trace_file)
+        return len(events)
+
+
+def span(name, category="ui", **args):
+    """Times the enclosed block: `with span("ProductPage.load_page_data"): ...`"""
+    return Tracer.instance().span(name, category, **args)
+
+
+def traced(name=None, category="ui"):
+    """Times every call of the decorated function or method."""
+    return Tracer.instance().traced(name, category)
+
+
+class StallDetector(QObject):
+    """
+    Notices when the event loop is blocked: a heartbeat timer fires every
+    interval_ms, and a beat that arrives more than threshold_ms late means the
+    GUI thread was busy for that long. Each stall is added to the trace,
+    logged and emitted as stalled(ms).
+    """
+    stalled = Signal(float)
+
+    def __init__(self, tracer=None, interval_ms=50, threshold_ms=100, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer or Tracer.instance()
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.stall_count = 0
+        self.longest_stall_ms = 0.0
+        self._last_beat = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._beat)
+
+    def start(self):
+        self._last_beat = self.tracer.now_us()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _beat(self):
+        now = self.tracer.now_us()
+        late_ms = (now - self._last_beat) / 1000 - self.interval_ms
+        if late_ms >= self.threshold_ms:
+            self.stall_count += 1
+            self.longest_stall_ms = max(self.longest_stall_ms, late_ms)
+            if self.tracer.enabled:
+                expected = self._last_beat + self.interval_ms * 1000
+                self.tracer.add_complete("event loop stall", "stall", expected, now - expected, {'ms': round(late_ms, 1)})
+            logger.warning("Event loop stalled for %.0f ms", late_ms)
+            self.stalled.emit(late_ms)
+        self._last_beat = now
@@ -5,15 +5,16 @@ import sys
 from view.welcome_window import WelcomePage
 from view.login_window import LoginPage
 from view.signup_window import SignupPage
-from view.dashboard_window import DashboardWindow
-from model.database_manager import DatabaseManager
+from model.database_manager import DATABASE_NAME, DatabaseManager
 from processing.user_processing import UserProcessor
 
+DASHBOARD_PRELOAD_DELAY_MS = 500
+
 class UserController:
-    def __init__(self, app_shell):
+    def __init__(self, app_shell, db_name=DATABASE_NAME):
         self.app_shell = app_shell
         try:
-            self.db_manager = DatabaseManager()
+            self.db_manager = DatabaseManager(db_name)
             self.user_processor = UserProcessor(self.db_manager)
         except ConnectionError as e:
             QMessageBox.critical(None, "Fatal Error", f"Database error: {e}")
@@ -47,6 +48,11 @@ class UserController:
     def start_app(self):
         self.show_welcome_page()
         self.app_shell.show()
+        # Import the dashboard once the welcome window has painted, while the user is still reading it
+        QTimer.singleShot(DASHBOARD_PRELOAD_DELAY_MS, self._preload_dashboard)
+
+    def _preload_dashboard(self):
+        import view.dashboard_window  # noqa: F401
 
     def show_welcome_page(self):
         self.stacked_widget.setCurrentWidget(self.welcome_page)
@@ -81,6 +87,8 @@ class UserController:
             self.show_login_page()
             return
         if not self.dashboard_win:
+            # Imported here (normally already preloaded) so the dashboard pages and pyqtgraph don't delay the welcome window
+            from view.dashboard_window import DashboardWindow
             self.dashboard_win = DashboardWindow(
                 user_data=self.current_user_data,
                 db_manager_instance=self.db_manager,
@@ -0,0 +1,40 @@
+import argparse
+import sys
+
+from model.database_manager import DatabaseManager
+from processing.sales_importer import SalesImporter, write_error_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import sale lines from a CSV or JSONL file.")
+    parser.add_argument("file", help="CSV or JSONL file with sale_date, sku, quantity and optional sale_ref, price, notes columns.")
+    parser.add_argument("--user-id", type=int, required=True, help="User the sales belong to.")
+    parser.add_argument("--db", default=None, help="Database file name relative to the project root.")
+    parser.add_argument("--dry-run", action="store_true", help="Validate the file without writing anything.")
+    parser.add_argument("--no-stock-update", action="store_true", help="Leave stock levels untouched (historical backfills).")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count - 1; 1 parses inline).")
+    parser.add_argument("--errors", default=None, help="Write rejected rows to this CSV file.")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db) if args.db else DatabaseManager()
+    try:
+        importer = SalesImporter(db_manager, workers=args.workers)
+        report = importer.import_file(
+            args.user_id, args.file, dry_run=args.dry_run, update_stock=not args.no_stock_update,
+            progress_callback=lambda rows_read: print(f"  {rows_read:,} rows parsed...", end="\r")
+        )
+        print(report['message'])
+        for line_number, message, _ in report['errors'][:20]:
+            print(f"  line {line_number}: {message}")
+        if len(report['errors']) > 20:
+            print(f"  ... and {len(report['errors']) - 20} more")
+        if args.errors and report['errors']:
+            write_error_report(report['errors'], args.errors)
+            print(f"Error report written to {args.errors}")
+        return 0 if report['success'] else 1
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
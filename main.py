@@ -2,6 +2,7 @@ from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget
 from PySide6.QtGui import QFont, QGuiApplication 
 import sys
 from controller.user_controller import UserController
+from controller.tracing import StallDetector
 
 APP_WIDTH = 1200
 APP_HEIGHT = 800
@@ -37,6 +38,9 @@ def main():
     font = QFont("Segoe UI", 10)
     app.setFont(font)
     app.setStyle("Fusion")
+    # Records event-loop stalls into the UI trace (exported from Settings > Diagnostics)
+    app.stall_detector = StallDetector(parent=app)
+    app.stall_detector.start()
 
     shell = AppShell()
     user_controller = UserController(shell)
@@ -0,0 +1,181 @@
+"""
+SQLite connections for DatabaseManager.
+
+The database runs in WAL mode so readers never block the writer (or each
+other). A ConnectionPool owns one writer connection, used by one thread at a
+time under write_lock, and hands out reader connections: a thread leases one
+for the duration of a `with pool.reader()` block (nested blocks in the same
+thread get the same connection) and it goes back to the idle list afterwards.
+
+All managers opened on the same database file share a pool (see get_pool).
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Applied to every connection. cache_size is negative, i.e. in KiB.
+CONNECTION_PRAGMAS = (
+    ("synchronous", "NORMAL"),
+    ("cache_size", -32000),
+    ("mmap_size", 268435456),
+    ("temp_store", "MEMORY"),
+    ("foreign_keys", "ON"),
+)
+BUSY_TIMEOUT_SECONDS = 10.0
+MAX_IDLE_READERS = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path):
+    """The shared pool for a database file, or None if no manager has opened it."""
+    with _pools_lock:
+        return _pools.get(db_path)
+
+
+def register_pool(pool):
+    with _pools_lock:
+        _pools[pool.db_path] = pool
+
+
+def configure_connection(conn):
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class ConnectionPool:
+    def __init__(self, db_path, max_idle_readers=MAX_IDLE_READERS):
+        self.db_path = db_path
+        self.max_idle_readers = max_idle_readers
+        self.write_lock = threading.RLock()
+        self.writer = None
+        self.journal_mode = None
+        self._lock = threading.Lock()
+        self._idle_readers = []
+        self._leases = {}       # thread ident -> [connection, depth, generation]
+        self._generation = 0
+        self._trace_callback = None
+
+    def open(self):
+        """Opens the writer connection and switches the database to WAL. Raises sqlite3.Error."""
+        writer = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        try:
+            # Persistent for the database file; stays 'delete' where WAL is unavailable (e.g. read-only media)
+            self.journal_mode = writer.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            configure_connection(writer)
+        except sqlite3.Error:
+            writer.close()
+            raise
+        writer.set_trace_callback(self._trace_callback)
+        self.writer = writer
+        return writer
+
+    def _open_reader(self):
+        conn = sqlite3.connect(f"{Path(self.db_path).as_uri()}?mode=ro", uri=True,
+                               timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        configure_connection(conn)
+        conn.set_trace_callback(self._trace_callback)
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Leases a read-only connection to the calling thread for the duration of the block."""
+        ident = threading.get_ident()
+        with self._lock:
+            lease = self._leases.get(ident)
+            if lease is not None:
+                lease[1] += 1
+            else:
+                conn = self._idle_readers.pop() if self._idle_readers else None
+                lease = self._leases[ident] = [conn, 1, self._generation]
+        if lease[0] is None:
+            try:
+                lease[0] = self._open_reader()
+            except sqlite3.Error:
+                with self._lock:
+                    del self._leases[ident]
+                raise
+        try:
+            yield lease[0]
+        finally:
+            self._release(ident, lease)
+
+    def _release(self, ident, lease):
+        with self._lock:
+            lease[1] -= 1
+            if lease[1]:
+                return
+            del self._leases[ident]
+            # Connections from before a reopen, or beyond the idle limit, are closed rather than kept
+            keep = lease[2] == self._generation and len(self._idle_readers) < self.max_idle_readers
+            if keep:
+                self._idle_readers.append(lease[0])
+        if not keep:
+            lease[0].close()
+
+    @contextmanager
+    def writing(self):
+        """Holds the writer connection for the calling thread for the duration of the block."""
+        with self.write_lock:
+            yield self.writer
+
+    def set_trace_callback(self, callback):
+        """Installs callback (or None) as the statement trace callback of every connection, current and future."""
+        with self.write_lock:
+            with self._lock:
+                self._trace_callback = callback
+                connections = self._idle_readers + [lease[0] for lease in self._leases.values() if lease[0] is not None]
+            if self.writer is not None:
+                connections.append(self.writer)
+            for conn in connections:
+                conn.set_trace_callback(callback)
+
+    def leased_connections(self):
+        """Reader connections currently in use (e.g. to interrupt them)."""
+        with self._lock:
+            return [lease[0] for lease in self._leases.values() if lease[0] is not None]
+
+    def close(self):
+        """Closes the writer and the idle readers; leased readers are closed when they are returned."""
+        with self.write_lock:
+            with self._lock:
+                self._generation += 1
+                idle, self._idle_readers = self._idle_readers, []
+            for conn in idle:
+                conn.close()
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+
+    def reopen(self):
+        with self.write_lock:
+            self.close()
+            return self.open()
+
+    def backup_to(self, file_path):
+        """Writes a consistent copy of the database (including WAL contents) to file_path."""
+        with self.write_lock:
+            target = sqlite3.connect(file_path)
+            try:
+                self.writer.backup(target)
+                # Keep the backup a single self-contained file
+                target.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                target.close()
+
+    def restore_from(self, file_path):
+        """Replaces the database contents with those of the backup at file_path, in place."""
+        source = sqlite3.connect(f"{Path(file_path).as_uri()}?mode=ro", uri=True)
+        try:
+            with self.write_lock:
+                source.backup(self.writer)
+                self.journal_mode = self.writer.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+                with self._lock:
+                    self._generation += 1
+                    idle, self._idle_readers = self._idle_readers, []
+                for conn in idle:
+                    conn.close()
+        finally:
+            source.close()
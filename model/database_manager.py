@@ -1,60 +1,227 @@
 import sqlite3
+import functools
 import hashlib
+import itertools
 import os
+import re
 import sys
-from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from datetime import date, datetime, timedelta
+
+from model.connection_pool import ConnectionPool, configure_connection, get_pool, register_pool
+from model.migrations import PRODUCT_SEARCH_TABLE, bootstrap_schema, schema_is_current
+from model.query_cache import cached_query, get_query_cache, invalidates
+from model.query_profiler import get_query_profiler
+from model.sales_rollup import UPSERT_SALE_LINE_SQL, UPSERT_SALE_RANGE_SQL, rebuild_daily_sales_rollup, to_rollup_day
 
 DATABASE_NAME = "app_database.db"
 
+SALES_RECORD_COLUMNS = """s.sale_date, p.product_name, p.sku, p.category, si.quantity_sold,
+                          si.price_at_sale, (si.quantity_sold * si.price_at_sale) as total_revenue"""
+SALES_RECORDS_FROM = " FROM sales s JOIN sale_items si ON s.id = si.sale_id JOIN user_products p ON si.product_id = p.id"
+
+# Product fields that can be bulk imported/exported, in catalogue file order
+PRODUCT_IMPORT_COLUMNS = ['sku', 'product_name', 'description', 'category', 'brand', 'purchase_price',
+                          'selling_price', 'stock_quantity', 'low_stock_threshold', 'image_url', 'notes']
+
+def _by_day_key(*args, **kwargs):
+    """
+    Query cache key for rollup-based reads: timestamps only matter to the day,
+    and results that count back from today must not outlive the date.
+    """
+    def day(value):
+        return to_rollup_day(value) if isinstance(value, (datetime, date)) else value
+    return (tuple(day(arg) for arg in args), tuple(sorted((name, day(value)) for name, value in kwargs.items())),
+            date.today().isoformat())
+
+def _reads(method):
+    """Runs a DatabaseManager method on the calling thread's reader connection, with a cursor of its own."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._call(method.__name__, write=False):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _writes(method):
+    """Runs a DatabaseManager method on the writer connection, holding the write lock, with a cursor of its own."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._call(method.__name__, write=True):
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class DatabaseManager:
+    """
+    Safe to share between threads: every public method runs with its own cursor,
+    reads on a reader connection leased to the calling thread and writes on the
+    single writer connection under the pool's write lock (see _reads/_writes).
+    Outside those methods self.conn/self.cursor are the writer's, for scripts
+    that run their own SQL from one thread. Method calls and the statements
+    they run are timed by self.profiler (see model/query_profiler.py).
+    """
     def __init__(self, db_name=DATABASE_NAME):
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.db_path = os.path.join(project_root, db_name)
         
         print(f"--- [DatabaseManager] Using database at: {self.db_path} ---")
         
+        self._local = threading.local()
         self.conn = None
         self.cursor = None
+        self.pool = ConnectionPool(self.db_path)
+        self._reader_lease = None
+        self.query_cache = get_query_cache(self.db_path)
+        self.profiler = get_query_profiler(self.db_path)
         
         try:
             self._connect()
-            self._create_users_table()
-            self._create_user_products_table()
-            self._create_sales_tables()
-            self._create_goals_table()
-            self._create_activity_log_table()
+            self._bootstrap_schema()
+            self._detect_product_search()
         except ConnectionError as e:
             raise ConnectionError(e)
 
+    @classmethod
+    def open_read_only(cls, db_path):
+        """
+        Opens a lightweight read-only manager on an existing database file, for use
+        from a background thread. No schema work is done; close it when finished.
+        If the file is already open in this process the connection is leased from
+        its pool, and closing the manager hands it back.
+        """
+        instance = cls.__new__(cls)
+        instance._local = threading.local()
+        instance.db_path = db_path
+        instance.pool = get_pool(db_path)
+        instance._reader_lease = None
+        instance.query_cache = get_query_cache(db_path)
+        instance.profiler = get_query_profiler(db_path)
+        if instance.pool is not None:
+            instance._reader_lease = instance.pool.reader()
+            instance.conn = instance._reader_lease.__enter__()
+        else:
+            instance.conn = sqlite3.connect(f"{Path(db_path).as_uri()}?mode=ro", uri=True)
+            configure_connection(instance.conn)
+        instance.cursor = instance.conn.cursor()
+        instance._detect_product_search()
+        return instance
+
+    @property
+    def conn(self):
+        """The connection of the method call running on this thread, else the writer."""
+        frames = getattr(self._local, 'frames', None)
+        return frames[-1][0] if frames else self._conn
+
+    @conn.setter
+    def conn(self, value):
+        self._conn = value
+
+    @property
+    def cursor(self):
+        frames = getattr(self._local, 'frames', None)
+        return frames[-1][1] if frames else self._cursor
+
+    @cursor.setter
+    def cursor(self, value):
+        self._cursor = value
+
+    @contextmanager
+    def _call(self, method, write):
+        """
+        Sets up the connection and cursor that self.conn/self.cursor return for
+        one call of method on this thread, and times the call for the profiler.
+        """
+        frames = self._local.__dict__.setdefault('frames', [])
+        conn = self._conn
+        if conn is None or self.pool is None or conn is not self.pool.writer:
+            # Not connected, or a read-only manager with a connection of its own
+            lease = nullcontext(conn)
+        elif write or (frames and frames[-1][0] is conn):
+            # Writes, and reads made from inside one, see the write transaction
+            lease = self.pool.writing()
+        else:
+            lease = self.pool.reader()
+        started, failed = time.perf_counter(), True
+        with lease as call_conn:
+            cursor = self.profiler.cursor(call_conn, method) if call_conn is not None else None
+            frames.append((call_conn, cursor))
+            try:
+                yield
+                failed = False
+            finally:
+                frames.pop()
+                if cursor is not None:
+                    cursor.close()
+                if self.profiler.enabled:
+                    self.profiler.record_call(method, (time.perf_counter() - started) * 1000, failed)
+
+    @contextmanager
+    def _read_connection(self):
+        """A reader connection for streaming generators, which outlive a single _call frame."""
+        if self.pool is None or self._conn is not self.pool.writer:
+            yield self._conn
+        else:
+            with self.pool.reader() as conn:
+                yield conn
+
     def _connect(self):
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = self.pool.open()
             self.cursor = self.conn.cursor()
-            self.cursor.execute("PRAGMA foreign_keys = ON;")
-            print("[DatabaseManager] Database connection successful.")
+            register_pool(self.pool)
+            print(f"[DatabaseManager] Database connection successful (journal mode: {self.pool.journal_mode}).")
         except sqlite3.Error as e:
             print(f"[DatabaseManager] FATAL: Failed to connect to database at '{self.db_path}'. Error: {e}")
             raise ConnectionError(f"Failed to connect to database. Please check file permissions for the path:\n{self.db_path}")
 
-    def _create_users_table(self):
-        if not self.cursor: return
+    def _bootstrap_schema(self):
+        """Creates or upgrades the schema in one transaction, unless PRAGMA user_version says it is current."""
         try:
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            self.conn.commit()
+            if not schema_is_current(self.conn):
+                bootstrap_schema(self.conn, self._create_tables)
         except sqlite3.Error as e:
-            print(f"[DatabaseManager] Error creating 'users' table: {e}")
+            print(f"[DatabaseManager] FATAL: Schema migration failed. Error: {e}")
+            raise ConnectionError(f"Failed to migrate the database schema at:\n{self.db_path}\n{e}")
+
+    def _detect_product_search(self):
+        """Records whether the FTS5 product index exists (it is skipped on SQLite builds without FTS5)."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (PRODUCT_SEARCH_TABLE,))
+        self.has_product_search = self.cursor.fetchone() is not None
+
+    @_reads
+    def explain_query_plan(self, query, params=()):
+        """Returns the 'detail' lines of EXPLAIN QUERY PLAN for a statement."""
+        if not self.cursor: return []
+        self.cursor.execute(f"EXPLAIN QUERY PLAN {query}", tuple(params))
+        return [row[3] for row in self.cursor.fetchall()]
+
+    def _create_tables(self):
+        """The base tables, for bootstrap_schema; runs inside its transaction, so nothing here commits."""
+        self._create_users_table()
+        self._create_user_products_table()
+        self._create_sales_tables()
+        self._create_goals_table()
+        self._create_activity_log_table()
+
+    def _create_users_table(self):
+        if not self.cursor: return
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password_hash TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
 
     def _hash_password(self, password):
         return hashlib.sha256(password.encode('utf-8')).hexdigest()
 
+    @invalidates("users")
+    @_writes
     def add_user(self, name, email, password):
         hashed_password = self._hash_password(password)
         try:
@@ -67,6 +234,7 @@ class DatabaseManager:
         except sqlite3.Error as e:
             return False, f"An error occurred: {e}"
 
+    @_reads
     def get_user_by_email(self, email):
         if not self.cursor: return None
         try:
@@ -79,6 +247,8 @@ class DatabaseManager:
             print(f"[DatabaseManager] Error getting user by email: {e}")
             return None
 
+    @cached_query("users")
+    @_reads
     def get_user_by_id(self, user_id):
         if not self.cursor: return None
         try:
@@ -91,6 +261,8 @@ class DatabaseManager:
             print(f"[DatabaseManager] Error getting user by ID: {e}")
             return None
 
+    @invalidates("users")
+    @_writes
     def update_user(self, user_id, data_to_update):
         if not self.cursor or not user_id: return False, "Database not connected."
         set_clauses = []
@@ -142,8 +314,9 @@ class DatabaseManager:
                 UNIQUE(user_id, sku)
             )
         """)
-        self.conn.commit()
 
+    @invalidates("user_products")
+    @_writes
     def add_product(self, user_id, product_data):
         columns = ['user_id', 'product_name', 'sku', 'description', 'category', 'brand',
                    'purchase_price', 'selling_price', 'stock_quantity', 'low_stock_threshold',
@@ -164,16 +337,97 @@ class DatabaseManager:
         except sqlite3.Error as e:
             return None, f"Database error: {e}"
 
+    @invalidates("user_products")
+    @_writes
+    def upsert_products_bulk(self, user_id, columns, rows):
+        """
+        Inserts or updates many products in one transaction, matching on (user_id, sku).
+        'columns' lists the product fields present in each row tuple and must include
+        'sku'. Only those columns are updated, and a None value keeps the stored one,
+        so partial catalogues (e.g. price lists) can be loaded safely. Rows without a
+        product_name or selling_price can only update an existing product.
+        """
+        if not self.conn or not self.cursor:
+            return False, "Database not connected."
+        unknown = [column for column in columns if column not in PRODUCT_IMPORT_COLUMNS]
+        if unknown or 'sku' not in columns:
+            return False, f"Invalid product columns: {', '.join(unknown) or 'sku is required'}"
+        sku_index = columns.index('sku')
+        required = [columns.index(column) if column in columns else None for column in ('product_name', 'selling_price')]
+        # (is_update_only, parameters) per row, kept in file order so a later row for a SKU wins
+        prepared = []
+        for row in rows:
+            if any(index is None or row[index] is None for index in required):
+                prepared.append((True, tuple(value for i, value in enumerate(row) if i != sku_index) + (user_id, row[sku_index])))
+            else:
+                prepared.append((False, (user_id,) + tuple(row)))
+
+        updates = [f"{column} = COALESCE(excluded.{column}, {column})" for column in columns if column != 'sku']
+        upsert_query = (f"INSERT INTO user_products (user_id, {', '.join(columns)}) VALUES (?, {', '.join(['?'] * len(columns))}) "
+                        f"ON CONFLICT(user_id, sku) DO UPDATE SET {', '.join(updates + ['updated_at = CURRENT_TIMESTAMP'])}")
+        update_query = (f"UPDATE user_products SET {', '.join(f'{column} = COALESCE(?, {column})' for column in columns if column != 'sku')}"
+                        f"{', ' if len(columns) > 1 else ''}updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND sku = ?")
+        try:
+            self.cursor.execute("BEGIN TRANSACTION")
+            # One executemany per run of consecutive rows of the same kind
+            for update_only, run in itertools.groupby(prepared, key=lambda item: item[0]):
+                self.cursor.executemany(update_query if update_only else upsert_query, [params for _, params in run])
+            self.conn.commit()
+            return True, f"{len(rows)} products saved."
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            return False, f"Bulk product update failed: {e}"
+
+    def iter_products(self, user_id, batch_size=1000):
+        """Streams the user's products as dicts of PRODUCT_IMPORT_COLUMNS, ordered by SKU."""
+        if not self.conn: return
+        with self._read_connection() as conn:
+            cursor = self.profiler.cursor(conn, 'iter_products')
+            try:
+                cursor.execute(f"SELECT {', '.join(PRODUCT_IMPORT_COLUMNS)} FROM user_products WHERE user_id = ? ORDER BY sku", (user_id,))
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows: break
+                    for row in rows:
+                        yield dict(zip(PRODUCT_IMPORT_COLUMNS, row))
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _product_search_query(search_term):
+        """Turns free text into an FTS5 query: every word must match as a prefix. None if there are no words."""
+        words = re.findall(r"\w+", search_term)
+        if not words: return None
+        return " ".join(f'"{word}"*' for word in words)
+
+    @cached_query("user_products")
+    @_reads
     def get_products_by_user_id(self, user_id, search_term=None, sort_by="product_name", sort_order="ASC"):
+        """
+        Lists a user's products, optionally filtered by search_term. Searches go
+        through the FTS5 index (prefix match on name, SKU, description, brand and
+        category); sort_by="relevance" orders them best match first.
+        """
         if not self.cursor or not user_id: return []
-        query = "SELECT * FROM user_products WHERE user_id = ?"
-        params = [user_id]
-        if search_term:
-            query += " AND (product_name LIKE ? OR sku LIKE ? OR description LIKE ? OR brand LIKE ?)"
-            like_term = f"%{search_term}%"; params.extend([like_term] * 4)
-        if sort_by not in ["product_name", "selling_price", "stock_quantity", "created_at"]: sort_by = "product_name"
+        match_query = self._product_search_query(search_term) if search_term else None
+        if match_query and getattr(self, "has_product_search", False):
+            # CROSS JOIN pins the index as the outer loop; otherwise SQLite may walk the user's products and probe it per row
+            query = (f"SELECT p.* FROM {PRODUCT_SEARCH_TABLE} CROSS JOIN user_products p ON p.id = {PRODUCT_SEARCH_TABLE}.rowid "
+                     f"WHERE {PRODUCT_SEARCH_TABLE} MATCH ? AND p.user_id = ?")
+            params = [match_query, user_id]
+        else:
+            query = "SELECT * FROM user_products p WHERE user_id = ?"
+            params = [user_id]
+            if search_term:
+                query += " AND (product_name LIKE ? OR sku LIKE ? OR description LIKE ? OR brand LIKE ? OR category LIKE ?)"
+                like_term = f"%{search_term}%"; params.extend([like_term] * 5)
         sort_order = "DESC" if sort_order.upper() == "DESC" else "ASC"
-        query += f" ORDER BY {sort_by} {sort_order}"
+        if sort_by == "relevance" and match_query and getattr(self, "has_product_search", False):
+            # Column weights follow PRODUCT_SEARCH_COLUMNS: name, sku, description, brand, category
+            query += f" ORDER BY bm25({PRODUCT_SEARCH_TABLE}, 10.0, 8.0, 1.0, 4.0, 3.0), p.product_name"
+        else:
+            if sort_by not in ["product_name", "selling_price", "stock_quantity", "created_at"]: sort_by = "product_name"
+            query += f" ORDER BY p.{sort_by} {sort_order}"
         try:
             self.cursor.execute(query, tuple(params))
             rows = self.cursor.fetchall()
@@ -183,6 +437,8 @@ class DatabaseManager:
             print(f"[DatabaseManager] Error getting products for user ID {user_id}: {e}")
             return []
 
+    @cached_query("user_products")
+    @_reads
     def get_product_by_id_and_user_id(self, product_id, user_id):
         if not self.cursor: return None
         try:
@@ -194,6 +450,8 @@ class DatabaseManager:
             print(f"[DB] Error getting product ID {product_id} for user ID {user_id}: {e}")
             return None
 
+    @invalidates("user_products")
+    @_writes
     def update_product(self, product_id, user_id, product_data):
         if not self.cursor: return False, "DB not connected."
         product_data['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -211,6 +469,9 @@ class DatabaseManager:
         except sqlite3.IntegrityError: return False, f"Error updating: SKU might already exist."
         except sqlite3.Error as e: return False, f"Database error updating product: {e}"
 
+    # The product's sale items and goals go with it (ON DELETE CASCADE)
+    @invalidates("user_products", "sales", "goals")
+    @_writes
     def delete_product(self, product_id, user_id):
         if not self.cursor: return False, "DB not connected."
         try:
@@ -237,9 +498,9 @@ class DatabaseManager:
                 FOREIGN KEY(product_id) REFERENCES user_products(id) ON DELETE CASCADE
             )
             """)
-        self.conn.commit()
-        
 
+    @invalidates("sales", "user_products", "activity_log")
+    @_writes
     def record_sale_transaction(self, user_id, items, total_amount, notes=''):
         """
         Records a sale and updates stock levels in a single, safe transaction.
@@ -270,27 +531,133 @@ class DatabaseManager:
                     "UPDATE user_products SET stock_quantity = stock_quantity - ? WHERE id = ? AND user_id = ?",
                     (quantity_sold, product_id, user_id)
                 )
+
+                self.cursor.execute(UPSERT_SALE_LINE_SQL, (product_id, quantity_sold * item['price'], quantity_sold, sale_id))
             
-            self.add_activity_log(user_id, "SALE", f"New sale recorded for ${total_amount:,.2f} with {len(items)} item(s).")
+            self.add_activity_log(user_id, "SALE", f"New sale recorded for ${total_amount:,.2f} with {len(items)} item(s).", commit=False)
             self.conn.commit()
             return True, "Sale recorded successfully."
 
         except sqlite3.Error as e:
             self.conn.rollback()
             return False, f"Transaction failed: {e}"
+
+    @invalidates("sales", "user_products", "activity_log")
+    @_writes
+    def record_sales_bulk(self, user_id, sales, update_stock=True, log_activity=True, commit=True):
+        """
+        Records many sales in one transaction and a single commit.
+        'sales' is a list of dicts: {'items': [{'id', 'quantity', 'price'}, ...],
+        optional 'sale_date' (datetime or 'YYYY-MM-DD HH:MM:SS', defaults to now),
+        'total_amount' (defaults to the sum of the lines) and 'notes'}.
+        Sale ids are allocated up front so every table is filled with executemany,
+        and stock is decremented once per product with the summed quantity.
+        Historical backfills can pass update_stock=False to leave stock levels alone.
+        With commit=False (inside write_transaction) the sales join the open
+        transaction; a failure still rolls back everything written in it.
+        """
+        if not self.conn or not self.cursor:
+            return False, "Database not connected."
+        if not sales:
+            return True, "No sales to record."
+
+        try:
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            self.cursor.execute("SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'sales'), 0), COALESCE((SELECT MAX(id) FROM sales), 0))")
+            first_sale_id = self.cursor.fetchone()[0] + 1
+
+            sale_rows, item_rows, stock_decrements = [], [], {}
+            grand_total = 0.0
+            for sale_id, sale in enumerate(sales, start=first_sale_id):
+                items = sale['items']
+                total_amount = sale.get('total_amount')
+                if total_amount is None:
+                    total_amount = sum(item['quantity'] * item['price'] for item in items)
+                sale_date = sale.get('sale_date')
+                if isinstance(sale_date, datetime):
+                    sale_date = sale_date.strftime('%Y-%m-%d %H:%M:%S')
+                sale_rows.append((sale_id, user_id, sale_date, total_amount, sale.get('notes', '')))
+                grand_total += total_amount
+                for item in items:
+                    item_rows.append((sale_id, item['id'], item['quantity'], item['price']))
+                    stock_decrements[item['id']] = stock_decrements.get(item['id'], 0) + item['quantity']
+            last_sale_id = first_sale_id + len(sales) - 1
+
+            self.cursor.executemany(
+                "INSERT INTO sales (id, user_id, sale_date, total_amount, notes) VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?)",
+                sale_rows
+            )
+            self.cursor.executemany(
+                "INSERT INTO sale_items (sale_id, product_id, quantity_sold, price_at_sale) VALUES (?, ?, ?, ?)",
+                item_rows
+            )
+            if update_stock:
+                self.cursor.executemany(
+                    "UPDATE user_products SET stock_quantity = stock_quantity - ? WHERE id = ? AND user_id = ?",
+                    [(quantity, product_id, user_id) for product_id, quantity in stock_decrements.items()]
+                )
+            self.cursor.execute(UPSERT_SALE_RANGE_SQL, (first_sale_id, last_sale_id))
+
+            if log_activity:
+                self.add_activity_log(user_id, "SALE", f"{len(sales)} sales imported for ${grand_total:,.2f} with {len(item_rows)} item(s).", commit=False)
+            if commit:
+                self.conn.commit()
+            return True, f"{len(sales)} sales recorded successfully."
+
+        except (sqlite3.Error, KeyError, TypeError) as e:
+            self.conn.rollback()
+            return False, f"Bulk transaction failed: {e}"
+
+    @contextmanager
+    def write_transaction(self):
+        """
+        Holds the writer for a block of write calls made with commit=False and
+        commits them together, or rolls them all back if the block raises.
+        Writes from other threads wait until the block ends. Cached reads are
+        dropped afterwards, once the outcome is visible to readers.
+        """
+        try:
+            with self._call('write_transaction', write=True):
+                try:
+                    yield
+                    self.conn.commit()
+                except BaseException:
+                    self.conn.rollback()
+                    raise
+        finally:
+            self.query_cache.clear()
+
+    @invalidates("sales")
+    @_writes
+    def rebuild_sales_rollup(self, user_id=None):
+        """Repairs 'daily_sales_rollup' from the raw sales rows (one user, or all when user_id is None)."""
+        if not self.conn or not self.cursor:
+            return False, "Database not connected."
+        try:
+            self.cursor.execute("BEGIN TRANSACTION")
+            rebuild_daily_sales_rollup(self.cursor, user_id)
+            self.conn.commit()
+            return True, "Sales statistics rebuilt."
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            return False, f"Rebuild failed: {e}"
     
 
+    def _build_sales_filter(self, user_id, start_date=None, end_date=None, product_id=None):
+        where = " WHERE s.user_id = ?"
+        params = [user_id]
+        if product_id: where += " AND si.product_id = ?"; params.append(product_id)
+        if start_date: where += " AND s.sale_date >= ?"; params.append(start_date)
+        if end_date: where += " AND s.sale_date <= ?"; params.append(end_date)
+        return where, params
+
+    @_reads
     def get_sales_records(self, user_id, start_date=None, end_date=None, product_id=None):
         if not self.cursor: return []
-        query = """SELECT s.sale_date, p.product_name, p.sku, p.category, si.quantity_sold, 
-                   si.price_at_sale, (si.quantity_sold * si.price_at_sale) as total_revenue
-                   FROM sales s JOIN sale_items si ON s.id = si.sale_id JOIN user_products p ON si.product_id = p.id
-                   WHERE s.user_id = ?"""
-        params = [user_id]
-        if product_id: query += " AND si.product_id = ?"; params.append(product_id)
-        if start_date: query += " AND s.sale_date >= ?"; params.append(start_date)
-        if end_date: query += " AND s.sale_date <= ?"; params.append(end_date)
-        query += " ORDER BY s.sale_date DESC"
+        where, params = self._build_sales_filter(user_id, start_date, end_date, product_id)
+        query = f"SELECT {SALES_RECORD_COLUMNS}{SALES_RECORDS_FROM}" + where
+        query += " ORDER BY s.sale_date DESC, si.id DESC"
         try:
             self.cursor.execute(query, tuple(params))
             rows = self.cursor.fetchall()
@@ -299,6 +666,97 @@ class DatabaseManager:
         except sqlite3.Error as e:
             print(f"[DB] Error getting sales records: {e}"); return []
 
+    def iter_sales_records(self, user_id, start_date=None, end_date=None, product_id=None, batch_size=1000):
+        """
+        Streams the rows of get_sales_records one dict at a time, fetching them from
+        a dedicated cursor in batches so the full history is never held in memory.
+        """
+        if not self.conn: return
+        where, params = self._build_sales_filter(user_id, start_date, end_date, product_id)
+        query = f"SELECT {SALES_RECORD_COLUMNS}{SALES_RECORDS_FROM}" + where
+        query += " ORDER BY s.sale_date DESC, si.id DESC"
+        with self._read_connection() as conn:
+            cursor = self.profiler.cursor(conn, 'iter_sales_records')
+            try:
+                cursor.execute(query, tuple(params))
+                columns = [desc[0] for desc in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows: break
+                    for row in rows:
+                        yield dict(zip(columns, row))
+            finally:
+                cursor.close()
+
+    @_reads
+    def get_sales_records_page(self, user_id, start_date=None, end_date=None, product_id=None, after=None, page_size=500):
+        """
+        Keyset-paginated variant of get_sales_records, newest first.
+        'after' is the cursor returned by the previous call (None for the first page):
+        a (sale_date, sale_item_id) pair. Returns (rows, next_cursor); next_cursor is
+        None once the last page has been returned.
+        """
+        if not self.cursor: return [], None
+        where, params = self._build_sales_filter(user_id, start_date, end_date, product_id)
+        if after is not None:
+            after_date, after_item_id = after
+            where += " AND s.sale_date <= ? AND (s.sale_date < ? OR si.id < ?)"
+            params.extend([after_date, after_date, after_item_id])
+        query = f"SELECT {SALES_RECORD_COLUMNS}, si.id as sale_item_id{SALES_RECORDS_FROM}" + where
+        query += " ORDER BY s.sale_date DESC, si.id DESC LIMIT ?"
+        params.append(page_size)
+        try:
+            self.cursor.execute(query, tuple(params))
+            rows = self.cursor.fetchall()
+            columns = [desc[0] for desc in self.cursor.description]
+            records = [dict(zip(columns, row)) for row in rows]
+            next_cursor = None
+            if len(records) == page_size:
+                next_cursor = (records[-1]['sale_date'], records[-1]['sale_item_id'])
+            return records, next_cursor
+        except sqlite3.Error as e:
+            print(f"[DB] Error getting sales records page: {e}"); return [], None
+
+    @cached_query("sales", "user_products")
+    @_reads
+    def get_sales_totals(self, user_id, start_date=None, end_date=None, product_id=None):
+        """Line count, revenue and units for the same filters as get_sales_records."""
+        empty = {'line_count': 0, 'total_revenue': 0.0, 'total_quantity': 0}
+        if not self.cursor: return empty
+        where, params = self._build_sales_filter(user_id, start_date, end_date, product_id)
+        query = "SELECT COUNT(*), SUM(si.quantity_sold * si.price_at_sale), SUM(si.quantity_sold) FROM sales s JOIN sale_items si ON s.id = si.sale_id" + where
+        try:
+            self.cursor.execute(query, tuple(params))
+            line_count, revenue, quantity = self.cursor.fetchone()
+            return {'line_count': line_count, 'total_revenue': revenue or 0.0, 'total_quantity': quantity or 0}
+        except sqlite3.Error as e:
+            print(f"[DB] Error getting sales totals: {e}"); return empty
+
+    @_reads
+    def get_product_sku_map(self, user_id):
+        """Maps each of the user's SKUs to (product_id, selling_price), for resolving imported rows."""
+        if not self.cursor: return {}
+        try:
+            self.cursor.execute("SELECT sku, id, selling_price FROM user_products WHERE user_id = ? AND sku IS NOT NULL", (user_id,))
+            return {sku: (product_id, price) for sku, product_id, price in self.cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"[DB] Error getting product SKU map: {e}"); return {}
+
+    @cached_query("sales", "user_products")
+    @_reads
+    def get_product_sales_summary(self, user_id):
+        """All-time revenue and units per product, from the daily rollup, best sellers first."""
+        if not self.cursor: return []
+        query = """SELECT p.product_name, p.sku, SUM(r.quantity) as total_quantity, SUM(r.revenue) as total_revenue
+                   FROM daily_sales_rollup r JOIN user_products p ON r.product_id = p.id
+                   WHERE r.user_id = ? GROUP BY r.product_id ORDER BY total_revenue DESC"""
+        try:
+            self.cursor.execute(query, (user_id,))
+            columns = [desc[0] for desc in self.cursor.description]
+            return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"[DB] Error getting product sales summary: {e}"); return []
+
     def _create_goals_table(self):
         if not self.cursor: return
         self.cursor.execute("""
@@ -315,8 +773,9 @@ class DatabaseManager:
                 FOREIGN KEY(product_id) REFERENCES user_products(id) ON DELETE CASCADE
             )
         """)
-        self.conn.commit()
 
+    @invalidates("goals")
+    @_writes
     def add_goal(self, user_id, goal_data):
         try:
             query = """INSERT INTO goals (user_id, goal_name, product_id, target_revenue, 
@@ -326,6 +785,8 @@ class DatabaseManager:
             self.cursor.execute(query, values); self.conn.commit(); return True, "Goal created."
         except sqlite3.Error as e: return False, f"DB error: {e}"
 
+    @cached_query("goals")
+    @_reads
     def get_user_goals(self, user_id):
         if not self.cursor: return []
         try:
@@ -334,16 +795,39 @@ class DatabaseManager:
             return [dict(zip(columns, row)) for row in rows]
         except sqlite3.Error as e: print(f"Error getting goals: {e}"); return []
 
+    @cached_query("goals", "sales")
+    @_reads
+    def get_user_goals_with_progress(self, user_id):
+        """
+        Returns every goal of the user with 'current_revenue' and 'current_quantity'
+        filled in, computed in a single statement against the daily sales rollup.
+        """
+        if not self.cursor: return []
+        query = """SELECT g.*, COALESCE(SUM(r.revenue), 0.0) AS current_revenue, COALESCE(SUM(r.quantity), 0) AS current_quantity
+                   FROM goals g LEFT JOIN daily_sales_rollup r
+                     ON r.user_id = g.user_id AND r.day BETWEEN DATE(g.start_date) AND DATE(g.deadline)
+                    AND (g.product_id IS NULL OR r.product_id = g.product_id)
+                   WHERE g.user_id = ? GROUP BY g.id ORDER BY g.deadline ASC"""
+        try:
+            self.cursor.execute(query, (user_id,))
+            rows = self.cursor.fetchall(); columns = [desc[0] for desc in self.cursor.description]
+            return [dict(zip(columns, row)) for row in rows]
+        except sqlite3.Error as e: print(f"Error getting goals with progress: {e}"); return []
+
+    @cached_query("sales")
+    @_reads
     def get_sales_progress_for_goal(self, user_id, start_date, end_date, product_id=None):
         if not self.cursor: return {'total_revenue': 0, 'total_quantity': 0}
-        query = "SELECT SUM(si.quantity_sold * si.price_at_sale), SUM(si.quantity_sold) FROM sales s JOIN sale_items si ON s.id = si.sale_id WHERE s.user_id = ? AND s.sale_date BETWEEN ? AND ?"
-        params = [user_id, start_date, end_date]
-        if product_id: query += " AND si.product_id = ?"; params.append(product_id)
+        query = "SELECT SUM(revenue), SUM(quantity) FROM daily_sales_rollup WHERE user_id = ? AND day BETWEEN ? AND ?"
+        params = [user_id, to_rollup_day(start_date), to_rollup_day(end_date)]
+        if product_id: query += " AND product_id = ?"; params.append(product_id)
         try:
             self.cursor.execute(query, params); result = self.cursor.fetchone()
             return {'total_revenue': result[0] or 0.0, 'total_quantity': result[1] or 0}
         except sqlite3.Error as e: print(f"Error calculating progress: {e}"); return {'total_revenue': 0, 'total_quantity': 0}
 
+    @invalidates("goals")
+    @_writes
     def delete_goal(self, goal_id, user_id):
         if not self.cursor: return False, "DB not connected."
         try:
@@ -357,56 +841,67 @@ class DatabaseManager:
             CREATE TABLE IF NOT EXISTS activity_log (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
             activity_type TEXT NOT NULL, description TEXT NOT NULL, activity_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE)""")
-        self.conn.commit()
 
-    def add_activity_log(self, user_id, activity_type, description):
+    @invalidates("activity_log")
+    @_writes
+    def add_activity_log(self, user_id, activity_type, description, commit=True):
+        """Pass commit=False when logging from inside a transaction that the caller commits."""
         if not self.cursor: return
         self.cursor.execute("INSERT INTO activity_log (user_id, activity_type, description) VALUES (?, ?, ?)",
                             (user_id, activity_type, description))
-        self.conn.commit()
+        if commit:
+            self.conn.commit()
 
+    @cached_query("activity_log")
+    @_reads
     def get_recent_activity(self, user_id, limit=5):
         if not self.cursor: return []
         self.cursor.execute("SELECT activity_type, description, activity_date FROM activity_log WHERE user_id = ? ORDER BY activity_date DESC LIMIT ?",
                             (user_id, limit))
         return self.cursor.fetchall()
 
+    @cached_query("sales", "user_products", key=_by_day_key)
+    @_reads
     def get_kpi_data(self, user_id, start_date=None, end_date=None):
         if not self.cursor: return {}
         if start_date is None: start_date = datetime.now().replace(day=1, hour=0, minute=0, second=0)
-        revenue_query = "SELECT SUM(si.quantity_sold * si.price_at_sale) FROM sales s JOIN sale_items si ON s.id = si.sale_id WHERE s.user_id = ? AND s.sale_date >= ?"
-        items_sold_query = "SELECT SUM(si.quantity_sold) FROM sales s JOIN sale_items si ON s.id = si.sale_id WHERE s.user_id = ? AND s.sale_date >= ?"
-        params = [user_id, start_date]
-        if end_date:
-            revenue_query += " AND s.sale_date <= ?"; items_sold_query += " AND s.sale_date <= ?"; params.append(end_date)
-        try:
-            self.cursor.execute(revenue_query, tuple(params)); revenue = self.cursor.fetchone()[0] or 0.0
-            self.cursor.execute(items_sold_query, tuple(params)); items_sold = self.cursor.fetchone()[0] or 0
-            self.cursor.execute("SELECT SUM(stock_quantity) FROM user_products WHERE user_id = ?", (user_id,)); total_stock = self.cursor.fetchone()[0] or 0
-            return {"revenue": revenue, "items_sold": items_sold, "total_stock": total_stock}
+        query = """SELECT SUM(revenue), SUM(quantity), (SELECT SUM(stock_quantity) FROM user_products WHERE user_id = ?)
+                   FROM daily_sales_rollup WHERE user_id = ? AND day >= ?"""
+        params = [user_id, user_id, to_rollup_day(start_date)]
+        if end_date: query += " AND day <= ?"; params.append(to_rollup_day(end_date))
+        try:
+            self.cursor.execute(query, tuple(params))
+            revenue, items_sold, total_stock = self.cursor.fetchone()
+            return {"revenue": revenue or 0.0, "items_sold": items_sold or 0, "total_stock": total_stock or 0}
         except sqlite3.Error as e: print(f"Error fetching KPI data: {e}"); return {}
 
+    @cached_query("user_products")
+    @_reads
     def get_attention_items(self, user_id):
         if not self.cursor: return {'low_stock': []}
         self.cursor.execute("SELECT id, product_name, stock_quantity FROM user_products WHERE user_id = ? AND stock_quantity <= low_stock_threshold AND stock_quantity > 0 ORDER BY stock_quantity ASC LIMIT 5", (user_id,))
         return {'low_stock': self.cursor.fetchall()}
 
+    @cached_query("sales", key=_by_day_key)
+    @_reads
     def get_daily_sales_for_chart(self, user_id, days=30):
         if not self.cursor: return {}
         date_sales = {(datetime.now().date() - timedelta(days=i)): 0.0 for i in range(days)}
         start_date_for_query = datetime.now().date() - timedelta(days=days - 1)
         try:
-            self.cursor.execute("SELECT DATE(s.sale_date), SUM(si.quantity_sold * si.price_at_sale) FROM sales s JOIN sale_items si ON s.id = si.sale_id WHERE s.user_id = ? AND DATE(s.sale_date) >= ? GROUP BY DATE(s.sale_date)", (user_id, start_date_for_query))
+            self.cursor.execute("SELECT day, SUM(revenue) FROM daily_sales_rollup WHERE user_id = ? AND day >= ? GROUP BY day", (user_id, to_rollup_day(start_date_for_query)))
             for row in self.cursor.fetchall(): date_sales[datetime.strptime(row[0], '%Y-%m-%d').date()] = row[1]
             return dict(sorted(date_sales.items()))
         except sqlite3.Error as e: print(f"Error fetching chart data: {e}"); return {}
 
+    @cached_query("sales", "user_products", key=_by_day_key)
+    @_reads
     def get_top_products(self, user_id, start_date=None, end_date=None, limit=5):
         if not self.cursor: return []
         if start_date is None: start_date = datetime.now().replace(day=1, hour=0, minute=0, second=0)
-        query = "SELECT p.product_name, SUM(si.quantity_sold * si.price_at_sale) as total_revenue FROM sales s JOIN sale_items si ON s.id = si.sale_id JOIN user_products p ON si.product_id = p.id WHERE s.user_id = ? AND s.sale_date >= ?"
-        params = [user_id, start_date]
-        if end_date: query += " AND s.sale_date <= ?"; params.append(end_date)
+        query = "SELECT p.product_name, SUM(r.revenue) as total_revenue FROM daily_sales_rollup r JOIN user_products p ON r.product_id = p.id WHERE r.user_id = ? AND r.day >= ?"
+        params = [user_id, to_rollup_day(start_date)]
+        if end_date: query += " AND r.day <= ?"; params.append(to_rollup_day(end_date))
         query += " GROUP BY p.product_name ORDER BY total_revenue DESC LIMIT ?"
         params.append(limit)
         try:
@@ -414,19 +909,108 @@ class DatabaseManager:
             return self.cursor.fetchall()
         except sqlite3.Error as e: print(f"Error getting top products: {e}"); return []
 
+    @cached_query("sales", "user_products", "activity_log", key=_by_day_key)
+    @_reads
+    def get_dashboard_snapshot(self, user_id, start_date, end_date, days=30):
+        """
+        Returns every dashboard panel in one call: 'kpi', 'chart', 'top_products',
+        'attention' and 'recent_activity', shaped like the individual getters.
+        KPI totals and the daily chart come from a single scan of the rollup.
+        """
+        empty = {'kpi': {}, 'chart': {}, 'top_products': [], 'attention': {'low_stock': []}, 'recent_activity': []}
+        if not self.cursor: return empty
+        today = datetime.now().date()
+        chart_days = [today - timedelta(days=i) for i in range(days)]
+        kpi_start, kpi_end = to_rollup_day(start_date), to_rollup_day(end_date)
+        scan_start = min(kpi_start, to_rollup_day(chart_days[-1]))
+        scan_end = max(kpi_end, to_rollup_day(today))
+        try:
+            self.cursor.execute("SELECT day, SUM(revenue), SUM(quantity) FROM daily_sales_rollup WHERE user_id = ? AND day BETWEEN ? AND ? GROUP BY day",
+                                (user_id, scan_start, scan_end))
+            chart = {d: 0.0 for d in chart_days}
+            revenue, items_sold = 0.0, 0
+            for day, day_revenue, day_quantity in self.cursor.fetchall():
+                if kpi_start <= day <= kpi_end:
+                    revenue += day_revenue or 0.0; items_sold += day_quantity or 0
+                day_date = datetime.strptime(day, '%Y-%m-%d').date()
+                if day_date in chart: chart[day_date] = day_revenue
+
+            self.cursor.execute("""SELECT p.product_name, SUM(r.revenue) as total_revenue FROM daily_sales_rollup r JOIN user_products p ON r.product_id = p.id
+                                   WHERE r.user_id = ? AND r.day BETWEEN ? AND ? GROUP BY p.product_name ORDER BY total_revenue DESC LIMIT 5""",
+                                (user_id, kpi_start, kpi_end))
+            top_products = self.cursor.fetchall()
+
+            # The inventory total and the low-stock items in one statement, told apart by is_item
+            self.cursor.execute("""SELECT 0 AS is_item, NULL, NULL, SUM(stock_quantity) AS stock_quantity FROM user_products WHERE user_id = ?
+                                   UNION ALL
+                                   SELECT * FROM (SELECT 1, id, product_name, stock_quantity FROM user_products
+                                                  WHERE user_id = ? AND stock_quantity <= low_stock_threshold AND stock_quantity > 0
+                                                  ORDER BY stock_quantity ASC LIMIT 5)
+                                   ORDER BY stock_quantity ASC""", (user_id, user_id))
+            total_stock, low_stock = 0, []
+            for is_item, product_id, product_name, stock_quantity in self.cursor.fetchall():
+                if is_item: low_stock.append((product_id, product_name, stock_quantity))
+                else: total_stock = stock_quantity or 0
+
+            self.cursor.execute("SELECT activity_type, description, activity_date FROM activity_log WHERE user_id = ? ORDER BY activity_date DESC LIMIT ?",
+                                (user_id, 5))
+            recent_activity = self.cursor.fetchall()
+
+            return {'kpi': {"revenue": revenue, "items_sold": items_sold, "total_stock": total_stock},
+                    'chart': dict(sorted(chart.items())),
+                    'top_products': top_products,
+                    'attention': {'low_stock': low_stock},
+                    'recent_activity': recent_activity}
+        except sqlite3.Error as e: print(f"Error fetching dashboard snapshot: {e}"); return empty
+
+    @_writes
+    def backup_database(self, file_path):
+        """Copies the live database to file_path with SQLite's backup API (safe while in use, includes the WAL)."""
+        if not self.conn: return False, "Database not connected."
+        try:
+            self.pool.backup_to(file_path)
+            return True, "Database backup successful!"
+        except sqlite3.Error as e:
+            return False, f"Could not create backup: {e}"
+
+    @_writes
+    def restore_database(self, file_path):
+        """Overwrites the live database with the backup at file_path and brings its schema up to date."""
+        if not self.conn: return False, "Database not connected."
+        try:
+            self.pool.restore_from(file_path)
+            self.query_cache.clear()
+            if not schema_is_current(self.conn):
+                bootstrap_schema(self.conn, self._create_tables)
+            self._detect_product_search()
+            return True, "Restore successful!"
+        except sqlite3.Error as e:
+            return False, f"Could not restore database: {e}"
+
     def close_connection(self):
-        if self.conn:
+        if self._reader_lease is not None:
+            self._reader_lease.__exit__(None, None, None)
+            self._reader_lease = None
+            self.conn = self.cursor = None
+        elif self.conn:
             print(f"[DatabaseManager] Closing connection to {self.db_path}")
-            self.conn.close()
+            if self.pool is not None and self.conn is self.pool.writer:
+                self.pool.close()
+            else:
+                self.conn.close()
             self.conn = self.cursor = None
 
     def close_and_reopen_connection(self):
-        db_path = self.db_path
         self.close_connection()
+        # The file may have been replaced (restore from backup)
+        self.query_cache.clear()
         try:
-            self.conn = sqlite3.connect(db_path)
+            self.conn = self.pool.reopen()
             self.cursor = self.conn.cursor()
-            self.cursor.execute("PRAGMA foreign_keys = ON;")
+            register_pool(self.pool)
+            if not schema_is_current(self.conn):
+                bootstrap_schema(self.conn, self._create_tables)
+            self._detect_product_search()
             print("[DatabaseManager] Database reconnected.")
             return True
         except sqlite3.Error as e:
@@ -0,0 +1,134 @@
+import sqlite3
+
+from model.sales_rollup import CREATE_ROLLUP_TABLE_SQL, rebuild_daily_sales_rollup
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+def _add_hot_path_indexes(cursor):
+    """Indexes backing the dashboard, sales history, goals and activity queries."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_user_date ON sales(user_id, sale_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sale_items_sale ON sale_items(sale_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sale_items_product ON sale_items(product_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_goals_user_deadline ON goals(user_id, deadline)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_log_user_date ON activity_log(user_id, activity_date)")
+
+
+def _add_daily_sales_rollup(cursor):
+    """Pre-aggregated daily totals, backfilled from the existing sales history."""
+    cursor.execute(CREATE_ROLLUP_TABLE_SQL)
+    rebuild_daily_sales_rollup(cursor)
+
+
+PRODUCT_SEARCH_TABLE = "product_search"
+PRODUCT_SEARCH_COLUMNS = ("product_name", "sku", "description", "brand", "category")
+
+
+def _add_product_search_index(cursor):
+    """
+    FTS5 index over the searchable product fields, using user_products as its
+    external content and kept in step by triggers. Skipped (search falls back
+    to LIKE) when the SQLite build has no FTS5.
+    """
+    columns = ", ".join(PRODUCT_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in PRODUCT_SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in PRODUCT_SEARCH_COLUMNS)
+    try:
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {PRODUCT_SEARCH_TABLE} USING fts5(
+                {columns},
+                content='user_products', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"[Migrations] FTS5 unavailable, product search will use LIKE: {e}")
+        return
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_products_search_ai AFTER INSERT ON user_products BEGIN
+            INSERT INTO {PRODUCT_SEARCH_TABLE} (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_products_search_ad AFTER DELETE ON user_products BEGIN
+            INSERT INTO {PRODUCT_SEARCH_TABLE} ({PRODUCT_SEARCH_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_products_search_au AFTER UPDATE OF {columns} ON user_products BEGIN
+            INSERT INTO {PRODUCT_SEARCH_TABLE} ({PRODUCT_SEARCH_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {PRODUCT_SEARCH_TABLE} (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    cursor.execute(f"INSERT INTO {PRODUCT_SEARCH_TABLE} ({PRODUCT_SEARCH_TABLE}) VALUES ('rebuild')")
+
+
+# Ordered list of (version, description, step). Each step receives a cursor, must
+# not commit (bootstrap_schema runs them all in one transaction) and must be
+# idempotent, so re-running it against a partially migrated file is safe.
+MIGRATIONS = [
+    (1, "Add secondary indexes for hot read paths", _add_hot_path_indexes),
+    (2, "Add daily_sales_rollup aggregate table", _add_daily_sales_rollup),
+    (3, "Add FTS5 product search index", _add_product_search_index),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def _ensure_version_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_schema_version(conn):
+    cursor = conn.cursor()
+    _ensure_version_table(cursor)
+    cursor.execute(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")
+    return cursor.fetchone()[0] or 0
+
+
+def schema_is_current(conn):
+    """
+    True when PRAGMA user_version (which bootstrap_schema sets last, in the same
+    transaction) says the file already has every table and migration. It is
+    read from the database header, so this is the only work opening an
+    up-to-date database needs.
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0] >= LATEST_SCHEMA_VERSION
+
+
+def bootstrap_schema(conn, create_tables):
+    """
+    Brings the schema up to date in a single transaction (one commit): runs
+    create_tables(), which issues the base CREATE TABLE IF NOT EXISTS statements
+    on conn without committing, then every migration newer than the recorded
+    schema version, then stamps PRAGMA user_version. Files made before
+    user_version was used go through here once. Returns the versions applied.
+    """
+    cursor = conn.cursor()
+    applied = []
+    try:
+        # IMMEDIATE: take the write lock up front, so two processes opening a new file don't both migrate it
+        cursor.execute("BEGIN IMMEDIATE")
+        create_tables()
+        current_version = get_schema_version(conn)
+        for version, description, step in MIGRATIONS:
+            if version <= current_version:
+                continue
+            step(cursor)
+            cursor.execute(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description) VALUES (?, ?)",
+                           (version, description))
+            applied.append((version, description))
+        cursor.execute(f"PRAGMA user_version = {LATEST_SCHEMA_VERSION}")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    for version, description in applied:
+        print(f"[Migrations] Applied schema version {version}: {description}")
+    return [version for version, _ in applied]
@@ -0,0 +1,240 @@
+"""
+Read-through cache for DatabaseManager queries.
+
+Read methods decorated with @cached_query(tables...) store their results keyed
+by method name and arguments; write methods decorated with
+@invalidates(tables...) drop every cached result that read one of those tables
+for the same user (or for no particular user). Entries also expire after a TTL,
+which bounds staleness from writes made outside this process (e.g. the import
+scripts), and the least recently used ones are evicted past max_entries.
+
+All managers opened on the same database file share one cache, so a write on
+the GUI's connection also invalidates what the background read-only loaders
+have cached.
+"""
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 30.0
+# Bigger results (e.g. a 50k-product listing) are not worth holding and copying
+MAX_CACHED_ROWS = 5000
+
+# Stands in for the user id in the generation counter of "every user's rows of a table"
+_ALL_USERS = object()
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(db_path):
+    """The shared cache for a database file."""
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = QueryCache()
+        return _caches[db_path]
+
+
+_SCALARS = (str, int, float, bool, bytes, type(None))
+
+
+def _copy_result(value):
+    """Deep copy for query results (lists/dicts/tuples of scalars) without the generic deepcopy overhead."""
+    if isinstance(value, _SCALARS):
+        return value
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, tuple) and all(isinstance(item, _SCALARS) for item in value):
+        return value
+    return copy.deepcopy(value)
+
+
+def _flat(row):
+    if isinstance(row, dict):
+        return all(isinstance(item, _SCALARS) for item in row.values())
+    return isinstance(row, _SCALARS) or (isinstance(row, tuple) and all(isinstance(item, _SCALARS) for item in row))
+
+
+def _copier_for(value):
+    """
+    Picks how hits on value get copied. The usual shapes (a list of flat row
+    dicts or tuples, one flat dict) only need a copy per row, decided once here
+    rather than re-inspected on every hit.
+    """
+    if isinstance(value, _SCALARS):
+        return None
+    if isinstance(value, list) and all(_flat(row) for row in value):
+        return lambda rows: [row.copy() if isinstance(row, dict) else row for row in rows]
+    if isinstance(value, dict) and _flat(value):
+        return dict.copy
+    return _copy_result
+
+
+def _row_count(value):
+    return len(value) if isinstance(value, (list, dict)) else 1
+
+
+class QueryCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, max_rows=MAX_CACHED_ROWS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.enabled = True
+        self._entries = OrderedDict()   # key -> (expires_at, tags, value, copier)
+        self._tagged = {}               # (table, user_id) -> set of keys
+        self._generations = {}          # (table, user_id or _ALL_USERS) -> bumped on every invalidation
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def lookup(self, key):
+        """Returns (found, value); value is a private copy of the cached result."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _, _, value, copier = entry
+            else:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+        return True, copier(value) if copier else value
+
+    def generation(self, tags):
+        """Snapshot to pass to store(), taken before running the query."""
+        with self._lock:
+            return self._generation(tags)
+
+    def _generation(self, tags):
+        return tuple((self._generations.get(tag, 0), self._generations.get((tag[0], _ALL_USERS), 0)) for tag in tags)
+
+    def store(self, key, tags, value, generation):
+        """
+        Caches value unless one of its tags was invalidated since generation was
+        taken (a write raced with the query) or the result is too large.
+        """
+        if _row_count(value) > self.max_rows:
+            return
+        copier = _copier_for(value)
+        value = copier(value) if copier else value
+        with self._lock:
+            if self._generation(tags) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tags, value, copier)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tables, user_id=None):
+        """
+        Drops cached results that read any of tables for user_id, plus those not
+        tied to a user. With user_id None every user's results for those tables go.
+        """
+        with self._lock:
+            for table in tables:
+                if user_id is None:
+                    tags = [tag for tag in self._tagged if tag[0] == table]
+                    tags += [(table, None), (table, _ALL_USERS)]
+                else:
+                    tags = [(table, user_id), (table, None)]
+                for tag in tags:
+                    self._generations[tag] = self._generations.get(tag, 0) + 1
+                    for key in self._tagged.pop(tag, ()):
+                        if key in self._entries:
+                            self._remove(key)
+                            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            for table in {tag[0] for tag in self._generations} | {tag[0] for tag in self._tagged}:
+                self._generations[(table, _ALL_USERS)] = self._generations.get((table, _ALL_USERS), 0) + 1
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                    'entries': len(self._entries), 'evictions': self.evictions, 'invalidations': self.invalidations}
+
+    def _remove(self, key):
+        _, tags, _, _ = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+
+def _user_id_getter(method):
+    """Builds a function that pulls the user_id argument out of a call to method, if it has one."""
+    signature = inspect.signature(method)
+    if 'user_id' not in signature.parameters:
+        return lambda args, kwargs: None
+
+    def user_id_of(args, kwargs):
+        bound = signature.bind_partial(*args, **kwargs)
+        return bound.arguments.get('user_id')
+    return user_id_of
+
+
+def cached_query(*tables, key=None):
+    """
+    Caches a DatabaseManager read method. tables are the tables its result depends
+    on; key(*args, **kwargs) can replace the raw arguments in the cache key, e.g.
+    to round timestamps down to the granularity the query actually uses.
+    """
+    def decorator(method):
+        user_id_of = _user_id_getter(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'query_cache', None)
+            if cache is None or not cache.enabled or not self.cursor:
+                return method(self, *args, **kwargs)
+            arguments = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            try:
+                cache_key = (method.__name__, arguments)
+                hash(cache_key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+            found, value = cache.lookup(cache_key)
+            if found:
+                return value
+            user_id = user_id_of((self,) + args, kwargs)
+            tags = tuple((table, user_id) for table in tables)
+            generation = cache.generation(tags)
+            value = method(self, *args, **kwargs)
+            cache.store(cache_key, tags, value, generation)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidates(*tables):
+    """Marks a DatabaseManager write method; afterwards cached reads of tables for that user are dropped."""
+    def decorator(method):
+        user_id_of = _user_id_getter(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                cache = getattr(self, 'query_cache', None)
+                if cache is not None:
+                    cache.invalidate(tables, user_id_of((self,) + args, kwargs))
+        return wrapper
+    return decorator
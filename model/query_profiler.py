@@ -0,0 +1,275 @@
+"""
+Timing of DatabaseManager queries.
+
+The cursors DatabaseManager methods run on are ProfilingCursors: every
+statement is recorded (SQL, the shape of its parameters, rows fetched, time
+spent in SQLite) into a ring buffer, and one slower than slow_query_ms is
+logged on this module's logger together with its EXPLAIN QUERY PLAN. Each
+method call is timed as well, for the per-method percentiles and histograms
+of method_stats() and histogram().
+
+Parameter values are never kept, only their types, so passwords and customer
+data do not end up in the buffer or the log.
+
+All managers opened on the same database file share a profiler (see
+get_query_profiler).
+"""
+import bisect
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 200.0
+DEFAULT_BUFFER_SIZE = 500
+# Latencies kept per method for the percentiles
+SAMPLES_PER_METHOD = 1024
+# Upper bounds of the histogram buckets, in ms; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_profilers = {}
+_profilers_lock = threading.Lock()
+
+
+def get_query_profiler(db_path):
+    """The shared profiler for a database file."""
+    with _profilers_lock:
+        if db_path not in _profilers:
+            _profilers[db_path] = QueryProfiler()
+        return _profilers[db_path]
+
+
+def _shape_of(params, many=False):
+    """
+    What params_shape() needs, cheap enough to take on every statement: a tuple
+    of types (or names for named parameters), or for executemany a
+    [row count, shape of the first row] list. Never the values themselves.
+    """
+    if many:
+        return [len(params), _shape_of(params[0])] if isinstance(params, (list, tuple)) and params else [None, None]
+    if isinstance(params, dict):
+        return tuple(params)
+    return tuple(map(type, params))
+
+
+def params_shape(shape):
+    """Describes parameters without their values, e.g. '(int, str)', '(:user_id, :day)' or '250 x (int, float)'."""
+    if isinstance(shape, list):
+        count, row = shape
+        return f"{count} x {params_shape(row)}" if count is not None else "iterable"
+    return "(" + ", ".join(f":{item}" if isinstance(item, str) else item.__name__ for item in shape) + ")"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class QueryRecord:
+    """One statement run by a DatabaseManager method."""
+    __slots__ = ("method", "sql", "shape", "rows", "elapsed_ms", "started_at", "thread", "error", "plan")
+
+    def __init__(self, method, sql, shape, started_at):
+        self.method = method
+        self.thread = threading.get_ident()
+        self.sql = sql
+        self.shape = shape
+        self.rows = 0
+        self.elapsed_ms = 0.0
+        self.started_at = started_at
+        self.error = None
+        self.plan = None
+
+    @property
+    def statement(self):
+        """The SQL on one line."""
+        return " ".join(self.sql.split())
+
+    @property
+    def params_shape(self):
+        return params_shape(self.shape)
+
+    def as_dict(self):
+        return {'method': self.method, 'statement': self.statement, 'params_shape': self.params_shape,
+                'rows': self.rows, 'elapsed_ms': self.elapsed_ms, 'started_at': self.started_at,
+                'thread': self.thread, 'error': self.error, 'plan': self.plan}
+
+    def __repr__(self):
+        return f"QueryRecord({self.method!r}, {self.elapsed_ms:.2f} ms, rows={self.rows})"
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """
+    A cursor that times its statements. A statement's record is complete once
+    the next one starts or the cursor is closed, so fetch time and row counts
+    are included.
+    """
+
+    def __init__(self, connection, profiler, method):
+        super().__init__(connection)
+        self._profiler = profiler
+        self._method = method
+        self._record = None
+        self._params = None
+
+    def _start(self, sql, params, many):
+        self._finish()
+        self._record = QueryRecord(self._method, sql, _shape_of(params, many), time.time())
+        self._params = None if many else params
+
+    def _timed(self, call, *args):
+        started = time.perf_counter()
+        try:
+            return call(*args)
+        except sqlite3.Error as e:
+            if self._record is not None:
+                self._record.error = str(e)
+            raise
+        finally:
+            if self._record is not None:
+                self._record.elapsed_ms += (time.perf_counter() - started) * 1000
+
+    def execute(self, sql, params=()):
+        self._start(sql, params, many=False)
+        self._timed(super().execute, sql, params)
+        if self.description is None:
+            # Not a query: count the rows it changed instead of the rows fetched
+            self._record.rows = max(self.rowcount, 0)
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._start(sql, seq_of_params, many=True)
+        self._timed(super().executemany, sql, seq_of_params)
+        self._record.rows = self.rowcount
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is not None and self._record is not None:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def _finish(self):
+        record, params = self._record, self._params
+        self._record = self._params = None
+        if record is not None:
+            self._profiler.record_statement(record, self.connection, params)
+
+
+class _MethodStats:
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "samples", "buckets")
+
+    def __init__(self):
+        self.calls = self.errors = 0
+        self.total_ms = self.max_ms = 0.0
+        self.samples = deque(maxlen=SAMPLES_PER_METHOD)
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+
+class QueryProfiler:
+    def __init__(self, slow_query_ms=DEFAULT_SLOW_QUERY_MS, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.enabled = True
+        self.slow_query_ms = slow_query_ms
+        self._records = deque(maxlen=buffer_size)
+        self._slow = deque(maxlen=buffer_size)
+        self._methods = {}
+        self._lock = threading.Lock()
+
+    def cursor(self, connection, method):
+        """A cursor on connection whose statements are attributed to method."""
+        if not self.enabled:
+            return connection.cursor()
+        return connection.cursor(lambda conn: ProfilingCursor(conn, self, method))
+
+    def record_statement(self, record, connection, params=None):
+        slow = record.elapsed_ms >= self.slow_query_ms
+        if slow and record.error is None and params is not None:
+            try:
+                record.plan = [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {record.sql}", params).fetchall()]
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            self._records.append(record)
+            if slow:
+                self._slow.append(record)
+        if slow:
+            plan = "\n".join(f"    {line}" for line in record.plan or ["(no plan)"])
+            logger.warning("Slow query in %s: %.1f ms, %d rows, params %s\n  %s\n%s",
+                           record.method, record.elapsed_ms, record.rows, record.params_shape, record.statement, plan)
+
+    def record_call(self, method, elapsed_ms, failed=False):
+        """Adds the duration of one DatabaseManager method call."""
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.samples.append(elapsed_ms)
+            stats.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, elapsed_ms)] += 1
+
+    def recent(self, limit=None):
+        """The latest statement records, newest first."""
+        with self._lock:
+            records = list(self._records)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def slow_queries(self, limit=None):
+        with self._lock:
+            records = list(self._slow)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def method_stats(self):
+        """
+        {method: {'calls', 'errors', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}},
+        slowest p95 first. Percentiles cover the last SAMPLES_PER_METHOD calls.
+        """
+        with self._lock:
+            snapshot = {name: (stats.calls, stats.errors, stats.total_ms, stats.max_ms, sorted(stats.samples))
+                        for name, stats in self._methods.items()}
+        result = {}
+        for name, (calls, errors, total_ms, max_ms, samples) in snapshot.items():
+            result[name] = {'calls': calls, 'errors': errors, 'mean_ms': total_ms / calls,
+                            'p50_ms': percentile(samples, 0.50), 'p95_ms': percentile(samples, 0.95),
+                            'p99_ms': percentile(samples, 0.99), 'max_ms': max_ms}
+        return dict(sorted(result.items(), key=lambda item: item[1]['p95_ms'], reverse=True))
+
+    def histogram(self, method):
+        """[(upper bound in ms or None for the last bucket, calls)] over every call of method."""
+        with self._lock:
+            stats = self._methods.get(method)
+            buckets = list(stats.buckets) if stats else [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        return list(zip(HISTOGRAM_BOUNDS_MS + (None,), buckets))
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+            self._slow.clear()
+            self._methods.clear()
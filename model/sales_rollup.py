@@ -0,0 +1,72 @@
+"""
+Pre-aggregated per-day, per-product sales totals.
+
+'daily_sales_rollup' holds one row per (user, day, product) and is kept in step
+with 'sales'/'sale_items' by every write path, so chart, KPI and goal reads
+cost the same regardless of how much history the raw tables hold.
+"""
+from datetime import date, datetime
+
+CREATE_ROLLUP_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS daily_sales_rollup (
+        user_id INTEGER NOT NULL,
+        day TEXT NOT NULL,
+        product_id INTEGER NOT NULL,
+        revenue REAL NOT NULL DEFAULT 0.0,
+        quantity INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day, product_id),
+        FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY(product_id) REFERENCES user_products(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+"""
+
+# Adds one sale line to the rollup; the day is taken from the stored sale row so
+# it always matches what a rebuild from the raw tables would produce.
+# Parameters: (product_id, revenue, quantity, sale_id)
+UPSERT_SALE_LINE_SQL = """
+    INSERT INTO daily_sales_rollup (user_id, day, product_id, revenue, quantity)
+    SELECT user_id, DATE(sale_date), ?, ?, ? FROM sales WHERE id = ?
+    ON CONFLICT(user_id, day, product_id) DO UPDATE SET
+        revenue = revenue + excluded.revenue,
+        quantity = quantity + excluded.quantity
+"""
+
+# Folds every line of a contiguous block of sale ids into the rollup in one
+# statement, for bulk inserts. Parameters: (first_sale_id, last_sale_id)
+UPSERT_SALE_RANGE_SQL = """
+    INSERT INTO daily_sales_rollup (user_id, day, product_id, revenue, quantity)
+    SELECT s.user_id, DATE(s.sale_date), si.product_id,
+           SUM(si.quantity_sold * si.price_at_sale), SUM(si.quantity_sold)
+    FROM sales s JOIN sale_items si ON s.id = si.sale_id
+    WHERE s.id BETWEEN ? AND ?
+    GROUP BY s.user_id, DATE(s.sale_date), si.product_id
+    ON CONFLICT(user_id, day, product_id) DO UPDATE SET
+        revenue = revenue + excluded.revenue,
+        quantity = quantity + excluded.quantity
+"""
+
+
+def to_rollup_day(value):
+    """Normalises a datetime, date or 'YYYY-MM-DD[ HH:MM:SS]' string to a rollup day key."""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)[:10]
+
+
+def rebuild_daily_sales_rollup(cursor, user_id=None):
+    """Recomputes the rollup from the raw sales tables, for one user or for everyone."""
+    if user_id is None:
+        cursor.execute("DELETE FROM daily_sales_rollup")
+        user_filter, params = "", ()
+    else:
+        cursor.execute("DELETE FROM daily_sales_rollup WHERE user_id = ?", (user_id,))
+        user_filter, params = " WHERE s.user_id = ?", (user_id,)
+    cursor.execute(f"""
+        INSERT INTO daily_sales_rollup (user_id, day, product_id, revenue, quantity)
+        SELECT s.user_id, DATE(s.sale_date), si.product_id,
+               SUM(si.quantity_sold * si.price_at_sale), SUM(si.quantity_sold)
+        FROM sales s JOIN sale_items si ON s.id = si.sale_id{user_filter}
+        GROUP BY s.user_id, DATE(s.sale_date), si.product_id
+    """, params)
@@ -1,8 +1,9 @@
-import sqlite3
 import random
 from datetime import datetime, timedelta
 import os
 
+from model.database_manager import DatabaseManager
+
 DATABASE_PATH = 'app_database.db'
 USER_ID_TO_POPULATE = 1 
 
@@ -15,17 +16,16 @@ def create_random_sales():
         print(f"Database not found at '{DATABASE_PATH}'. Please check the path.")
         return
 
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    db_manager = DatabaseManager(os.path.abspath(DATABASE_PATH))
 
-    products = get_products(cursor, USER_ID_TO_POPULATE)
+    products = get_products(db_manager.cursor, USER_ID_TO_POPULATE)
     if not products:
         print(f"No products found for user_id {USER_ID_TO_POPULATE}. Add some products first.")
-        conn.close()
+        db_manager.close_connection()
         return
 
     print(f"Found {len(products)} products for user {USER_ID_TO_POPULATE}. Generating random sales...")
-    sales_created = 0
+    sales = []
 
     for product_id, price, stock in products:
         if stock <= 0:
@@ -39,37 +39,19 @@ def create_random_sales():
             quantity_sold = random.randint(1, min(2, stock))
             
             sale_date = datetime.now() - timedelta(days=random.randint(0, 30))
-            total_amount = quantity_sold * price
-            
-            try:
-                cursor.execute("BEGIN TRANSACTION")
-
-                cursor.execute(
-                    "INSERT INTO sales (user_id, sale_date, total_amount) VALUES (?, ?, ?)",
-                    (USER_ID_TO_POPULATE, sale_date, total_amount)
-                )
-                sale_id = cursor.lastrowid
-
-                cursor.execute(
-                    "INSERT INTO sale_items (sale_id, product_id, quantity_sold, price_at_sale) VALUES (?, ?, ?, ?)",
-                    (sale_id, product_id, quantity_sold, price)
-                )
-
-                cursor.execute(
-                    "UPDATE user_products SET stock_quantity = stock_quantity - ? WHERE id = ?",
-                    (quantity_sold, product_id)
-                )
-                
-                conn.commit()
-                stock -= quantity_sold
-                sales_created += 1
-
-            except sqlite3.Error as e:
-                print(f"An error occurred: {e}")
-                conn.rollback()
-
-    print(f"Done. Created {sales_created} random sale records.")
-    conn.close()
+            sales.append({
+                'sale_date': sale_date,
+                'total_amount': quantity_sold * price,
+                'items': [{'id': product_id, 'quantity': quantity_sold, 'price': price}]
+            })
+            stock -= quantity_sold
+
+    success, message = db_manager.record_sales_bulk(USER_ID_TO_POPULATE, sales)
+    if success:
+        print(f"Done. Created {len(sales)} random sale records.")
+    else:
+        print(f"An error occurred: {message}")
+    db_manager.close_connection()
 
 if __name__ == "__main__":
-    create_random_sales()
\ No newline at end of file
+    create_random_sales()
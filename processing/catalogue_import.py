@@ -0,0 +1,185 @@
+"""
+Bulk product catalogue import from CSV/XLSX files.
+
+The first row names the columns (see PRODUCT_IMPORT_COLUMNS; 'sku' is required).
+Rows are matched to existing products by SKU: known SKUs are updated, new ones
+inserted, in batches through DatabaseManager.upsert_products_bulk. Empty cells
+leave the stored value unchanged. Rows that fail validation are skipped and
+reported with their line number.
+"""
+import csv
+import os
+
+from model.database_manager import PRODUCT_IMPORT_COLUMNS
+
+IMPORT_BATCH_SIZE = 2000
+
+COLUMN_ALIASES = {
+    "name": "product_name", "product": "product_name",
+    "price": "selling_price", "sale_price": "selling_price",
+    "cost": "purchase_price", "cost_price": "purchase_price",
+    "stock": "stock_quantity", "low_stock": "low_stock_threshold", "reorder_level": "low_stock_threshold",
+}
+FLOAT_COLUMNS = ('purchase_price', 'selling_price')
+INT_COLUMNS = ('stock_quantity', 'low_stock_threshold')
+# Sales are not stopped at zero stock, so a stored (and exported) stock level can be negative
+SIGNED_COLUMNS = ('stock_quantity',)
+# Values used for new products when the file leaves these cells empty
+NEW_PRODUCT_DEFAULTS = {'purchase_price': 0.0, 'stock_quantity': 0, 'low_stock_threshold': 5}
+
+
+def _normalise_column(name):
+    name = str(name or "").strip().lower().replace(" ", "_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _read_rows(file_path):
+    """Yields the header row, then (line_number, values) for each non-empty data row."""
+    if file_path.lower().endswith(".xlsx"):
+        # Only XLSX catalogues need openpyxl, which is slow to import
+        from openpyxl import load_workbook
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            yield next(rows, None)
+            for line_number, values in enumerate(rows, start=2):
+                if any(value not in (None, "") for value in values):
+                    yield line_number, values
+        finally:
+            workbook.close()
+    else:
+        with open(file_path, "r", newline="", encoding="utf-8-sig") as handle:
+            reader = csv.reader(handle)
+            yield next(reader, None)
+            for values in reader:
+                if any(value.strip() for value in values):
+                    yield reader.line_num, values
+
+
+def _parse_value(column, value):
+    """Converts one cell to its stored type; empty cells become None. Raises ValueError."""
+    if value is None or str(value).strip() == "":
+        return None
+    if column in FLOAT_COLUMNS:
+        try:
+            number = float(str(value).strip().lstrip("$"))
+        except ValueError:
+            raise ValueError(f"invalid {column} '{value}'")
+        if number < 0:
+            raise ValueError(f"{column} cannot be negative")
+        return number
+    if column in INT_COLUMNS:
+        try:
+            number = float(str(value).strip())
+        except ValueError:
+            raise ValueError(f"invalid {column} '{value}'")
+        if number != int(number):
+            raise ValueError(f"{column} must be a whole number")
+        if number < 0 and column not in SIGNED_COLUMNS:
+            raise ValueError(f"{column} cannot be negative")
+        return int(number)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # numeric SKUs read from spreadsheets
+    return str(value).strip()
+
+
+class CatalogueImporter:
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def import_file(self, user_id, file_path, progress_callback=None, should_cancel=None):
+        """
+        Loads a catalogue file for user_id. progress_callback(rows_processed, 0) is
+        called after each batch; should_cancel() is checked between batches (batches
+        already saved are kept). Returns a report dict with 'success', 'message',
+        'inserted', 'updated', 'rejected' and 'errors' as (line_number, message).
+        """
+        report = {'success': True, 'message': "", 'inserted': 0, 'updated': 0, 'rejected': 0, 'errors': []}
+        if not os.path.exists(file_path):
+            report.update(success=False, message=f"File not found: {file_path}")
+            return report
+
+        try:
+            rows = _read_rows(file_path)
+            header = next(rows)
+            if not header:
+                report.update(success=False, message="The file is empty.")
+                return report
+            file_columns = [_normalise_column(name) for name in header]
+            if 'sku' not in file_columns:
+                report.update(success=False, message="The file has no 'sku' column.")
+                return report
+            # Only recognised columns are loaded; the first occurrence of a name wins
+            positions = {}
+            for position, column in enumerate(file_columns):
+                if column in PRODUCT_IMPORT_COLUMNS and column not in positions:
+                    positions[column] = position
+            columns = [column for column in PRODUCT_IMPORT_COLUMNS if column in positions]
+
+            known_skus = set(self.db_manager.get_product_sku_map(user_id))
+            batch, batch_inserted = [], 0
+            rows_processed = 0
+
+            def flush():
+                nonlocal batch, batch_inserted
+                if batch:
+                    success, message = self.db_manager.upsert_products_bulk(user_id, columns, batch)
+                    if not success:
+                        report.update(success=False, message=message)
+                        return False
+                    report['inserted'] += batch_inserted
+                    report['updated'] += len(batch) - batch_inserted
+                batch, batch_inserted = [], 0
+                if progress_callback:
+                    progress_callback(rows_processed, 0)
+                return True
+
+            for line_number, values in rows:
+                rows_processed += 1
+                try:
+                    record = {column: _parse_value(column, values[positions[column]] if positions[column] < len(values) else None)
+                              for column in columns}
+                    if not record['sku']:
+                        raise ValueError("missing sku")
+                    is_new = record['sku'] not in known_skus
+                    if is_new:
+                        if not record.get('product_name') or record.get('selling_price') is None:
+                            raise ValueError("new products need a product_name and a selling_price")
+                        for column, default in NEW_PRODUCT_DEFAULTS.items():
+                            if column in record and record[column] is None:
+                                record[column] = default
+                except ValueError as e:
+                    report['rejected'] += 1
+                    report['errors'].append((line_number, str(e)))
+                    continue
+
+                if is_new:
+                    known_skus.add(record['sku'])
+                    batch_inserted += 1
+                batch.append(tuple(record[column] for column in columns))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    if not flush():
+                        return report
+                    if should_cancel and should_cancel():
+                        report.update(success=False, message=self._summary(report, "Import cancelled"))
+                        return report
+
+            if not flush():
+                return report
+        except Exception as e:
+            report.update(success=False, message=f"Could not read {os.path.basename(file_path)}: {e}")
+            return report
+
+        if report['inserted'] or report['updated']:
+            self.db_manager.add_activity_log(user_id, "PRODUCT", f"Catalogue import: {report['inserted']} added, {report['updated']} updated.")
+        report['message'] = self._summary(report, "Import complete")
+        return report
+
+    @staticmethod
+    def _summary(report, prefix):
+        summary = f"{prefix}: {report['inserted']} inserted, {report['updated']} updated, {report['rejected']} rejected."
+        for line_number, message in report['errors'][:5]:
+            summary += f"\nLine {line_number}: {message}"
+        if len(report['errors']) > 5:
+            summary += f"\n... and {len(report['errors']) - 5} more"
+        return summary
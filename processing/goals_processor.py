@@ -11,19 +11,8 @@ class GoalsProcessor:
         return self.db_manager.add_goal(user_id, goal_data)
 
     def get_all_goals_with_progress(self, user_id):
-        goals = self.db_manager.get_user_goals(user_id)
-        
-        for goal in goals:
-            progress = self.db_manager.get_sales_progress_for_goal(
-                user_id,
-                goal['start_date'],
-                goal['deadline'],
-                goal.get('product_id')
-            )
-            goal['current_revenue'] = progress['total_revenue']
-            goal['current_quantity'] = progress['total_quantity']
-        
-        return goals
+        """Returns the user's goals with their current revenue/quantity, in one query."""
+        return self.db_manager.get_user_goals_with_progress(user_id)
     
     def delete_goal(self, user_id, goal_id):
         return self.db_manager.delete_goal(goal_id, user_id)
\ No newline at end of file
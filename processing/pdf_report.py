@@ -0,0 +1,164 @@
+"""
+Page-at-a-time PDF sales reports.
+
+Rather than handing reportlab one Table holding every row (whose layout cost
+explodes with size), rows are pulled from an iterator in fixed-size chunks and
+each chunk is drawn straight onto its own page as a small table with the header
+repeated and a subtotal row for that page. Work per page is constant, so total
+time grows linearly with the number of rows.
+"""
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+ROWS_PER_PAGE = 38
+ROW_HEIGHT = 15
+FONT_NAME = "Helvetica"
+FONT_SIZE = 8
+MARGIN = 0.6 * inch
+
+SALES_HEADER = ["Date", "Product Name", "Qty", "Unit Price", "Total"]
+SALES_COL_WIDTHS = [1.3 * inch, 3.0 * inch, 0.6 * inch, 1.1 * inch, 1.1 * inch]
+PRODUCT_HEADER = ["Product Name", "SKU", "Qty", "Revenue"]
+PRODUCT_COL_WIDTHS = [3.2 * inch, 1.8 * inch, 0.9 * inch, 1.2 * inch]
+
+
+def _fit(text, width):
+    """Truncates text with an ellipsis so it fits in a cell of the given width."""
+    text = str(text)
+    available = width - 6
+    if stringWidth(text, FONT_NAME, FONT_SIZE) <= available:
+        return text
+    while text and stringWidth(text + "...", FONT_NAME, FONT_SIZE) > available:
+        text = text[:-1]
+    return text + "..."
+
+
+def _table_style(row_count, has_total_row, numeric_columns):
+    first_total_row = row_count - 2 if has_total_row else row_count - 1
+    return TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
+        ('FONTSIZE', (0, 0), (-1, -1), FONT_SIZE),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('ALIGN', (-numeric_columns, 1), (-1, -1), 'RIGHT'),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        # Page subtotal, and the report total on the last page
+        ('FONTNAME', (0, first_total_row), (-1, -1), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, first_total_row), (-1, -1), colors.lightgrey),
+    ])
+
+
+class PdfReportWriter:
+    """
+    Writes a paginated report to file_path. Call write_sales() and/or
+    write_product_summary(), then save().
+    """
+
+    def __init__(self, file_path, title="Product and Sales Report", rows_per_page=ROWS_PER_PAGE):
+        self.file_path = file_path
+        self.title = title
+        self.rows_per_page = rows_per_page
+        self.canvas = canvas.Canvas(file_path, pagesize=letter)
+        self.canvas.setTitle(title)
+        self.page_width, self.page_height = letter
+        self.page_number = 0
+        self.generated_at = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+    def _start_page(self, subtitle):
+        """Draws the page heading and returns the y coordinate content can start from."""
+        self.page_number += 1
+        c = self.canvas
+        top = self.page_height - MARGIN
+        c.setFont("Helvetica-Bold", 14 if self.page_number == 1 else 10)
+        c.drawString(MARGIN, top - 12, self.title)
+        c.setFont(FONT_NAME, FONT_SIZE)
+        c.drawRightString(self.page_width - MARGIN, top - 12, f"Generated {self.generated_at}")
+        c.drawString(MARGIN, top - 26, subtitle)
+        c.drawRightString(self.page_width - MARGIN, MARGIN / 2, f"Page {self.page_number}")
+        return top - 36
+
+    def write_message(self, subtitle, message):
+        top = self._start_page(subtitle)
+        self.canvas.setFont(FONT_NAME, 10)
+        self.canvas.drawString(MARGIN, top - 14, message)
+        self.canvas.showPage()
+
+    def _write_chunks(self, subtitle, header, col_widths, numeric_columns, rows, totals_row, progress_callback=None, should_cancel=None):
+        """
+        Draws rows (an iterator of (cells, quantity, revenue)) rows_per_page at a
+        time; the last numeric_columns columns are right-aligned.
+        totals_row(quantity, revenue, label) builds the subtotal/total cells.
+        Returns the number of rows written, or None if should_cancel() asked to stop.
+        """
+        rows_written, grand_quantity, grand_revenue = 0, 0, 0.0
+        rows = iter(rows)
+        pending = next(rows, None)
+        while True:
+            chunk, page_quantity, page_revenue = [], 0, 0.0
+            while pending is not None and len(chunk) < self.rows_per_page:
+                cells, quantity, revenue = pending
+                chunk.append([_fit(value, width) for value, width in zip(cells, col_widths)])
+                page_quantity += quantity
+                page_revenue += revenue
+                pending = next(rows, None)
+            is_last_page = pending is None
+
+            rows_written += len(chunk)
+            grand_quantity += page_quantity
+            grand_revenue += page_revenue
+            data = [header] + chunk + [totals_row(page_quantity, page_revenue, "Page subtotal")]
+            if is_last_page:
+                data.append(totals_row(grand_quantity, grand_revenue, "Total"))
+
+            top = self._start_page(subtitle)
+            table = Table(data, colWidths=col_widths, rowHeights=ROW_HEIGHT)
+            table.setStyle(_table_style(len(data), has_total_row=is_last_page, numeric_columns=numeric_columns))
+            _, height = table.wrapOn(self.canvas, self.page_width - 2 * MARGIN, top - MARGIN)
+            table.drawOn(self.canvas, MARGIN, top - height)
+            self.canvas.showPage()
+
+            if should_cancel and should_cancel():
+                return None
+            if progress_callback:
+                progress_callback(rows_written)
+            if is_last_page:
+                return rows_written
+
+    def write_sales(self, records, progress_callback=None, should_cancel=None):
+        """Detailed section: one line per sale item, from an iterator of sales record dicts."""
+        def rows():
+            for record in records:
+                yield ([str(record['sale_date']).split(" ")[0], record['product_name'], record['quantity_sold'],
+                        f"${record['price_at_sale']:.2f}", f"${record['total_revenue']:.2f}"],
+                       record['quantity_sold'], record['total_revenue'])
+
+        def totals_row(quantity, revenue, label):
+            return [label, "", quantity, "", f"${revenue:.2f}"]
+
+        return self._write_chunks("Sales detail", SALES_HEADER, SALES_COL_WIDTHS, 3, rows(), totals_row,
+                                  progress_callback, should_cancel)
+
+    def write_product_summary(self, product_rows):
+        """Summary section: one line per product from pre-aggregated totals."""
+        def rows():
+            for row in product_rows:
+                yield ([row['product_name'], row.get('sku') or 'N/A', row['total_quantity'], f"${row['total_revenue']:.2f}"],
+                       row['total_quantity'], row['total_revenue'])
+
+        def totals_row(quantity, revenue, label):
+            return [label, "", quantity, f"${revenue:.2f}"]
+
+        return self._write_chunks("Sales by product", PRODUCT_HEADER, PRODUCT_COL_WIDTHS, 2, rows(), totals_row)
+
+    def save(self):
+        self.canvas.save()
@@ -1,13 +1,23 @@
 import csv
+import gzip
+import itertools
 import os
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.lib.units import inch
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill
-from openpyxl.utils import get_column_letter
+from model.database_manager import PRODUCT_IMPORT_COLUMNS
+# openpyxl and reportlab (through catalogue_import and pdf_report) take a few hundred ms
+# to import and are only needed for exports, so they are imported on first use below
+
+EXPORT_BATCH_SIZE = 1000
+EXCEL_MAX_ROWS = 1048576
+EXCEL_WIDTH_SAMPLE_ROWS = 500
+
+
+def _remove_partial_file(file_path):
+    """Deletes an export that failed part-way, so it can't be mistaken for a complete one."""
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
 
 
 class ProductProcessor:
@@ -80,125 +90,214 @@ class ProductProcessor:
         update_data = {'stock_quantity': new_stock}
         return self.db_manager.update_product(product_id, user_id, update_data)
     
-    def export_products_and_sales_to_csv(self, user_id, file_path):
-        """Exports all of a user's products and their associated sales to a CSV file."""
+    def export_products_and_sales_to_csv(self, user_id, file_path, progress_callback=None, should_cancel=None, compress=None):
+        """
+        Streams all of a user's sales to a CSV file, writing rows as they are read.
+        progress_callback(rows_written, total_rows) is called after every batch and
+        should_cancel() is polled at the same points; a cancelled or failed export
+        removes the partial file. Output is gzip-compressed when compress is True, or when it is
+        None and the file name ends with '.gz'.
+        """
+        if compress is None:
+            compress = file_path.lower().endswith('.gz')
+        total_rows = self.db_manager.get_sales_totals(user_id)['line_count'] if progress_callback else 0
+        rows_written, cancelled, created = 0, False, False
         try:
-            sales_records = self.db_manager.get_sales_records(user_id=user_id)
-            
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                if not sales_records:
+            opener = gzip.open if compress else open
+            with opener(file_path, 'wt', newline='', encoding='utf-8') as csvfile:
+                created = True
+                records = self.db_manager.iter_sales_records(user_id=user_id, batch_size=EXPORT_BATCH_SIZE)
+                first_record = next(records, None)
+                if first_record is None:
                     csvfile.write("No sales data to export.")
                     return True, "Export complete. No sales data found."
-                
-                header = sales_records[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=header)
-                
-                writer.writeheader()
-                writer.writerows(sales_records)
-                
-            return True, f"Data successfully exported to {os.path.basename(file_path)}"
+
+                writer = csv.writer(csvfile)
+                writer.writerow(first_record.keys())
+                writer.writerow(first_record.values())
+                rows_written = 1
+                for record in records:
+                    writer.writerow(record.values())
+                    rows_written += 1
+                    if rows_written % EXPORT_BATCH_SIZE == 0:
+                        if should_cancel and should_cancel():
+                            cancelled = True
+                            records.close()
+                            break
+                        if progress_callback:
+                            progress_callback(rows_written, total_rows)
+
+            if cancelled:
+                os.remove(file_path)
+                return False, "Export cancelled."
+            if progress_callback:
+                progress_callback(rows_written, total_rows)
+            return True, f"Data successfully exported to {os.path.basename(file_path)} ({rows_written:,} rows)"
         except Exception as e:
+            if created:
+                _remove_partial_file(file_path)
             return False, f"An error occurred during export: {e}"
         
 
-    def export_products_and_sales_to_pdf(self, user_id, file_path):
-        """Exports all of a user's products and their sales to a PDF file."""
+    def import_catalogue(self, user_id, file_path, progress_callback=None, should_cancel=None):
+        """
+        Adds or updates products in bulk from a CSV/XLSX catalogue, matching on SKU.
+        Returns (success, message); the message carries the inserted/updated/rejected counts.
+        """
+        from processing.catalogue_import import CatalogueImporter
+        report = CatalogueImporter(self.db_manager).import_file(user_id, file_path, progress_callback, should_cancel)
+        return report['success'], report['message']
+
+    def export_catalogue_to_csv(self, user_id, file_path, progress_callback=None, should_cancel=None):
+        """
+        Streams the user's products to a CSV file in the format import_catalogue reads.
+        A cancelled or failed export removes the partial file.
+        """
+        products_written = 0
+        cancelled, created = False, False
         try:
-            doc = SimpleDocTemplate(file_path)
-            story = []
-            styles = getSampleStyleSheet()
-
-            title = Paragraph("Product and Sales Report", styles['h1'])
-            story.append(title)
-            story.append(Spacer(1, 0.2*inch))
-
-            sales_records = self.db_manager.get_sales_records(user_id=user_id)
-            if not sales_records:
-                story.append(Paragraph("No sales data to export.", styles['Normal']))
-                doc.build(story)
+            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
+                created = True
+                writer = csv.writer(csvfile)
+                writer.writerow(PRODUCT_IMPORT_COLUMNS)
+                products = self.db_manager.iter_products(user_id, batch_size=EXPORT_BATCH_SIZE)
+                for product in products:
+                    writer.writerow([product[column] for column in PRODUCT_IMPORT_COLUMNS])
+                    products_written += 1
+                    if products_written % EXPORT_BATCH_SIZE == 0:
+                        if should_cancel and should_cancel():
+                            cancelled = True
+                            products.close()
+                            break
+                        if progress_callback:
+                            progress_callback(products_written, 0)
+            if cancelled:
+                os.remove(file_path)
+                return False, "Export cancelled."
+            return True, f"{products_written} products exported to {os.path.basename(file_path)}"
+        except Exception as e:
+            if created:
+                _remove_partial_file(file_path)
+            return False, f"An error occurred during catalogue export: {e}"
+
+    def export_products_and_sales_to_pdf(self, user_id, file_path, progress_callback=None, should_cancel=None, summary_only=False):
+        """
+        Exports a user's sales to a paginated PDF report. The detailed report streams
+        every sale line, a fixed number of rows per page with page subtotals; with
+        summary_only=True the report lists per-product totals from the daily rollup.
+        progress_callback and should_cancel work as for the CSV export.
+        """
+        try:
+            from processing.pdf_report import PdfReportWriter
+            report = PdfReportWriter(file_path)
+            if summary_only:
+                product_rows = self.db_manager.get_product_sales_summary(user_id)
+                if not product_rows:
+                    report.write_message("Sales by product", "No sales data to export.")
+                    report.save()
+                    return True, "Export complete. No sales data found."
+                report.write_product_summary(product_rows)
+                report.save()
+                return True, f"Summary report exported to {os.path.basename(file_path)}"
+
+            totals = self.db_manager.get_sales_totals(user_id)
+            if not totals['line_count']:
+                report.write_message("Sales detail", "No sales data to export.")
+                report.save()
                 return True, "Export complete. No sales data found."
-            
-            header = ["Date", "Product Name", "Qty", "Unit Price", "Total"]
-            data = [header]
-            for record in sales_records:
-                data.append([
-                    record['sale_date'].split(" ")[0],
-                    record['product_name'],
-                    record['quantity_sold'],
-                    f"${record['price_at_sale']:.2f}",
-                    f"${record['total_revenue']:.2f}"
-                ])
-
-            table = Table(data, colWidths=[1.5*inch, 2.5*inch, 0.5*inch, 1*inch, 1*inch])
-            style = TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.grey),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0,0), (-1,0), 12),
-                ('BACKGROUND', (0,1), (-1,-1), colors.beige),
-                ('GRID', (0,0), (-1,-1), 1, colors.black)
-            ])
-            table.setStyle(style)
-            
-            story.append(table)
-            doc.build(story)
-            
-            return True, f"Data successfully exported to {os.path.basename(file_path)}"
+
+            records = self.db_manager.iter_sales_records(user_id=user_id, batch_size=EXPORT_BATCH_SIZE)
+            on_page = (lambda rows_written: progress_callback(rows_written, totals['line_count'])) if progress_callback else None
+            rows_written = report.write_sales(records, progress_callback=on_page, should_cancel=should_cancel)
+            if rows_written is None:
+                records.close()
+                return False, "Export cancelled."
+            report.save()
+            return True, f"Data successfully exported to {os.path.basename(file_path)} ({rows_written} rows, {report.page_number} pages)."
         except Exception as e:
             return False, f"An error occurred during PDF export: {e}"
-        
-    
-    def export_data_to_excel(self, user_id, file_path):
-        """Exporte les produits et leurs ventes dans un fichier Excel (.xlsx) bien formaté."""
+
+    def export_data_to_excel(self, user_id, file_path, progress_callback=None, should_cancel=None, max_rows_per_sheet=EXCEL_MAX_ROWS):
+        """
+        Exporte les ventes dans un fichier Excel (.xlsx) en mode écriture seule (write-only).
+        Les lignes sont écrites au fil de la lecture, la largeur des colonnes est calculée
+        sur un échantillon, et une nouvelle feuille est ouverte à la limite de lignes d'Excel.
+        progress_callback et should_cancel fonctionnent comme pour l'export CSV.
+        """
         try:
-            sales_records = self.db_manager.get_sales_records(user_id=user_id)
-            
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Sales Report"
+            from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font, PatternFill
+            from openpyxl.utils import get_column_letter
+
+            wb = Workbook(write_only=True)
+            total_rows = self.db_manager.get_sales_totals(user_id)['line_count'] if progress_callback else 0
+            records = self.db_manager.iter_sales_records(user_id=user_id, batch_size=EXPORT_BATCH_SIZE)
 
-            if not sales_records:
-                ws['A1'] = "Aucune donnée de vente à exporter."
+            sample = list(itertools.islice(records, EXCEL_WIDTH_SAMPLE_ROWS))
+            if not sample:
+                ws = wb.create_sheet("Sales Report")
+                ws.append(["Aucune donnée de vente à exporter."])
                 wb.save(file_path)
                 return True, "Export terminé. Aucune donnée de vente trouvée."
 
             headers = ["Date", "Product Name", "SKU", "Category", "Quantity Sold", "Price at Sale", "Total Revenue"]
-            ws.append(headers)
+            column_widths = [len(header) for header in headers]
+            for record in sample:
+                for col_idx, value in enumerate(self._excel_row(record)):
+                    column_widths[col_idx] = max(column_widths[col_idx], len(str(value)))
 
             header_font = Font(bold=True, color="FFFFFF")
             header_fill = PatternFill(start_color="4F4F4F", end_color="4F4F4F", fill_type="solid")
 
-            for cell in ws[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-
-            for record in sales_records:
-                row_data = [
-                    record['sale_date'],
-                    record['product_name'],
-                    record.get('sku', 'N/A'),
-                    record.get('category', 'N/A'),
-                    record['quantity_sold'],
-                    record['price_at_sale'],
-                    record['total_revenue']
-                ]
-                ws.append(row_data)
-
-            for col_idx, column_cells in enumerate(ws.columns):
-                max_length = 0
-                column_letter = get_column_letter(col_idx + 1)
-                for cell in column_cells:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = (max_length + 2)
-                ws.column_dimensions[column_letter].width = adjusted_width
+            def new_sheet(sheet_number):
+                ws = wb.create_sheet("Sales Report" if sheet_number == 1 else f"Sales Report ({sheet_number})")
+                for col_idx, width in enumerate(column_widths):
+                    ws.column_dimensions[get_column_letter(col_idx + 1)].width = width + 2
+                header_cells = []
+                for header in headers:
+                    cell = WriteOnlyCell(ws, value=header)
+                    cell.font = header_font
+                    cell.fill = header_fill
+                    header_cells.append(cell)
+                ws.append(header_cells)
+                return ws
+
+            sheet_number, rows_in_sheet, rows_written = 1, 0, 0
+            ws = new_sheet(sheet_number)
+            for record in itertools.chain(sample, records):
+                if rows_in_sheet >= max_rows_per_sheet - 1:
+                    sheet_number += 1
+                    ws = new_sheet(sheet_number)
+                    rows_in_sheet = 0
+                ws.append(self._excel_row(record))
+                rows_in_sheet += 1
+                rows_written += 1
+                if rows_written % EXPORT_BATCH_SIZE == 0:
+                    if should_cancel and should_cancel():
+                        records.close()
+                        for sheet in wb.worksheets:
+                            sheet.close()
+                        return False, "Export annulé."
+                    if progress_callback:
+                        progress_callback(rows_written, total_rows)
 
             wb.save(file_path)
+            if progress_callback:
+                progress_callback(rows_written, total_rows)
             return True, f"Données exportées avec succès vers {os.path.basename(file_path)}"
 
         except Exception as e:
-            return False, f"Une erreur est survenue lors de l'export Excel : {e}"
\ No newline at end of file
+            return False, f"Une erreur est survenue lors de l'export Excel : {e}"
+
+    @staticmethod
+    def _excel_row(record):
+        return [
+            record['sale_date'],
+            record['product_name'],
+            record.get('sku') or 'N/A',
+            record.get('category') or 'N/A',
+            record['quantity_sold'],
+            record['price_at_sale'],
+            record['total_revenue']
+        ]
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+Bulk import of sale lines from CSV or JSONL files (POS exports, legacy history).
+
+Each input row is one sale line with the fields:
+    sale_ref   optional receipt/transaction id; consecutive rows sharing it form one sale
+    sale_date  'YYYY-MM-DD[ HH:MM[:SS]]' (or 'DD/MM/YYYY[ HH:MM]'); ISO dates with a UTC
+               offset are converted to local time, like every other stored date
+    sku        must match one of the user's products
+    quantity   positive integer
+    price      optional unit price; defaults to the product's selling price
+    notes      optional
+
+JSONL files (.jsonl/.ndjson) hold one JSON object per line; a plain .json
+array is refused rather than read line by line.
+
+Rows are parsed and validated in a process pool against a SKU map built once up
+front; valid lines are grouped into sales and handed to
+DatabaseManager.record_sales_bulk in large batches, all inside one
+write_transaction, so a file is imported completely or not at all and a failed
+import can simply be run again. Invalid rows are skipped and reported with
+their line number.
+"""
+import csv
+import json
+import os
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from datetime import datetime
+
+PARSE_CHUNK_ROWS = 5000
+WRITE_BATCH_SALES = 10000
+
+REQUIRED_FIELDS = ("sale_date", "sku", "quantity")
+FIELD_ALIASES = {
+    "receipt": "sale_ref", "receipt_id": "sale_ref", "transaction_id": "sale_ref",
+    "date": "sale_date", "datetime": "sale_date",
+    "qty": "quantity", "quantity_sold": "quantity",
+    "unit_price": "price", "price_at_sale": "price",
+}
+DATE_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+
+# Set in each worker process by _init_worker
+_sku_map = {}
+
+
+def _init_worker(sku_map):
+    global _sku_map
+    _sku_map = sku_map
+
+
+def _normalise_field(name):
+    name = (name or "").strip().lower().replace(" ", "_")
+    return FIELD_ALIASES.get(name, name)
+
+
+def _parse_date(value):
+    value = (value or "").strip()
+    if not value:
+        raise ValueError("missing sale_date")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        for date_format in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"unrecognised sale_date '{value}'")
+    if parsed.tzinfo is not None:
+        # Stored dates are naive local time; keep the instant, not the wall-clock digits
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _validate_record(record):
+    """Turns one raw record into (sale_ref, sale_date, product_id, quantity, price, notes) or raises ValueError."""
+    sale_date = _parse_date(str(record.get("sale_date") or ""))
+
+    sku = str(record.get("sku") or "").strip()
+    if not sku:
+        raise ValueError("missing sku")
+    if sku not in _sku_map:
+        raise ValueError(f"unknown sku '{sku}'")
+    product_id, selling_price = _sku_map[sku]
+
+    try:
+        quantity = int(str(record.get("quantity")).strip())
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid quantity '{record.get('quantity')}'")
+    if quantity <= 0:
+        raise ValueError(f"quantity must be positive, got {quantity}")
+
+    raw_price = record.get("price")
+    if raw_price is None or str(raw_price).strip() == "":
+        price = selling_price
+    else:
+        try:
+            price = float(str(raw_price).strip().lstrip("$"))
+        except ValueError:
+            raise ValueError(f"invalid price '{raw_price}'")
+        if price < 0:
+            raise ValueError(f"price cannot be negative, got {price}")
+
+    sale_ref = str(record.get("sale_ref") or "").strip()
+    notes = str(record.get("notes") or "").strip()
+    return sale_ref, sale_date, product_id, quantity, price, notes
+
+
+def _validate_chunk(file_format, columns, chunk):
+    """
+    Worker entry point. chunk is a list of (line_number, raw_text), one CSV record
+    or JSONL line each. Returns (valid_lines, errors) in input order.
+    """
+    valid, errors = [], []
+    for line_number, raw in chunk:
+        try:
+            if file_format == "jsonl":
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    raise ValueError("expected a JSON object")
+                record = {_normalise_field(key): value for key, value in record.items()}
+            else:
+                try:
+                    fields = next(csv.reader([raw]))
+                except csv.Error as e:
+                    raise ValueError(f"malformed CSV row: {e}")
+                if len(fields) != len(columns):
+                    raise ValueError(f"expected {len(columns)} fields, got {len(fields)}")
+                record = dict(zip(columns, fields))
+            valid.append((line_number,) + _validate_record(record))
+        except ValueError as e:
+            errors.append((line_number, str(e), raw.rstrip("\r\n")))
+    return valid, errors
+
+
+def _file_format(file_path):
+    return "jsonl" if file_path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+class SalesImporter:
+    def __init__(self, db_manager, workers=None):
+        self.db_manager = db_manager
+        self.workers = workers if workers is not None else max(1, (os.cpu_count() or 2) - 1)
+
+    def _read_chunks(self, file_path, file_format):
+        """
+        Yields (columns, chunk) with chunk a list of (line_number, raw_text) of up to
+        PARSE_CHUNK_ROWS records; the text is only split into fields by the workers.
+        Raises ValueError if a CSV header lacks a required column.
+        """
+        with open(file_path, "r", newline="", encoding="utf-8-sig") as handle:
+            columns = None
+            if file_format == "csv":
+                header = next(csv.reader(handle), None)
+                if header is None:
+                    return
+                columns = [_normalise_field(name) for name in header]
+                missing = [field for field in REQUIRED_FIELDS if field not in columns]
+                if missing:
+                    raise ValueError(f"missing required column(s): {', '.join(missing)}")
+
+            chunk, record, record_line = [], "", None
+            for line_number, line in enumerate(handle, start=2 if columns else 1):
+                if record_line is None:
+                    record_line = line_number
+                record += line
+                # A CSV record continues onto the next line while a quoted field is open
+                if columns and record.count('"') % 2:
+                    continue
+                if record.strip():
+                    chunk.append((record_line, record))
+                record, record_line = "", None
+                if len(chunk) == PARSE_CHUNK_ROWS:
+                    yield columns, chunk
+                    chunk = []
+            if record.strip():
+                chunk.append((record_line, record))
+            if chunk:
+                yield columns, chunk
+
+    def _validated_chunks(self, file_path, file_format, sku_map):
+        """Runs _validate_chunk over the file, in a process pool when workers > 1, keeping input order."""
+        chunks = self._read_chunks(file_path, file_format)
+        if self.workers <= 1:
+            _init_worker(sku_map)
+            for columns, chunk in chunks:
+                yield _validate_chunk(file_format, columns, chunk)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(sku_map,)) as pool:
+            in_flight = deque()
+            for columns, chunk in chunks:
+                in_flight.append(pool.submit(_validate_chunk, file_format, columns, chunk))
+                # Bound the number of parsed-but-unwritten chunks held in memory
+                if len(in_flight) >= self.workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def import_file(self, user_id, file_path, dry_run=False, update_stock=True, progress_callback=None):
+        """
+        Imports a CSV or JSONL file of sale lines for user_id, in a single
+        transaction: if anything fails, no sales from the file are kept.
+        With dry_run=True everything is parsed and validated but nothing is written.
+        progress_callback(rows_read) is called after each parsed chunk.
+        Returns a report dict: 'success', 'message', 'rows_read', 'rows_imported',
+        'rows_rejected', 'sales_imported', 'dry_run' and 'errors', a list of
+        (line_number, message, raw_row).
+        """
+        report = {'success': True, 'message': "", 'rows_read': 0, 'rows_imported': 0, 'rows_rejected': 0,
+                  'sales_imported': 0, 'dry_run': dry_run, 'errors': []}
+        if not os.path.exists(file_path):
+            report.update(success=False, message=f"File not found: {file_path}")
+            return report
+
+        if file_path.lower().endswith(".json"):
+            report.update(success=False, message=f"{os.path.basename(file_path)}: JSON files must be JSON Lines "
+                                                 "(one object per line, saved as .jsonl), not a single array.")
+            return report
+
+        sku_map = self.db_manager.get_product_sku_map(user_id)
+        file_format = _file_format(file_path)
+        pending_sales = []
+        current_ref = None
+
+        def flush():
+            if not pending_sales:
+                return True
+            lines = sum(len(sale['items']) for sale in pending_sales)
+            if not dry_run:
+                success, message = self.db_manager.record_sales_bulk(user_id, pending_sales, update_stock=update_stock,
+                                                                     log_activity=False, commit=False)
+                if not success:
+                    # record_sales_bulk has rolled back the whole import
+                    report.update(success=False, message=f"{message} No sales were imported.",
+                                  sales_imported=0, rows_imported=0)
+                    return False
+            report['sales_imported'] += len(pending_sales)
+            report['rows_imported'] += lines
+            pending_sales.clear()
+            return True
+
+        transaction = nullcontext() if dry_run else self.db_manager.write_transaction()
+        try:
+            with transaction:
+                for valid, errors in self._validated_chunks(file_path, file_format, sku_map):
+                    report['rows_read'] += len(valid) + len(errors)
+                    report['rows_rejected'] += len(errors)
+                    report['errors'].extend(errors)
+
+                    for _, sale_ref, sale_date, product_id, quantity, price, notes in valid:
+                        item = {'id': product_id, 'quantity': quantity, 'price': price}
+                        if sale_ref and sale_ref == current_ref:
+                            pending_sales[-1]['items'].append(item)
+                            continue
+                        # A new sale starts; everything before it is complete and can be written
+                        if len(pending_sales) >= WRITE_BATCH_SALES and not flush():
+                            return report
+                        pending_sales.append({'sale_date': sale_date, 'notes': notes, 'items': [item]})
+                        current_ref = sale_ref or None
+
+                    if progress_callback:
+                        progress_callback(report['rows_read'])
+
+                if not flush():
+                    return report
+                if not dry_run and report['sales_imported']:
+                    self.db_manager.add_activity_log(user_id, "SALE", f"Imported {report['sales_imported']} sales from {os.path.basename(file_path)}.",
+                                                     commit=False)
+        except (OSError, ValueError) as e:
+            report.update(success=False, sales_imported=0, rows_imported=0,
+                          message=f"Could not read {os.path.basename(file_path)}: {e}. No sales were imported.")
+            return report
+        except sqlite3.Error as e:
+            report.update(success=False, sales_imported=0, rows_imported=0,
+                          message=f"Database error during import: {e}. No sales were imported.")
+            return report
+        except BrokenProcessPool:
+            report.update(success=False, sales_imported=0, rows_imported=0,
+                          message="A validation worker process stopped unexpectedly. No sales were imported.")
+            return report
+
+        verb = "would be imported" if dry_run else "imported"
+        report['message'] = (f"{report['sales_imported']} sales ({report['rows_imported']} lines) {verb}; "
+                             f"{report['rows_rejected']} of {report['rows_read']} rows rejected.")
+        return report
+
+
+def write_error_report(errors, file_path):
+    """Writes the per-row errors of an import report to a CSV file."""
+    with open(file_path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["line", "error", "row"])
+        writer.writerows(errors)
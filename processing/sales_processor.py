@@ -6,4 +6,16 @@ class SalesProcessor:
         """
         Retrieves sales data for the sales page.
         """
-        return self.db_manager.get_sales_records(user_id, start_date, end_date, product_id)
\ No newline at end of file
+        return self.db_manager.get_sales_records(user_id, start_date, end_date, product_id)
+
+    def get_sales_page(self, user_id, start_date=None, end_date=None, product_id=None, after=None, page_size=500):
+        """
+        Retrieves one page of sales data; pass the returned cursor back as 'after'.
+        """
+        return self.db_manager.get_sales_records_page(user_id, start_date, end_date, product_id, after, page_size)
+
+    def get_sales_summary(self, user_id, start_date=None, end_date=None, product_id=None):
+        """
+        Line count, total revenue and units sold for the sales page filters.
+        """
+        return self.db_manager.get_sales_totals(user_id, start_date, end_date, product_id)
\ No newline at end of file
@@ -0,0 +1,23 @@
+import argparse
+import sys
+
+from model.database_manager import DatabaseManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the daily sales rollup from the raw sales tables.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows (default: all users).")
+    parser.add_argument("--db", default=None, help="Database file name relative to the project root.")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db) if args.db else DatabaseManager()
+    try:
+        success, message = db_manager.rebuild_sales_rollup(args.user_id)
+        print(message)
+        return 0 if success else 1
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
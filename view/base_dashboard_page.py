@@ -1,9 +1,16 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PySide6.QtCore import Qt
 
+from controller.tracing import span
+
 class BaseDashboardPage(QWidget):
+    # Entity types (see controller.change_events) whose changes this page displays
+    watched_entities = ()
+
     def __init__(self, title="Page Title", parent=None):
         super().__init__(parent)
+        # True until the page has loaded, and again whenever a change arrives while it is hidden
+        self.is_stale = True
         self.setObjectName(f"{title.replace(' ', '')}Page") 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20) 
@@ -40,4 +47,26 @@ class BaseDashboardPage(QWidget):
         Called when the page becomes inactive.
         """
         print(f"Unloading data for {self.title_label.text()}")
-        pass
\ No newline at end of file
+        pass
+
+    def handle_change_event(self, event):
+        """
+        Receives every ChangeEvent published on the bus. A page that is on screen
+        applies it right away; a hidden one is only marked stale and reloads the
+        next time load_page_data is called.
+        """
+        if event.entity not in self.watched_entities:
+            return
+        if self.isVisible() and not self.is_stale:
+            with span(f"{type(self).__name__}.apply_change_event", entity=event.entity, operation=event.operation):
+                self.apply_change_event(event)
+        else:
+            self.is_stale = True
+
+    def apply_change_event(self, event):
+        """
+        Updates the visible page for event. The default reloads everything;
+        subclasses override it to patch only the affected items.
+        """
+        self.is_stale = True
+        self.load_page_data()
@@ -7,6 +7,8 @@ import pyqtgraph as pg
 from datetime import datetime, timedelta
 
 from .base_dashboard_page import BaseDashboardPage
+from controller.data_loader import DataLoader
+from controller.change_events import PRODUCT, SALE, GOAL
 
 class ModernKpiCard(QFrame):
     def __init__(self, title, icon_path=None, accent_color="#6366f1", parent=None):
@@ -96,11 +98,16 @@ class ModernKpiCard(QFrame):
         return darker.name()
 
 class DashboardHomePage(BaseDashboardPage):
-    def __init__(self, user_id, product_processor, user_processor, data_changed_signal, parent=None):
+    # Goals only show up here through the recent activity panel
+    watched_entities = (PRODUCT, SALE, GOAL)
+
+    def __init__(self, user_id, product_processor, user_processor, change_bus, parent=None):
         super().__init__("Dashboard Overview", parent=parent)
         self.user_id = user_id
         self.db_manager = product_processor.db_manager
-        data_changed_signal.connect(self.load_page_data)
+        self.data_loader = DataLoader(self.db_manager.db_path, parent=self)
+        # Day the shown "last N days" window ends on; None until the first refresh
+        self.end_date = None
 
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -197,9 +204,19 @@ class DashboardHomePage(BaseDashboardPage):
 
     def load_page_data(self):
         super().load_page_data()
+        if not self.is_stale and self.end_date != datetime.now().date():
+            # The window counts back from today, so a page loaded yesterday is out of date
+            self.refresh_dashboard()
+        if not self.is_stale:
+            return
+        self.is_stale = False
         self.date_filter_combo.setCurrentIndex(1)
         self.refresh_dashboard()
 
+    def apply_change_event(self, event):
+        # One background snapshot query re-computes the KPIs and panels for the current date range
+        self.refresh_dashboard()
+
     def _create_modern_filter_bar(self):
         filter_layout = QHBoxLayout()
         filter_layout.setSpacing(20)
@@ -278,6 +295,7 @@ class DashboardHomePage(BaseDashboardPage):
 
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days-1)
+        self.end_date = end_date.date()
 
         start_str = start_date.strftime('%b %d, %Y')
         end_str = end_date.strftime('%b %d, %Y')
@@ -287,14 +305,21 @@ class DashboardHomePage(BaseDashboardPage):
         self.kpi_items_sold.subtitle_label.setText(f"Last {days} days")
         self.kpi_stock.subtitle_label.setText("Current inventory")
 
-        self._load_kpi_data(start_date, end_date)
-        self._load_chart_data(days)
-        self._load_top_products(start_date, end_date)
-        self._load_attention_items()
-        self._load_recent_activity()
+        user_id = self.user_id
+        self.data_loader.submit(
+            "dashboard",
+            lambda db: db.get_dashboard_snapshot(user_id, start_date, end_date, days),
+            lambda snapshot: self._apply_snapshot(snapshot, days)
+        )
+
+    def _apply_snapshot(self, snapshot, days):
+        self._load_kpi_data(snapshot['kpi'])
+        self._load_chart_data(snapshot['chart'])
+        self._load_top_products(snapshot['top_products'], days)
+        self._load_attention_items(snapshot['attention'])
+        self._load_recent_activity(snapshot['recent_activity'])
 
-    def _load_kpi_data(self, start_date, end_date):
-        kpi_data = self.db_manager.get_kpi_data(self.user_id, start_date, end_date)
+    def _load_kpi_data(self, kpi_data):
         self.kpi_revenue.set_value(f"${kpi_data.get('revenue', 0):,.2f}")
         self.kpi_items_sold.set_value(f"{kpi_data.get('items_sold', 0):,}")
         self.kpi_stock.set_value(f"{kpi_data.get('total_stock', 0):,}")
@@ -354,8 +379,7 @@ class DashboardHomePage(BaseDashboardPage):
         layout.addWidget(self.chart_widget)
         return panel
 
-    def _load_chart_data(self, days):
-        chart_data = self.db_manager.get_daily_sales_for_chart(self.user_id, days)
+    def _load_chart_data(self, chart_data):
         dates = list(chart_data.keys())
         revenues = list(chart_data.values())
         x_ticks = [datetime.combine(d, datetime.min.time()).timestamp() for d in dates]
@@ -433,13 +457,12 @@ class DashboardHomePage(BaseDashboardPage):
         
         return panel
 
-    def _load_attention_items(self):
+    def _load_attention_items(self, attention_data):
         while self.attention_layout.count():
             child = self.attention_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
         
-        attention_data = self.db_manager.get_attention_items(self.user_id)
         if not attention_data['low_stock']:
             success_label = QLabel("All items are well stocked!")
             success_label.setStyleSheet("""
@@ -527,8 +550,7 @@ class DashboardHomePage(BaseDashboardPage):
         
         return panel
 
-    def _load_top_products(self, start_date, end_date):
-        days = (end_date - start_date).days + 1
+    def _load_top_products(self, top_products, days):
         self.top_products_title.setText(f"Top Performers ({days} days)")
         
         while self.top_products_layout.count():
@@ -536,7 +558,6 @@ class DashboardHomePage(BaseDashboardPage):
             if child.widget():
                 child.widget().deleteLater()
         
-        top_products = self.db_manager.get_top_products(self.user_id, start_date, end_date)
         if not top_products:
             no_data_label = QLabel(f"No sales data available for the last {days} days")
             no_data_label.setStyleSheet("""
@@ -629,13 +650,12 @@ class DashboardHomePage(BaseDashboardPage):
         
         return panel
 
-    def _load_recent_activity(self):
+    def _load_recent_activity(self, recent_activity):
         while self.recent_activity_layout.count():
             child = self.recent_activity_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
         
-        recent_activity = self.db_manager.get_recent_activity(self.user_id)
         if not recent_activity:
             no_activity_label = QLabel("No recent activity to display")
             no_activity_label.setStyleSheet("""
@@ -8,6 +8,8 @@ import os
 
 from processing.product_processing import ProductProcessor
 from processing.user_processing import UserProcessor
+from controller.change_events import ChangeBus, USER
+from controller.tracing import span
 
 from .shared_ui import ModernGradientWidget, LogoWidget
 from .base_dashboard_page import BaseDashboardPage
@@ -20,7 +22,6 @@ from .settings_page import SettingsPage
 
 class DashboardLayoutWidget(QWidget):
     logout_requested = Signal()
-    data_changed = Signal(str)
 
     def __init__(self, user_id, product_processor_instance, user_processor_instance, parent=None):
         super().__init__(parent)
@@ -28,7 +29,8 @@ class DashboardLayoutWidget(QWidget):
         self.product_processor = product_processor_instance
         self.user_processor = user_processor_instance
 
-        self.data_changed.connect(self.handle_data_change)
+        self.change_bus = ChangeBus(self)
+        self.change_bus.changed.connect(self.handle_change_event)
 
         self.main_layout = QHBoxLayout(self)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
@@ -52,21 +54,17 @@ class DashboardLayoutWidget(QWidget):
         self.page_stack = QStackedWidget()
         self.content_layout.addWidget(self.page_stack)
 
+        # Pages are built the first time they are shown (see page())
         self.pages = {}
         self.sidebar_buttons = {}
 
-        page_definitions = [
-            ("Dashboard", DashboardHomePage, [self.user_id, self.product_processor, self.user_processor, self.data_changed]),
-            ("Product", ProductPage, [self.user_id, self.product_processor, self.data_changed]),
-            ("Sales", SalesPage, [self.user_id, self.product_processor, self.data_changed]),
-            ("Goals", GoalsPage, [self.user_id, self.product_processor, self.data_changed]),
-            ("Profile", ProfilePage, [self.user_id, self.user_processor, self.data_changed]),
-            ("Settings", SettingsPage, [self.user_id, self.product_processor, self.user_processor, self.data_changed]),        ]
-
-        for key, PageClass, args in page_definitions:
-            page_instance = PageClass(*args)
-            self.page_stack.addWidget(page_instance)
-            self.pages[key] = page_instance
+        self.page_definitions = {key: (PageClass, args) for key, PageClass, args in [
+            ("Dashboard", DashboardHomePage, [self.user_id, self.product_processor, self.user_processor, self.change_bus]),
+            ("Product", ProductPage, [self.user_id, self.product_processor, self.change_bus]),
+            ("Sales", SalesPage, [self.user_id, self.product_processor, self.change_bus]),
+            ("Goals", GoalsPage, [self.user_id, self.product_processor, self.change_bus]),
+            ("Profile", ProfilePage, [self.user_id, self.user_processor, self.change_bus]),
+            ("Settings", SettingsPage, [self.user_id, self.product_processor, self.user_processor, self.change_bus]),        ]}
 
         sidebar_buttons_data = [
             ("Dashbord", "Dashboard"), ("Product", "Product"), ("Sales", "Sales"),
@@ -99,7 +97,7 @@ class DashboardLayoutWidget(QWidget):
             self.sidebar_layout.addWidget(button)
             self.sidebar_buttons[page_key_or_action] = button
 
-            if page_key_or_action in self.pages:
+            if page_key_or_action in self.page_definitions:
                 button.clicked.connect(lambda checked=False, p=page_key_or_action: self.switch_page(p))
             elif page_key_or_action == "Log Out":
                 button.clicked.connect(self.logout_requested.emit)
@@ -109,26 +107,45 @@ class DashboardLayoutWidget(QWidget):
         self.main_layout.addWidget(self.content_area, 1)
         self.switch_page("Dashboard")
 
+    def page(self, page_key):
+        """The page for page_key, built on first use. A new page starts stale, so it loads when shown."""
+        page_instance = self.pages.get(page_key)
+        if page_instance is None:
+            PageClass, args = self.page_definitions[page_key]
+            with span(f"{PageClass.__name__}.__init__", category="construct"):
+                page_instance = PageClass(*args)
+            self.change_bus.changed.connect(page_instance.handle_change_event)
+            self.page_stack.addWidget(page_instance)
+            self.pages[page_key] = page_instance
+        return page_instance
+
     def switch_page(self, page_key):
-        if page_key in self.pages:
-            target_page = self.pages[page_key]
+        with span("switch_page", page=page_key):
+            self._switch_page(page_key)
+
+    def _switch_page(self, page_key):
+        if page_key in self.page_definitions:
+            target_page = self.page(page_key)
             if self.page_stack.currentWidget() != target_page:
-                if isinstance(self.page_stack.currentWidget(), BaseDashboardPage):
-                    self.page_stack.currentWidget().unload_page_data()
+                current_page = self.page_stack.currentWidget()
+                if isinstance(current_page, BaseDashboardPage):
+                    with span(f"{type(current_page).__name__}.unload_page_data"):
+                        current_page.unload_page_data()
                 
                 self.page_stack.setCurrentWidget(target_page)
                 
                 if isinstance(target_page, BaseDashboardPage):
-                    target_page.load_page_data()
+                    with span(f"{type(target_page).__name__}.load_page_data"):
+                        target_page.load_page_data()
 
             for key, btn in self.sidebar_buttons.items():
                 btn.setProperty("active", key == page_key)
                 btn.style().unpolish(btn)
                 btn.style().polish(btn)
     
-    def handle_data_change(self, data_type):
+    def handle_change_event(self, event):
         """Refreshes the main window title if the user's name changed."""
-        if data_type == "user_info":
+        if event.entity == USER:
             print("Dashboard detected user info change, updating window title...")
             main_window = self.window()
             if main_window and hasattr(main_window, 'set_user_info'):
@@ -8,10 +8,14 @@ from .base_dashboard_page import BaseDashboardPage
 from processing.goals_processor import GoalsProcessor
 from .goal_form_dialog import GoalFormDialog
 from .shared_ui import StyledAlertDialog
+from controller.data_loader import DataLoader
+from controller.change_events import GOAL, SALE, INSERT, DELETE
+from controller.tracing import traced
 
 class GoalCardWidget(QFrame):
     delete_requested = Signal(int, str)
 
+    @traced(category="construct")
     def __init__(self, goal_data, parent=None):
         super().__init__(parent)
         self.goal_id = goal_data['id']
@@ -157,14 +161,17 @@ class GoalCardWidget(QFrame):
         return hex_color
 
 class GoalsPage(BaseDashboardPage):
-    def __init__(self, user_id, product_processor, data_changed_signal, parent=None):
+    # Sales move goal progress
+    watched_entities = (GOAL, SALE)
+
+    def __init__(self, user_id, product_processor, change_bus, parent=None):
         super().__init__("Sales Targets & Goals", parent=parent)
         self.user_id = user_id
         self.product_processor = product_processor
         self.goals_processor = GoalsProcessor(product_processor.db_manager)
+        self.data_loader = DataLoader(product_processor.db_manager.db_path, parent=self)
 
-        self.data_changed_signal = data_changed_signal
-        self.data_changed_signal.connect(self.handle_global_data_change)
+        self.change_bus = change_bus
 
         self.setStyleSheet("""
             QWidget {
@@ -257,20 +264,38 @@ class GoalsPage(BaseDashboardPage):
 
     def load_page_data(self):
         super().load_page_data()
+        if not self.is_stale:
+            return
+        self.is_stale = False
         self.refresh_goals_list()
 
-    def handle_global_data_change(self, data_type):
-        """Refreshes the goals list if relevant data changed."""
-        if data_type in ["goals", "reset"]:
+    def apply_change_event(self, event):
+        """Deleting goals just removes their cards; anything else reloads the list."""
+        if event.entity != GOAL or event.operation != DELETE or event.is_bulk:
+            self.refresh_goals_list()
+            return
+        for index in reversed(range(self.goals_layout.count())):
+            card = self.goals_layout.itemAt(index).widget()
+            if isinstance(card, GoalCardWidget) and card.goal_id in event.ids:
+                self.goals_layout.takeAt(index)
+                card.deleteLater()
+        if not self.goals_layout.count():
+            # Show the empty state
             self.refresh_goals_list()
 
     def refresh_goals_list(self):
+        user_id = self.user_id
+        self.data_loader.submit(
+            "goals",
+            lambda db: GoalsProcessor(db).get_all_goals_with_progress(user_id),
+            self._populate_goals_list
+        )
+
+    def _populate_goals_list(self, goals):
         while self.goals_layout.count():
             child = self.goals_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
-                
-        goals = self.goals_processor.get_all_goals_with_progress(self.user_id)
         
         if not goals:
             empty_state = QFrame()
@@ -318,8 +343,8 @@ class GoalsPage(BaseDashboardPage):
                 if success:
                     log_desc = f"Created new goal: '{goal_data.get('goal_name')}'"
                     self.goals_processor.db_manager.add_activity_log(self.user_id, "Goal", log_desc)
-                    self.data_changed_signal.emit("goals")
-                    
+                    self.change_bus.publish(GOAL, operation=INSERT)
+
     def handle_delete_goal(self, goal_id, goal_name):
         reply = QMessageBox.question(self, "Confirm Delete", 
                                      f"Are you sure you want to delete the goal:\n'{goal_name}'?",
@@ -330,4 +355,4 @@ class GoalsPage(BaseDashboardPage):
             if success:
                 log_desc = f"Deleted goal: '{goal_name}'"
                 self.goals_processor.db_manager.add_activity_log(self.user_id, "Goal", log_desc)
-                self.data_changed_signal.emit("goals")
\ No newline at end of file
+                self.change_bus.publish(GOAL, [goal_id], DELETE)
\ No newline at end of file
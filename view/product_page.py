@@ -5,28 +5,31 @@ from .base_dashboard_page import BaseDashboardPage
 from .product_page_ui import ProductPageUI
 from .add_product_dialog_ui import AddProductDialogUI
 from .shared_ui import StyledAlertDialog
+from controller.change_events import PRODUCT, SALE, INSERT, UPDATE, DELETE
 
 class ProductPage(BaseDashboardPage):
-    def __init__(self, user_id, product_processor, data_changed_signal, parent=None):
+    watched_entities = (PRODUCT, SALE)
+
+    def __init__(self, user_id, product_processor, change_bus, parent=None):
         super().__init__("Manage Your Products", parent=parent)
         self.user_id = user_id
         self.product_processor = product_processor
         self.current_products = [] 
 
-        self.data_changed_signal = data_changed_signal
-        self.data_changed_signal.connect(self.refresh_product_list)
+        self.change_bus = change_bus
 
         self.ui = ProductPageUI()
         self.content_layout.addWidget(self.ui)
 
         self.ui.add_product_button.clicked.connect(self.open_add_product_dialog)
+        self.ui.card_grid.edit_requested.connect(self.open_edit_product_dialog)
+        self.ui.card_grid.delete_requested.connect(self.handle_delete_product_confirmation)
         self.ui.search_input.textChanged.connect(self._debounce_refresh)
         self.ui.sort_combo.currentIndexChanged.connect(self.refresh_product_list)
 
         self.refresh_timer = QTimer()
         self.refresh_timer.setSingleShot(True)
         self.refresh_timer.timeout.connect(self.refresh_product_list)
-        self.data_changed_signal.connect(self.handle_global_data_change)
 
     def load_page_data(self):
         super().load_page_data()
@@ -34,15 +37,11 @@ class ProductPage(BaseDashboardPage):
             StyledAlertDialog.show_alert("Error", "User not identified. Cannot load products.", "error", self)
             self.ui.clear_card_layout()
             return
-        
-        self.ui.search_input.clear()
-        self.ui.sort_combo.setCurrentIndex(0)
+        if not self.is_stale:
+            return
+        self.is_stale = False
         self.refresh_product_list()
 
-    def unload_page_data(self):
-        super().unload_page_data()
-        self.ui.clear_card_layout()
-
     def _debounce_refresh(self):
         self.refresh_timer.start(300)
 
@@ -62,12 +61,11 @@ class ProductPage(BaseDashboardPage):
             sort_order=sort_order
         )
 
-        self.ui.clear_card_layout()
-
         if not self.current_products:
+            self.ui.clear_card_layout()
             self.ui.show_no_products_message(search_term)
         else:
-            self.ui.populate_card_grid(self.current_products, self)
+            self.ui.populate_card_grid(self.current_products)
 
     def open_add_product_dialog(self):
         if not self.user_id:
@@ -82,10 +80,10 @@ class ProductPage(BaseDashboardPage):
                 StyledAlertDialog.show_alert("Input Error", "Product Name and Selling Price are required.", "error", self)
                 return
 
-            success, message, _ = self.product_processor.add_new_product(self.user_id, product_data)
+            success, message, new_product_id = self.product_processor.add_new_product(self.user_id, product_data)
             StyledAlertDialog.show_alert("Add Product", message, "info" if success else "error", self)
             if success:
-                self.data_changed_signal.emit("products")
+                self.change_bus.publish(PRODUCT, [new_product_id], INSERT)
 
     @Slot(int)
     def open_edit_product_dialog(self, product_id):
@@ -105,7 +103,7 @@ class ProductPage(BaseDashboardPage):
             success, message = self.product_processor.update_product_details(self.user_id, product_id, updated_data)
             StyledAlertDialog.show_alert("Update Product", message, "info" if success else "error", self)
             if success:
-                self.data_changed_signal.emit("products")
+                self.change_bus.publish(PRODUCT, [product_id], UPDATE)
 
     @Slot(int, str)
     def handle_delete_product_confirmation(self, product_id, product_name):
@@ -117,9 +115,41 @@ class ProductPage(BaseDashboardPage):
             success, message = self.product_processor.remove_product(self.user_id, product_id)
             StyledAlertDialog.show_alert("Delete Product", message, "info" if success else "error", self)
             if success:
-                self.data_changed_signal.emit("products")
-                
-    
-    def handle_global_data_change(self, data_type):
-        if data_type == "reset" or data_type == "products":
-             self.refresh_product_list()
\ No newline at end of file
+                self.change_bus.publish(PRODUCT, [product_id], DELETE)
+
+    def _sort_column(self):
+        """The column the listed products are ordered by (relevance only applies while searching)."""
+        sort_option = self.ui.sort_combo.currentData()
+        sort_by = sort_option[0] if sort_option else 'product_name'
+        return sort_by if sort_by in ('product_name', 'selling_price', 'stock_quantity', 'created_at') else 'product_name'
+
+    def apply_change_event(self, event):
+        """
+        Edits and deletes only touch the affected cards, as long as an edited
+        product keeps its place in the list; anything else re-runs the product query.
+        """
+        if event.entity != PRODUCT or event.is_bulk or event.operation not in (UPDATE, DELETE):
+            self.refresh_product_list()
+            return
+        if event.operation == UPDATE and self.ui.search_input.text().strip():
+            # Whether the edited product still matches the search is for the search index to decide
+            self.refresh_product_list()
+            return
+        grid = self.ui.card_grid
+        sort_column = self._sort_column()
+        for product_id in event.ids:
+            product = None
+            if event.operation == UPDATE:
+                product = self.product_processor.get_single_product_details(self.user_id, product_id)
+            if product is None:
+                grid.remove_product(product_id)
+                continue
+            listed = grid.product(product_id)
+            if listed is not None and listed.get(sort_column) != product.get(sort_column):
+                # Its position in the sort order may have changed
+                self.refresh_product_list()
+                return
+            grid.update_product(product)
+        self.current_products = grid.products
+        if not self.current_products:
+            self.ui.show_no_products_message(self.ui.search_input.text().strip())
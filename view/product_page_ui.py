@@ -1,19 +1,25 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, 
-    QScrollArea, QGridLayout, QFrame, QComboBox, QSizePolicy
+    QAbstractScrollArea, QFrame, QComboBox, QSizePolicy
 )
 from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QPixmap, QPainter, QIcon
-import os
+from PySide6.QtGui import QPainter, QIcon
+from controller.thumbnail_cache import ThumbnailCache
+from controller.tracing import traced
 
 class ProductCardWidget(QFrame):
     edit_requested = Signal(int)
     delete_requested = Signal(int, str)
 
-    def __init__(self, product_data, parent=None):
+    IMAGE_HEIGHT = 160
+
+    @traced(category="construct")
+    def __init__(self, product_data=None, parent=None):
         super().__init__(parent)
-        self.product_id = product_data.get('id')
-        self.product_name = product_data.get('product_name', 'N/A')
+        self.product_id = None
+        self.product_name = 'N/A'
+        self._stock_color = None
+        self._image_key = None
         
         self.setMinimumSize(220, 300)
         self.setMaximumSize(320, 350)
@@ -57,8 +63,7 @@ class ProductCardWidget(QFrame):
         self.image_label = QLabel()
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.image_label.setMinimumHeight(140)
-        self.image_label.setMaximumHeight(160)
-        self.set_product_image(product_data.get('image_url'))
+        self.image_label.setMaximumHeight(self.IMAGE_HEIGHT)
         image_layout.addWidget(self.image_label)
         layout.addWidget(image_container)
 
@@ -67,7 +72,7 @@ class ProductCardWidget(QFrame):
         content_layout.setContentsMargins(16, 12, 16, 8)
         content_layout.setSpacing(8)
 
-        name_label = QLabel(self.product_name)
+        self.name_label = name_label = QLabel()
         name_label.setStyleSheet("""
             font-size: 15px; 
             font-weight: 600; 
@@ -78,10 +83,7 @@ class ProductCardWidget(QFrame):
         name_label.setMaximumHeight(40)
         content_layout.addWidget(name_label)
 
-        desc = product_data.get('description', 'No description available.')
-        metrics = self.fontMetrics()
-        elided_desc = metrics.elidedText(desc, Qt.TextElideMode.ElideRight, 200)
-        description_label = QLabel(elided_desc)
+        self.description_label = description_label = QLabel()
         description_label.setStyleSheet("""
             font-size: 12px; 
             color: #7F8C8D;
@@ -102,8 +104,7 @@ class ProductCardWidget(QFrame):
         info_layout = QHBoxLayout(info_frame)
         info_layout.setContentsMargins(8, 6, 8, 6)
         
-        price = product_data.get('selling_price', 0.0)
-        price_label = QLabel(f"${price:.2f}")
+        self.price_label = price_label = QLabel()
         price_label.setStyleSheet("""
             font-size: 16px; 
             font-weight: 700; 
@@ -111,19 +112,8 @@ class ProductCardWidget(QFrame):
             background: transparent;
         """)
         
-        stock = product_data.get('stock_quantity', 0)
-        stock_color = "#E74C3C" if stock < 10 else "#F39C12" if stock < 50 else "#27AE60"
-        stock_label = QLabel(f"Stock: {stock}")
+        self.stock_label = stock_label = QLabel()
         stock_label.setAlignment(Qt.AlignmentFlag.AlignRight)
-        stock_label.setStyleSheet(f"""
-            font-size: 11px; 
-            color: {stock_color}; 
-            font-weight: 600;
-            background: transparent;
-            padding: 2px 6px;
-            border-radius: 10px;
-            background-color: rgba(255,255,255,0.7);
-        """)
 
         info_layout.addWidget(price_label)
         info_layout.addStretch()
@@ -182,33 +172,204 @@ class ProductCardWidget(QFrame):
         button_layout.addWidget(delete_button)
         layout.addWidget(button_frame)
 
+        ThumbnailCache.instance().thumbnail_ready.connect(self._on_thumbnail_ready)
+        if product_data is not None:
+            self.set_product(product_data)
+
+    @traced()
+    def set_product(self, product_data):
+        """Shows another product in this card; the product grid reuses cards this way while scrolling."""
+        self.product_id = product_data.get('id')
+        self.product_name = product_data.get('product_name', 'N/A')
+        self.name_label.setText(self.product_name)
+
+        desc = product_data.get('description') or 'No description available.'
+        metrics = self.fontMetrics()
+        self.description_label.setText(metrics.elidedText(desc, Qt.TextElideMode.ElideRight, 200))
+
+        price = product_data.get('selling_price', 0.0)
+        self.price_label.setText(f"${price:.2f}")
+
+        stock = product_data.get('stock_quantity', 0)
+        stock_color = "#E74C3C" if stock < 10 else "#F39C12" if stock < 50 else "#27AE60"
+        self.stock_label.setText(f"Stock: {stock}")
+        if stock_color != self._stock_color:
+            self._stock_color = stock_color
+            self.stock_label.setStyleSheet(f"""
+                font-size: 11px; 
+                color: {stock_color}; 
+                font-weight: 600;
+                background: transparent;
+                padding: 2px 6px;
+                border-radius: 10px;
+                background-color: rgba(255,255,255,0.7);
+            """)
+
+        self.set_product_image(product_data.get('image_url'))
+
     def set_product_image(self, image_path):
-        if image_path and os.path.exists(image_path):
-            pixmap = QPixmap(image_path)
-        else:
-            pixmap = QPixmap("assets/placeholder.png")
+        """Shows the cached thumbnail, or the placeholder until the background loader has it ready."""
+        width = max(1, self.width())
+        cache = ThumbnailCache.instance()
+        self._image_key, pixmap = cache.get(image_path, width, self.IMAGE_HEIGHT)
+        self.image_label.setPixmap(pixmap if pixmap is not None else cache.placeholder(width, self.IMAGE_HEIGHT))
 
-        if pixmap.isNull():
-            pixmap = QPixmap("assets/placeholder.png")
+    def _on_thumbnail_ready(self, key):
+        if key != self._image_key:
+            return
+        pixmap = ThumbnailCache.instance().pixmap(key)
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
+
+class ProductCardGrid(QAbstractScrollArea):
+    """
+    Scrollable grid of product cards that only creates widgets for the cards in
+    view. Cards scrolled out of view go back to a pool and are re-bound to other
+    products with ProductCardWidget.set_product, so the widget count stays at
+    roughly one screenful however many products are listed.
+    """
+    edit_requested = Signal(int)
+    delete_requested = Signal(int, str)
+
+    MIN_CARD_WIDTH = 240
+    MAX_CARD_WIDTH = 320
+    CARD_HEIGHT = 330
+    SPACING = 20
+    MARGIN = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(40)
+        self.products = []
+        self._index_by_id = {}
+        self.grid_columns = 1
+        self.card_width = self.MIN_CARD_WIDTH
+        self._bound_cards = {}   # product index -> card currently showing it
+        self._free_cards = []
+
+    def set_products(self, products):
+        """Replaces the listed products and scrolls back to the top."""
+        self.products = list(products)
+        self._index_by_id = {product.get('id'): index for index, product in enumerate(self.products)}
+        for card in self._bound_cards.values():
+            card.hide()
+            self._free_cards.append(card)
+        self._bound_cards = {}
+        self.verticalScrollBar().setValue(0)
+        self._update_geometry()
+
+    def clear(self):
+        self.set_products([])
+
+    def product(self, product_id):
+        """The listed data for product_id, or None if it isn't listed."""
+        index = self._index_by_id.get(product_id)
+        return self.products[index] if index is not None else None
+
+    def update_product(self, product):
+        """
+        Replaces one listed product with fresh data in place; only its card is
+        re-bound, and only if it is on screen. Returns False if it isn't listed.
+        """
+        index = self._index_by_id.get(product.get('id'))
+        if index is None:
+            return False
+        self.products[index] = product
+        card = self._bound_cards.get(index)
+        if card is not None:
+            card.set_product(product)
+        return True
+
+    def remove_product(self, product_id):
+        """Drops one product from the list, keeping the scroll position. Returns False if it isn't listed."""
+        index = self._index_by_id.get(product_id)
+        if index is None:
+            return False
+        del self.products[index]
+        self._index_by_id = {product.get('id'): i for i, product in enumerate(self.products)}
+        # Cards from the removed one onwards now show shifted products; re-bind them
+        for bound_index in [i for i in self._bound_cards if i >= index]:
+            card = self._bound_cards.pop(bound_index)
+            card.hide()
+            self._free_cards.append(card)
+        self._update_geometry()
+        return True
+
+    def pool_size(self):
+        return len(self._bound_cards) + len(self._free_cards)
+
+    def _row_height(self):
+        return self.CARD_HEIGHT + self.SPACING
+
+    def _update_geometry(self):
+        viewport_width = self.viewport().width()
+        available = max(self.MIN_CARD_WIDTH, viewport_width - 2 * self.MARGIN)
+        self.grid_columns = max(1, (available + self.SPACING) // (self.MIN_CARD_WIDTH + self.SPACING))
+        self.card_width = min(self.MAX_CARD_WIDTH, (available - self.SPACING * (self.grid_columns - 1)) // self.grid_columns)
+
+        rows = (len(self.products) + self.grid_columns - 1) // self.grid_columns
+        content_height = 2 * self.MARGIN + rows * self._row_height() - (self.SPACING if rows else 0)
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setRange(0, max(0, content_height - self.viewport().height()))
+        scroll_bar.setPageStep(self.viewport().height())
+        self._layout_visible_cards()
+
+    def _take_card(self):
+        if self._free_cards:
+            return self._free_cards.pop()
+        card = ProductCardWidget(parent=self.viewport())
+        card.edit_requested.connect(self.edit_requested)
+        card.delete_requested.connect(self.delete_requested)
+        return card
+
+    @traced()
+    def _layout_visible_cards(self):
+        offset = self.verticalScrollBar().value()
+        row_height = self._row_height()
+        first_row = max(0, (offset - self.MARGIN) // row_height)
+        last_row = (offset + self.viewport().height() - self.MARGIN) // row_height
+        first = first_row * self.grid_columns
+        last = min(len(self.products), (last_row + 1) * self.grid_columns)
+        visible = range(first, last)
+
+        for index in [index for index in self._bound_cards if index not in visible]:
+            card = self._bound_cards.pop(index)
+            card.hide()
+            self._free_cards.append(card)
+
+        for index in visible:
+            row, column = divmod(index, self.grid_columns)
+            x = self.MARGIN + column * (self.card_width + self.SPACING)
+            y = self.MARGIN + row * row_height - offset
+            card = self._bound_cards.get(index)
+            if card is None:
+                card = self._take_card()
+                card.setGeometry(x, y, self.card_width, self.CARD_HEIGHT)
+                card.set_product(self.products[index])
+                self._bound_cards[index] = card
+                card.show()
+            else:
+                card.setGeometry(x, y, self.card_width, self.CARD_HEIGHT)
+
+    def scrollContentsBy(self, dx, dy):
+        self._layout_visible_cards()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        old_width = self.card_width
+        self._update_geometry()
+        if self.card_width != old_width:
+            # Images are scaled to the card width when bound, so re-bind at the new size
+            for index, card in self._bound_cards.items():
+                card.set_product(self.products[index])
 
-        target_width = self.width()
-        scaled_pixmap = pixmap.scaled(target_width, 140, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-        
-        target_height = 160 
-        
-        py = max(0, (scaled_pixmap.height() - target_height) / 2)
-        
-        cropped_pixmap = scaled_pixmap.copy(0, int(py), target_width, target_height)
-        
-        self.image_label.setPixmap(cropped_pixmap)
 
 class ProductPageUI(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        self.min_card_width = 240
-        self.grid_columns = 3
-        
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(20, 15, 20, 15)
         main_layout.setSpacing(20)
@@ -328,6 +489,8 @@ class ProductPageUI(QWidget):
                 background: white; selection-background-color: #F0F8FF;
             }
         """)
+        # Best search matches first; lists by name when there is no search term
+        self.sort_combo.addItem("Sort by: Relevance", ('relevance', 'ASC'))
         self.sort_combo.addItem("Sort by: Name (A-Z)", ('product_name', 'ASC'))
         self.sort_combo.addItem("Sort by: Name (Z-A)", ('product_name', 'DESC'))
         self.sort_combo.addItem("Sort by: Price (Low-High)", ('selling_price', 'ASC'))
@@ -342,11 +505,9 @@ class ProductPageUI(QWidget):
         
         main_layout.addWidget(filter_frame)
 
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
+        self.card_grid = ProductCardGrid()
+        self.card_grid.setStyleSheet("""
+            QAbstractScrollArea {
                 background: transparent;
                 border: none;
             }
@@ -365,14 +526,7 @@ class ProductPageUI(QWidget):
                 background: #999999;
             }
         """)
-
-        scroll_content = QWidget()
-        self.cards_layout = QGridLayout(scroll_content)
-        self.cards_layout.setSpacing(20)
-        self.cards_layout.setContentsMargins(10, 10, 10, 10)
-        self.scroll_area.setWidget(scroll_content)
-        
-        main_layout.addWidget(self.scroll_area, 1)
+        main_layout.addWidget(self.card_grid, 1)
         
         self.no_products_label = QLabel()
         self.no_products_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -389,45 +543,20 @@ class ProductPageUI(QWidget):
         self.no_products_label.setVisible(False)
         main_layout.addWidget(self.no_products_label, 1)
 
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        available_width = self.width() - 60 
-        self.grid_columns = max(1, available_width // (self.min_card_width + 20))
-
-    def populate_card_grid(self, products, controller):
-        row, col = 0, 0
-        for product in products:
-            card = ProductCardWidget(product)
-            card.edit_requested.connect(controller.open_edit_product_dialog)
-            card.delete_requested.connect(controller.handle_delete_product_confirmation)
-            
-            self.cards_layout.addWidget(card, row, col)
-            col += 1
-            if col >= self.grid_columns:
-                col = 0
-                row += 1
-        
-        for remaining_col in range(col, self.grid_columns):
-            self.cards_layout.setColumnStretch(remaining_col, 1)
-        
-        self.cards_layout.setRowStretch(row + 1, 1)
+    def populate_card_grid(self, products):
+        self.no_products_label.setVisible(False)
+        self.card_grid.setVisible(True)
+        self.card_grid.set_products(products)
 
     def clear_card_layout(self):
-        while self.cards_layout.count():
-            child = self.cards_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        for col in range(self.grid_columns):
-            self.cards_layout.setColumnStretch(col, 0)
-            
+        self.card_grid.clear()
         self.no_products_label.setVisible(False)
-        self.scroll_area.setVisible(True)
+        self.card_grid.setVisible(True)
 
     def show_no_products_message(self, search_term):
         if search_term:
             self.no_products_label.setText(f"No products match your search for '{search_term}'.\nTry adjusting your search terms.")
         else:
             self.no_products_label.setText("You haven't added any products yet.\n\n Click 'Add New Product' to start building your inventory!")
-        self.scroll_area.setVisible(False)
+        self.card_grid.setVisible(False)
         self.no_products_label.setVisible(True)
\ No newline at end of file
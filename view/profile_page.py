@@ -5,6 +5,7 @@ from PySide6.QtGui import QFont
 
 from .base_dashboard_page import BaseDashboardPage
 from .shared_ui import StyledAlertDialog, ThemeToggleSwitch 
+from controller.change_events import USER, UPDATE
 
 class ProfilePageStyles:
     
@@ -142,11 +143,11 @@ class ProfilePageStyles:
         """
 
 class ProfilePage(BaseDashboardPage):
-    def __init__(self, user_id, user_processor, data_changed_signal, parent=None, theme="light"):
+    def __init__(self, user_id, user_processor, change_bus, parent=None, theme="light"):
         super().__init__("Profile & Settings", parent=parent)
         self.user_id = user_id
         self.user_processor = user_processor
-        self.data_changed_signal = data_changed_signal
+        self.change_bus = change_bus
         self.theme = theme # You can connect this to a theme manager later
         self.styles = ProfilePageStyles()
 
@@ -326,7 +327,7 @@ class ProfilePage(BaseDashboardPage):
         success, message = self.user_processor.update_user_details(self.user_id, new_data)
         StyledAlertDialog.show_alert("Update Profile", message, "info" if success else "error")
         if success:
-            self.data_changed_signal.emit("user_info")
+            self.change_bus.publish(USER, [self.user_id], UPDATE)
 
     def _change_password(self):
         old_pass = self.old_pass_input.text()
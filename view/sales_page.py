@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import (QTableWidget, QHeaderView, QTableWidgetItem, 
+from PySide6.QtWidgets import (QTableView, QHeaderView, QAbstractItemView,
                                QComboBox, QLabel, QPushButton, QFrame, QHBoxLayout, QVBoxLayout, QWidget, QScrollArea, QSizePolicy)
 from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
@@ -7,16 +7,21 @@ from datetime import datetime, timedelta
 from .base_dashboard_page import BaseDashboardPage
 from processing.sales_processor import SalesProcessor
 from processing.product_processing import ProductProcessor
+from controller.data_loader import DataLoader
+from controller.change_events import PRODUCT, SALE, UPDATE
+from .sales_table_model import SalesTableModel
 
 class SalesPage(BaseDashboardPage):
-    def __init__(self, user_id, product_processor, data_changed_signal, parent=None):
+    watched_entities = (PRODUCT, SALE)
+
+    def __init__(self, user_id, product_processor, change_bus, parent=None):
         super().__init__("Sales History & Revenue", parent=parent)
         self.user_id = user_id
         self.product_processor = product_processor
         self.sales_processor = SalesProcessor(product_processor.db_manager)
+        self.data_loader = DataLoader(product_processor.db_manager.db_path, parent=self)
 
-        self.data_changed_signal = data_changed_signal
-        self.data_changed_signal.connect(self.handle_global_data_change)
+        self.change_bus = change_bus
 
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -88,23 +93,23 @@ class SalesPage(BaseDashboardPage):
             padding: 0;
         """)
         table_layout.addWidget(table_header)
-        self.sales_table = QTableWidget()
-        self.sales_table.setColumnCount(5)
-        self.sales_table.setHorizontalHeaderLabels(["Date", "Product Name", "Quantity", "Price", "Revenue"])
+        self.sales_model = SalesTableModel(self.data_loader, parent=self)
+        self.sales_table = QTableView()
+        self.sales_table.setModel(self.sales_model)
         header = self.sales_table.horizontalHeader()
         header.setSectionResizeMode(1, QHeaderView.Stretch) 
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents) 
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents) 
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents) 
         header.setSectionResizeMode(4, QHeaderView.ResizeToContents) 
-        self.sales_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.sales_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.sales_table.setAlternatingRowColors(True)
         self.sales_table.verticalHeader().setVisible(True)
         self.sales_table.setMinimumHeight(300)
         self.sales_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
                 
         self.sales_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #F0F0F0;
                 background-color: white;
                 alternate-background-color: #FAFBFC;
@@ -113,11 +118,11 @@ class SalesPage(BaseDashboardPage):
                 border-radius: 8px;
                 font-size: 13px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 12px 8px;
                 border-bottom: 1px solid #F5F5F5;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: rgba(74, 144, 226, 0.15);
                 color: #2C3E50;
             }
@@ -187,10 +192,27 @@ class SalesPage(BaseDashboardPage):
 
     def load_page_data(self):
         super().load_page_data()
-        self.handle_global_data_change() 
+        if not self.is_stale:
+            return
+        self.is_stale = False
+        self.refresh_sales_data()
+
+    def apply_change_event(self, event):
+        """A product edit only relabels its filter entry, and reloads the rows only if the name changed."""
+        if event.entity != PRODUCT or event.operation != UPDATE or event.is_bulk:
+            self.refresh_sales_data()
+            return
+        renamed = False
+        for product_id in event.ids:
+            index = self.product_filter_combo.findData(product_id)
+            product = self.product_processor.get_single_product_details(self.user_id, product_id)
+            if index != -1 and product and self.product_filter_combo.itemText(index) != product['product_name']:
+                self.product_filter_combo.setItemText(index, product['product_name'])
+                renamed = True
+        if renamed:
+            self._update_sales_display()
 
-    def handle_global_data_change(self):
-        print("SalesPage detected a data change, refreshing...")
+    def refresh_sales_data(self):
         current_prod_id = self.product_filter_combo.currentData()
         current_date_index = self.date_filter_combo.currentIndex()
 
@@ -447,62 +469,26 @@ class SalesPage(BaseDashboardPage):
         start_date_str = start_date.strftime('%Y-%m-%d 00:00:00') if start_date else None
         end_date_str = end_date.strftime('%Y-%m-%d 23:59:59') if end_date else None
 
-        sales_data = self.sales_processor.get_sales_for_display(
-            self.user_id,
-            start_date=start_date_str,
-            end_date=end_date_str,
-            product_id=product_id
-        )
-
-        self.sales_table.setRowCount(0)
-        total_revenue, total_items_sold = 0, 0
+        self.sales_model.set_filters(self.user_id, start_date_str, end_date_str, product_id)
 
-        for row, sale in enumerate(sales_data):
-            self.sales_table.insertRow(row)
-            try:
-                sale_date = datetime.fromisoformat(sale['sale_date']).strftime('%Y-%m-%d %H:%M')
-            except (ValueError, TypeError):
-                sale_date = str(sale['sale_date'])
-            
-            date_item = QTableWidgetItem(sale_date)
-            date_item.setToolTip(f"Transaction on {sale_date}")
-            
-            product_item = QTableWidgetItem(sale['product_name'])
-            product_item.setToolTip(f"Product: {sale['product_name']}")
-            
-            quantity_item = QTableWidgetItem(str(sale['quantity_sold']))
-            quantity_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            quantity_item.setToolTip(f"Quantity sold: {sale['quantity_sold']} units")
-            
-            price_item = QTableWidgetItem(f"${sale['price_at_sale']:.2f}")
-            price_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            price_item.setToolTip(f"Price per unit: ${sale['price_at_sale']:.2f}")
-            
-            revenue_item = QTableWidgetItem(f"${sale['total_revenue']:.2f}")
-            revenue_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            revenue_item.setToolTip(f"Total revenue: ${sale['total_revenue']:.2f}")
-            
-            if sale['total_revenue'] > 100:
-                revenue_item.setForeground(Qt.GlobalColor.darkGreen)
-            elif sale['total_revenue'] > 50:
-                revenue_item.setForeground(Qt.GlobalColor.darkBlue)
-            
-            self.sales_table.setItem(row, 0, date_item)
-            self.sales_table.setItem(row, 1, product_item)
-            self.sales_table.setItem(row, 2, quantity_item)
-            self.sales_table.setItem(row, 3, price_item)
-            self.sales_table.setItem(row, 4, revenue_item)
+        user_id = self.user_id
+        self.data_loader.submit(
+            "sales",
+            lambda db: SalesProcessor(db).get_sales_summary(
+                user_id,
+                start_date=start_date_str,
+                end_date=end_date_str,
+                product_id=product_id
+            ),
+            self._apply_sales_summary
+        )
 
-            total_revenue += sale['total_revenue']
-            total_items_sold += sale['quantity_sold']
-        
-        self.sales_table.resizeRowsToContents()
-        self.sales_table.resizeColumnsToContents()
-        
-        row_count = self.sales_table.rowCount()
+    def _apply_sales_summary(self, summary):
+        row_count = summary['line_count']
+        self.sales_model.set_row_count(row_count)
         if row_count > 0:
             header_height = self.sales_table.horizontalHeader().height()
-            row_height = self.sales_table.rowHeight(0)  
+            row_height = self.sales_table.verticalHeader().defaultSectionSize()
             ideal_height = header_height + (row_height * row_count) + 4  
             
             min_height = 300
@@ -515,5 +501,5 @@ class SalesPage(BaseDashboardPage):
             else:
                 self.sales_table.setFixedHeight(ideal_height)
         
-        self.total_revenue_label.setText(f"Total Revenue\n${total_revenue:,.2f}")
-        self.items_sold_label.setText(f"Items Sold\n{total_items_sold:,} units")
\ No newline at end of file
+        self.total_revenue_label.setText(f"Total Revenue\n${summary['total_revenue']:,.2f}")
+        self.items_sold_label.setText(f"Items Sold\n{summary['total_quantity']:,} units")
\ No newline at end of file
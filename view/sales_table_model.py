@@ -0,0 +1,202 @@
+import bisect
+from collections import OrderedDict
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from processing.sales_processor import SalesProcessor
+
+_LOADING = object()  # stands in for the rows of a page that is still being fetched
+
+
+def _walk_to_page(sales_processor, filters, page_number, cursor, target_page, page_size):
+    """
+    Steps forward by keyset from page_number (whose cursor is given) to
+    target_page. Returns (reached page, its rows, {page number: cursor} for
+    every page start passed on the way).
+    """
+    user_id, start_date, end_date, product_id = filters
+    cursors = {}
+    while True:
+        rows, next_cursor = sales_processor.get_sales_page(
+            user_id, start_date, end_date, product_id, after=cursor, page_size=page_size
+        )
+        if next_cursor is None or page_number == target_page:
+            break
+        page_number += 1
+        cursor = cursors[page_number] = next_cursor
+    if next_cursor is not None:
+        cursors[page_number + 1] = next_cursor
+    return page_number, rows, cursors
+
+
+class SalesTableModel(QAbstractTableModel):
+    """
+    Read-only sales history model that holds only the rows near what the view
+    shows. rowCount is the total line count for the filters (set_row_count,
+    from the page's summary query). Pages of PAGE_SIZE rows are fetched by
+    keyset on the DataLoader's pool; until one arrives its rows show a
+    placeholder, and dataChanged repaints them once it does. A page far past
+    the last known cursor is reached in steps of at most WALK_PAGES pages, so
+    each query stays short and the cursors found along the way are kept. At
+    most MAX_CACHED_PAGES pages of rows are kept, least recently used dropped
+    first. Rows are kept as the raw records and only formatted in data() for
+    the cells the view asks for.
+    """
+    HEADERS = ["Date", "Product Name", "Quantity", "Price", "Revenue"]
+    PAGE_SIZE = 200
+    MAX_CACHED_PAGES = 16
+    WALK_PAGES = 50
+    PLACEHOLDER = "Loading..."
+
+    def __init__(self, data_loader, parent=None):
+        super().__init__(parent)
+        self.data_loader = data_loader
+        self._filters = None
+        self._row_count = 0
+        self._pages = OrderedDict()      # page number -> rows, least recently used first
+        self._page_cursors = {0: None}   # page number -> keyset cursor of the row before it
+        self._known_pages = [0]          # sorted keys of _page_cursors
+        self._loading = set()            # page numbers requested from the data loader
+
+    def _reset(self, filters, row_count=0):
+        self.beginResetModel()
+        for page_number in self._loading:
+            self.data_loader.cancel(self._load_key(page_number))
+        self._loading.clear()
+        self._filters = filters
+        self._row_count = row_count
+        self._pages.clear()
+        self._page_cursors = {0: None}
+        self._known_pages = [0]
+        self.endResetModel()
+
+    def set_filters(self, user_id, start_date=None, end_date=None, product_id=None):
+        """Resets the model to a new query; it shows no rows until set_row_count() gives their number."""
+        self._reset((user_id, start_date, end_date, product_id) if user_id else None)
+
+    def set_row_count(self, row_count):
+        """Sets how many rows the current filters match; their data is fetched as the view asks for it."""
+        if self._filters is not None:
+            self._reset(self._filters, row_count)
+
+    def clear(self):
+        self._reset(None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    @staticmethod
+    def _load_key(page_number):
+        return f"sales_page:{page_number}"
+
+    def _request_page(self, page_number):
+        """Starts loading a page unless it is already on its way; loads for pages far from it are dropped."""
+        if page_number in self._loading:
+            return
+        for other in [other for other in self._loading if abs(other - page_number) > 1]:
+            self.data_loader.cancel(self._load_key(other))
+            self._loading.discard(other)
+        known = self._known_pages[bisect.bisect_right(self._known_pages, page_number) - 1]
+        target = min(page_number, known + self.WALK_PAGES)
+        filters, cursor, page_size = self._filters, self._page_cursors[known], self.PAGE_SIZE
+        self._loading.add(page_number)
+        self.data_loader.submit(
+            self._load_key(page_number),
+            lambda db: _walk_to_page(SalesProcessor(db), filters, known, cursor, target, page_size),
+            lambda result: self._apply_page(page_number, filters, result),
+            lambda error: self._loading.discard(page_number)
+        )
+
+    def _apply_page(self, page_number, filters, result):
+        self._loading.discard(page_number)
+        if filters != self._filters:
+            return
+        reached, rows, cursors = result
+        for number, cursor in cursors.items():
+            if number not in self._page_cursors:
+                self._page_cursors[number] = cursor
+                bisect.insort(self._known_pages, number)
+        if reached < page_number and reached + 1 in self._page_cursors:
+            # Stopped WALK_PAGES short of the page; carry on from the cursors just found
+            self._store_page(reached, rows)
+            self._request_page(page_number)
+            return
+        self._store_page(reached, rows)
+        if reached < page_number:
+            # The rows ran out before the page (sales deleted since the count was taken)
+            self._store_page(page_number, [])
+
+    def _store_page(self, page_number, rows):
+        self._pages[page_number] = rows
+        self._pages.move_to_end(page_number)
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+        first = page_number * self.PAGE_SIZE
+        last = min(first + self.PAGE_SIZE, self._row_count) - 1
+        if last >= first:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+    def _row(self, row):
+        """The record for a row; None past the end, or _LOADING while its page is being fetched."""
+        if self._filters is None:
+            return None
+        page_number = row // self.PAGE_SIZE
+        rows = self._pages.get(page_number)
+        if rows is None:
+            self._request_page(page_number)
+            return _LOADING
+        self._pages.move_to_end(page_number)
+        offset = row % self.PAGE_SIZE
+        # Fewer rows than counted if sales were deleted since the count was taken
+        return rows[offset] if offset < len(rows) else None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        sale = self._row(index.row())
+        if sale is None:
+            return None
+        column = index.column()
+        if sale is _LOADING:
+            if role == Qt.ItemDataRole.DisplayRole and column == 0:
+                return self.PLACEHOLDER
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0: return self._format_date(sale['sale_date'])
+            if column == 1: return sale['product_name']
+            if column == 2: return str(sale['quantity_sold'])
+            if column == 3: return f"${sale['price_at_sale']:.2f}"
+            if column == 4: return f"${sale['total_revenue']:.2f}"
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if column == 0: return f"Transaction on {self._format_date(sale['sale_date'])}"
+            if column == 1: return f"Product: {sale['product_name']}"
+            if column == 2: return f"Quantity sold: {sale['quantity_sold']} units"
+            if column == 3: return f"Price per unit: ${sale['price_at_sale']:.2f}"
+            if column == 4: return f"Total revenue: ${sale['total_revenue']:.2f}"
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column == 2: return int(Qt.AlignmentFlag.AlignCenter)
+            if column in (3, 4): return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        elif role == Qt.ItemDataRole.ForegroundRole and column == 4:
+            if sale['total_revenue'] > 100: return QColor(Qt.GlobalColor.darkGreen)
+            if sale['total_revenue'] > 50: return QColor(Qt.GlobalColor.darkBlue)
+        return None
+
+    @staticmethod
+    def _format_date(value):
+        try:
+            return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M')
+        except (ValueError, TypeError):
+            return str(value)
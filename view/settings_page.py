@@ -1,25 +1,37 @@
 import os
-import shutil
 from datetime import datetime
+from functools import partial
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QPushButton, QFrame, QFileDialog, QMessageBox, QApplication, QFrame)
+                               QPushButton, QFrame, QFileDialog, QMessageBox, QApplication, QFrame, QProgressDialog,
+                               QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QPlainTextEdit, QAbstractItemView)
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QFont, QIcon
+from PySide6.QtGui import QFont, QIcon, QKeySequence, QShortcut
 
 from .base_dashboard_page import BaseDashboardPage
 from .shared_ui import StyledAlertDialog
+from controller.background_task import BackgroundTask
+from controller.change_events import PRODUCT, RESET
+from controller.tracing import Tracer
 
 class SettingsPage(BaseDashboardPage):
-    def __init__(self, user_id, product_processor, user_processor, data_changed_signal, parent=None):
+    def __init__(self, user_id, product_processor, user_processor, change_bus, parent=None):
         super().__init__("Application Settings", parent=parent)
         self.user_id = user_id
         self.product_processor = product_processor
         self.user_processor = user_processor
-        self.data_changed_signal = data_changed_signal
+        self.change_bus = change_bus
+        self._export_task = None
+        self._export_progress = None
         
         self.content_layout.addWidget(self._create_data_management_card())
+        self.diagnostics_card = self._create_diagnostics_card()
+        self.diagnostics_card.setVisible(False)
+        self.content_layout.addWidget(self.diagnostics_card)
         self.content_layout.addStretch()
 
+        # Hidden developer panel: query timings and the UI trace
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.toggle_diagnostics)
+
     def load_page_data(self):
         super().load_page_data()
         pass 
@@ -192,6 +204,78 @@ class SettingsPage(BaseDashboardPage):
         
         export_section.addLayout(export_button_layout)
         layout.addLayout(export_section)
+
+        catalogue_section = QVBoxLayout()
+        catalogue_section.setSpacing(16)
+
+        catalogue_title = QLabel("  Product Catalogue")
+        catalogue_title.setStyleSheet("""
+            QLabel {
+                color: #374151;
+                font-size: 18px;
+                font-weight: 600;
+                margin-top: 16px;
+                margin-bottom: 8px;
+                padding: 0;
+                border: none;
+                background: transparent;
+            }
+        """)
+        catalogue_section.addWidget(catalogue_title)
+
+        catalogue_desc = QLabel("Add or update products in bulk from a CSV/Excel file (matched by SKU), or export your catalogue")
+        catalogue_desc.setStyleSheet("""
+            QLabel {
+                color: #6B7280;
+                font-size: 14px;
+                font-weight: 400;
+                margin-bottom: 16px;
+                padding: 0;
+                border: none;
+                background: transparent;
+            }
+        """)
+        catalogue_section.addWidget(catalogue_desc)
+
+        catalogue_button_style = """
+            QPushButton {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #8B5CF6, stop:1 #7C3AED);
+                color: white;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 24px;
+                font-size: 14px;
+                font-weight: 600;
+                min-height: 16px;
+            }
+            QPushButton:hover {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                    stop:0 #7C3AED, stop:1 #6D28D9);
+            }
+            QPushButton:pressed {
+                background: #6D28D9;
+            }
+        """
+        import_catalogue_btn = QPushButton(" Import Catalogue")
+        import_catalogue_btn.setCursor(Qt.PointingHandCursor)
+        import_catalogue_btn.setStyleSheet(catalogue_button_style)
+        import_catalogue_btn.clicked.connect(self.import_catalogue)
+
+        export_catalogue_btn = QPushButton(QIcon("assets/icons/csv.png"), " Export Catalogue")
+        export_catalogue_btn.setIconSize(QSize(18,18))
+        export_catalogue_btn.setCursor(Qt.PointingHandCursor)
+        export_catalogue_btn.setStyleSheet(catalogue_button_style)
+        export_catalogue_btn.clicked.connect(self.export_catalogue)
+
+        catalogue_button_layout = QHBoxLayout()
+        catalogue_button_layout.setSpacing(16)
+        catalogue_button_layout.addWidget(import_catalogue_btn)
+        catalogue_button_layout.addWidget(export_catalogue_btn)
+        catalogue_button_layout.addStretch()
+
+        catalogue_section.addLayout(catalogue_button_layout)
+        layout.addLayout(catalogue_section)
         
         section_separator = QFrame()
         section_separator.setFrameShape(QFrame.HLine)
@@ -300,35 +384,186 @@ class SettingsPage(BaseDashboardPage):
         
         return card
 
+    def _create_diagnostics_card(self):
+        card, layout = self._create_styled_card("Diagnostics")
+        profiler = self.product_processor.db_manager.profiler
+        plain_style = "QLabel { color: #374151; font-size: 14px; border: none; background: transparent; padding: 0; }"
+
+        controls = QHBoxLayout()
+        threshold_label = QLabel("Slow query threshold (ms)")
+        threshold_label.setStyleSheet(plain_style)
+        self.slow_threshold_spin = QSpinBox()
+        self.slow_threshold_spin.setRange(1, 60000)
+        self.slow_threshold_spin.setValue(int(profiler.slow_query_ms))
+        self.slow_threshold_spin.valueChanged.connect(lambda value: setattr(profiler, 'slow_query_ms', float(value)))
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh_diagnostics)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(lambda: (profiler.reset(), self.refresh_diagnostics()))
+        controls.addWidget(threshold_label)
+        controls.addWidget(self.slow_threshold_spin)
+        controls.addStretch()
+        controls.addWidget(refresh_btn)
+        controls.addWidget(reset_btn)
+        layout.addLayout(controls)
+
+        headers = ["Method", "Calls", "Errors", "p50 ms", "p95 ms", "p99 ms", "Max ms"]
+        self.method_stats_table = QTableWidget(0, len(headers))
+        self.method_stats_table.setHorizontalHeaderLabels(headers)
+        self.method_stats_table.verticalHeader().setVisible(False)
+        self.method_stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.method_stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.method_stats_table.setMinimumHeight(260)
+        layout.addWidget(self.method_stats_table)
+
+        slow_label = QLabel("Recent slow queries")
+        slow_label.setStyleSheet(plain_style)
+        layout.addWidget(slow_label)
+        self.slow_queries_view = QPlainTextEdit()
+        self.slow_queries_view.setReadOnly(True)
+        self.slow_queries_view.setFont(QFont("Consolas", 9))
+        self.slow_queries_view.setMinimumHeight(220)
+        layout.addWidget(self.slow_queries_view)
+
+        trace_row = QHBoxLayout()
+        self.stall_label = QLabel()
+        self.stall_label.setStyleSheet(plain_style)
+        export_trace_btn = QPushButton("Export UI Trace...")
+        export_trace_btn.clicked.connect(self.export_ui_trace)
+        trace_row.addWidget(self.stall_label)
+        trace_row.addStretch()
+        trace_row.addWidget(export_trace_btn)
+        layout.addLayout(trace_row)
+        return card
+
+    def toggle_diagnostics(self):
+        show = self.diagnostics_card.isHidden()
+        self.diagnostics_card.setVisible(show)
+        if show:
+            self.refresh_diagnostics()
+
+    def refresh_diagnostics(self):
+        profiler = self.product_processor.db_manager.profiler
+        stats = profiler.method_stats()
+        self.method_stats_table.setRowCount(len(stats))
+        for row, (method, values) in enumerate(stats.items()):
+            cells = [method, f"{values['calls']:,}", f"{values['errors']:,}"] + \
+                    [f"{values[key]:.2f}" for key in ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms')]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.method_stats_table.setItem(row, column, item)
+
+        entries = []
+        for record in profiler.slow_queries(limit=20):
+            when = datetime.fromtimestamp(record.started_at).strftime('%H:%M:%S')
+            plan = "\n".join(f"    {line}" for line in record.plan or [])
+            entries.append(f"[{when}] {record.method}: {record.elapsed_ms:.1f} ms, {record.rows:,} rows, params {record.params_shape}"
+                           f"\n  {record.statement}" + (f"\n{plan}" if plan else ""))
+        self.slow_queries_view.setPlainText("\n\n".join(entries) or f"No query slower than {profiler.slow_query_ms:g} ms so far.")
+
+        stall_detector = getattr(QApplication.instance(), 'stall_detector', None)
+        if stall_detector is not None:
+            self.stall_label.setText(f"Event loop stalls over {stall_detector.threshold_ms} ms: {stall_detector.stall_count}"
+                                     f" (longest {stall_detector.longest_stall_ms:.0f} ms)")
+        else:
+            self.stall_label.setText("Event loop stall detector not running.")
+
+    def export_ui_trace(self):
+        default_name = f"trace_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export UI Trace", default_name, "Chrome Trace Files (*.json)")
+        if file_path:
+            try:
+                count = Tracer.instance().export_chrome_trace(file_path, self.product_processor.db_manager.profiler)
+                StyledAlertDialog.show_alert("Export Trace", f"{count:,} events written to {os.path.basename(file_path)}.\n"
+                                             "Open it in chrome://tracing or ui.perfetto.dev.", "info")
+            except OSError as e:
+                StyledAlertDialog.show_alert("Export Trace", f"Could not write the trace: {e}", "error")
+
+    def _run_export_with_progress(self, title, label, export_fn, file_path, on_finished=None):
+        """
+        Runs a streaming export or import on the thread pool behind a cancellable
+        progress dialog, then shows its (success, message) under title and calls
+        on_finished(success). Only one runs at a time.
+        """
+        if self._export_task is not None:
+            StyledAlertDialog.show_alert(title, "Another export or import is still running.", "info")
+            return
+        self._export_progress = QProgressDialog(label, "Cancel", 0, 0, self)
+        self._export_progress.setWindowTitle("Exporting")
+        self._export_progress.setWindowModality(Qt.WindowModal)
+        self._export_progress.setMinimumDuration(500)
+        self._export_label = label
+        self._export_title = title
+        self._export_on_finished = on_finished
+
+        user_id = self.user_id
+        self._export_task = BackgroundTask(title, lambda progress_callback, should_cancel: export_fn(
+            user_id, file_path, progress_callback=progress_callback, should_cancel=should_cancel))
+        self._export_progress.canceled.connect(self._export_task.cancel)
+        self._export_task.signals.progress.connect(self._on_export_progress)
+        self._export_task.signals.finished.connect(self._on_export_finished)
+        self._export_task.start()
+
+    def _on_export_progress(self, rows_written, total_rows):
+        if total_rows:
+            self._export_progress.setMaximum(total_rows)
+            self._export_progress.setValue(min(rows_written, total_rows))
+        self._export_progress.setLabelText(f"{self._export_label}\n{rows_written:,} rows processed")
+
+    def _on_export_finished(self, success, message):
+        self._export_progress.canceled.disconnect(self._export_task.cancel)
+        self._export_progress.close()
+        self._export_progress.deleteLater()
+        on_finished = self._export_on_finished
+        self._export_task = self._export_progress = self._export_on_finished = None
+        StyledAlertDialog.show_alert(self._export_title, message, "info" if success else "error")
+        if on_finished:
+            on_finished(success)
+
     def export_data_csv(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, "Export Data as CSV", "sales_and_products_report.csv", "CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Data as CSV", "sales_and_products_report.csv",
+                                                   "CSV Files (*.csv);;Compressed CSV Files (*.csv.gz)")
         if file_path:
-            success, message = self.product_processor.export_products_and_sales_to_csv(self.user_id, file_path)
-            StyledAlertDialog.show_alert("Export CSV", message, "info" if success else "error")
+            self._run_export_with_progress("Export CSV", "Exporting sales to CSV...",
+                                           self.product_processor.export_products_and_sales_to_csv, file_path)
             
     def export_data_excel(self):
         default_filename = f"sales_report_{datetime.now().strftime('%Y-%m-%d')}.xlsx"
         file_path, _ = QFileDialog.getSaveFileName(self, "Export Data as Excel", default_filename, "Excel Files (*.xlsx)")
         if file_path:
-            success, message = self.product_processor.export_data_to_excel(self.user_id, file_path)
-            StyledAlertDialog.show_alert("Export Excel", message, "info" if success else "error")
+            self._run_export_with_progress("Export Excel", "Exporting sales to Excel...",
+                                           self.product_processor.export_data_to_excel, file_path)
 
     def export_data_pdf(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, "Export Data as PDF", "sales_and_products_report.pdf", "PDF Files (*.pdf)")
+        file_path, selected_filter = QFileDialog.getSaveFileName(self, "Export Data as PDF", "sales_and_products_report.pdf",
+                                                                 "Detailed Report (*.pdf);;Summary Report (*.pdf)")
+        if file_path:
+            summary_only = selected_filter.startswith("Summary")
+            self._run_export_with_progress("Export PDF", "Exporting sales to PDF...",
+                                           partial(self.product_processor.export_products_and_sales_to_pdf, summary_only=summary_only),
+                                           file_path)
+
+    def import_catalogue(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Product Catalogue", "", "Catalogue Files (*.csv *.xlsx)")
         if file_path:
-            success, message = self.product_processor.export_products_and_sales_to_pdf(self.user_id, file_path)
-            StyledAlertDialog.show_alert("Export PDF", message, "info" if success else "error")
+            self._run_export_with_progress("Import Catalogue", "Importing products...",
+                                           self.product_processor.import_catalogue, file_path,
+                                           on_finished=lambda success: self.change_bus.publish(PRODUCT, operation=RESET))
+
+    def export_catalogue(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Product Catalogue", "product_catalogue.csv", "CSV Files (*.csv)")
+        if file_path:
+            self._run_export_with_progress("Export Catalogue", "Exporting products...",
+                                           self.product_processor.export_catalogue_to_csv, file_path)
 
     def backup_database(self):
-        db_path = self.product_processor.db_manager.db_path
         default_name = f"backup_{datetime.now().strftime('%Y-%m-%d')}.db"
         file_path, _ = QFileDialog.getSaveFileName(self, "Backup Database", default_name, "Database Files (*.db)")
         if file_path:
-            try:
-                shutil.copy(db_path, file_path)
-                StyledAlertDialog.show_alert("Backup", "Database backup successful!", "info")
-            except Exception as e:
-                StyledAlertDialog.show_alert("Backup Error", f"Could not create backup: {e}", "error")
+            success, message = self.product_processor.db_manager.backup_database(file_path)
+            StyledAlertDialog.show_alert("Backup" if success else "Backup Error", message, "info" if success else "error")
 
     def restore_database(self):
         reply = QMessageBox.warning(self, "Confirm Restore",
@@ -339,14 +574,11 @@ class SettingsPage(BaseDashboardPage):
         
         file_path, _ = QFileDialog.getOpenFileName(self, "Select Backup File", "", "Database Files (*.db)")
         if file_path:
-            db_manager = self.product_processor.db_manager
-            db_manager.close_connection()
-            try:
-                shutil.copy(file_path, db_manager.db_path)
+            success, message = self.product_processor.db_manager.restore_database(file_path)
+            if success:
                 StyledAlertDialog.show_alert("Restore Successful", 
                                              "Restore successful!\n\nThe application will now close. Please restart it to use the restored data.", 
                                              "info")
                 QApplication.instance().quit()
-            except Exception as e:
-                StyledAlertDialog.show_alert("Restore Error", f"Could not restore database: {e}", "error")
-                db_manager.close_and_reopen_connection()
\ No newline at end of file
+            else:
+                StyledAlertDialog.show_alert("Restore Error", message, "error")